@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from app.utils.query_cache import query_cache
+router = APIRouter()
+
+
+@router.get("/stats")
+def get_cache_stats():
+    """
+    Hits/misses du cache des fonctions crud. Les compteurs sont ceux du worker qui
+    répond (voir "pid") ; "entries" est la taille du backend (partagé pour sqlite).
+    """
+    return query_cache.stats()
@@ -2,9 +2,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends
 from app.crud.category_repos import *
 from app.session import get_session
+from app.utils.http_cache import CATEGORY_TAXONOMY, conditional
 router = APIRouter()
 
-@router.get("/main")
+@router.get("/main", dependencies=[Depends(conditional(CATEGORY_TAXONOMY))])
 def get_main_category(
     session: Session = Depends(get_session),
 ):
@@ -13,6 +14,13 @@ def get_main_category(
         return []
     return main_category_names
 
+@router.get("/tree", dependencies=[Depends(conditional(CATEGORY_TAXONOMY))])
+def get_category_taxonomy(
+    session: Session = Depends(get_session),
+):
+    tree, version = get_category_tree(session)
+    return {"version": version, "categories": tree}
+
 @router.get("/expertises")
 def get_expertises(
     session: Session = Depends(get_session),
@@ -74,7 +82,7 @@ def get_languages(
     # return locations
 
 
-@router.get("/sub")
+@router.get("/sub", dependencies=[Depends(conditional(CATEGORY_TAXONOMY))])
 def get_sub_category(
     main_category: Optional[str] = None,
     session: Session = Depends(get_session),
@@ -1,16 +1,23 @@
+import asyncio
+
 from app.models.response_entity import InterviewerResponse, SingleInterviewerResponse, VideoResponse
-from fastapi import APIRouter, Depends, HTTPException
-from app.crud.follower import follow_exists
+from fastapi import APIRouter, Depends, HTTPException, Response
 from app.crud.videos_repos import get_hosted_podcasts
-from app.session import get_session
+from app.session import get_session, run_read
 from app.utils.entities import process_interviewer_dict, process_video_dict
+from app.utils.http_cache import INTERVIEWER_LIST, INTERVIEWER_SEARCH, PODCAST_LIST, conditional
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_keyset_cursor, encode_keyset_cursor
+from app.utils.serialization import INTERVIEWER_LIST_ADAPTER, VIDEO_LIST_ADAPTER, json_list_response
+from app.utils.view_counters import view_counters
 from database.model import Interviewer
 from app.crud.interviewers_repos import *
+from app.crud.follower import follow_interviewer, get_followers_count, get_following_count, unfollow_interviewer
 
 router = APIRouter()
 
-@router.get("/filter", response_model=list[InterviewerResponse])
-def make_filters(
+@router.get("/filter", response_model=list[InterviewerResponse], dependencies=[Depends(conditional(INTERVIEWER_LIST))])
+async def make_filters(
+    response: Response,
     by_expertise: str = None,
     by_location: str = None,
     by_language: str = None,
@@ -18,14 +25,18 @@ def make_filters(
     ascending: bool = False,
     offset: int = 0,
     limit: int = 10,
-    session: Session = Depends(get_session),
+    cursor: str = None,
 
 ):
-    if order_by not in ["video_count", "view_count", "like_count", "published_at", "language"]:
+    if order_by not in ["video_count", "view_count", "like_count", "published_at", "followers"]:
         order_by = "published_at"
+    try:
+        last_key = decode_keyset_cursor(cursor, order_by, ascending) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     interviewers = []
-    interviewers = get_interviewers_with_filter(
-                        db = session,
+    interviewers = await run_read(
+                        get_interviewers_with_filter,
                         current_user_id = None,
                         offset = offset,
                         limit = limit,
@@ -33,93 +44,119 @@ def make_filters(
                         ascending = ascending,
                         by_expertise = by_expertise,
                         by_language = by_language,
-                        by_location = by_location
+                        by_location = by_location,
+                        cursor = last_key
                     )
     if not interviewers:
         return []
-    for (i, interviewer) in enumerate(interviewers):
-        processed_interviewer = InterviewerResponse.model_validate(process_interviewer_dict(interviewer))
-        processed_videos = [ VideoResponse.model_validate(process_video_dict(video)) for video in interviewer["videos"]]
-        processed_interviewer.videos = processed_videos
-        interviewers[i] = processed_interviewer 
-    return interviewers
-
-@router.get("/search", response_model=list[InterviewerResponse])
-def search_interviewers(query: str, session: Session = Depends(get_session)):
+    if len(interviewers) == limit:
+        last = interviewers[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_keyset_cursor(order_by, ascending, last["sort_key"], last["id"])
+    for interviewer in interviewers:
+        process_interviewer_dict(interviewer)
+        interviewer["videos"] = [process_video_dict(video) for video in interviewer["videos"]]
+    return json_list_response(INTERVIEWER_LIST_ADAPTER, interviewers, response)
+
+@router.get("/search", response_model=list[InterviewerResponse], dependencies=[Depends(conditional(INTERVIEWER_SEARCH))])
+async def search_interviewers(query: str, response: Response, offset: int = 0, limit: int = 10):
     if not query:
         return [] 
-    interviewers = get_interviewers_by_keywords(db = session, search=query)
+    interviewers = await run_read(get_interviewers_by_keywords, search=query, offset=offset, limit=limit)
     if not interviewers:
         return []
-    for (i, interviewer) in enumerate(interviewers):
-        processed_interviewer = InterviewerResponse.model_validate(process_interviewer_dict(interviewer))
-        processed_videos = [ VideoResponse.model_validate(process_video_dict(video)) for video in interviewer["videos"]]
-        processed_interviewer.videos = processed_videos
-        interviewers[i] = processed_interviewer 
-    return interviewers
+    for interviewer in interviewers:
+        process_interviewer_dict(interviewer)
+        interviewer["videos"] = [process_video_dict(video) for video in interviewer["videos"]]
+    return json_list_response(INTERVIEWER_LIST_ADAPTER, interviewers, response)
 
 @router.get("/{id}", response_model=InterviewerResponse)
-def get_interviewer(id: int, session: Session = Depends(get_session)):
+async def get_interviewer(id: int):
     try:
-        interviewer = get_single_interviewer(session, id)
+        interviewer = await run_read(get_single_interviewer, id)
         if interviewer is None:
             raise HTTPException(status_code=404, detail="Interviewer not found")
-        new_print_count = (interviewer.get("print_count") or 0) + 1
-
-        session.query(Interviewer).filter(
-            Interviewer.id == interviewer["id"]
-        ).update(
-            {"print_count": new_print_count}
-        )
-        session.commit()
+        pending_views = view_counters.increment("interviewer", interviewer["id"])
+        interviewer["print_count"] = (interviewer.get("print_count") or 0) + pending_views
         interviewer_dict = process_interviewer_dict(interviewer)
         return interviewer_dict
     except Exception as e:
         print(str(e))
         raise HTTPException(status_code=500, detail=f"Error : {str(e)}")
 
+@router.get("/{id}/page", response_model=SingleInterviewerResponse)
+async def get_interviewer_page(id: int, limit: int = 5):
+    """
+    Tout ce qu'affiche la page d'un intervenant en un seul appel : détail, première
+    page de ses podcasts et intervenants similaires, requêtes lancées en parallèle.
+    La suite des podcasts se charge avec /hosted_podcast/{id}?cursor=hosted_podcasts_next_cursor.
+    """
+    interviewer, hosted_podcasts, similar_interviewers = await asyncio.gather(
+        run_read(get_single_interviewer, id),
+        run_read(get_hosted_podcasts, id, limit),
+        run_read(get_similar_interviewers, interviewer_id=id),
+    )
+    if interviewer is None:
+        raise HTTPException(status_code=404, detail="Interviewer not found")
+
+    pending_views = view_counters.increment("interviewer", interviewer["id"])
+    interviewer["print_count"] = (interviewer.get("print_count") or 0) + pending_views
+    next_cursor = None
+    if hosted_podcasts and len(hosted_podcasts) == limit:
+        last = hosted_podcasts[-1]
+        next_cursor = encode_keyset_cursor("published_at", False, last["sort_key"], last["id"])
+    return SingleInterviewerResponse(
+        interviewer_detail=InterviewerResponse.model_validate(process_interviewer_dict(interviewer)),
+        hosted_podcasts=[VideoResponse.model_validate(process_video_dict(p)) for p in hosted_podcasts or []],
+        similar_interviewers=[
+            InterviewerResponse.model_validate(process_interviewer_dict(i)) for i in similar_interviewers or []
+        ],
+        hosted_podcasts_next_cursor=next_cursor,
+    )
+
 @router.get("/similar_interviewers/{interviewer_id}", response_model=List[InterviewerResponse])
-def get_interviewer(interviewer_id: int, expertises: str, session: Session = Depends(get_session)):
+async def get_similar_interviewer(interviewer_id: int, response: Response, limit: int = 10):
     try:
-        similar_interviewers = get_similar_interviewers(
-            db=session,
+        similar_interviewers = await run_read(
+            get_similar_interviewers,
             interviewer_id=interviewer_id,
-            expertises=expertises.split("|")
+            limit=limit
         )
         if not similar_interviewers:
             return []
-        simular_interviewers_res = [
-            InterviewerResponse.model_validate(process_interviewer_dict(i))
-            for i in similar_interviewers
-        ]
-        return simular_interviewers_res
+        similar_interviewers_res = [process_interviewer_dict(i) for i in similar_interviewers]
+        return json_list_response(INTERVIEWER_LIST_ADAPTER, similar_interviewers_res, response)
 
     except Exception as e:
         print(str(e))
         raise HTTPException(status_code=500, detail=f"Error : {str(e)}")
 
 
-@router.get("/hosted_podcast/{id}", response_model=List[VideoResponse])
-def get_hosted_podcast_from_interviewer(id: int, session: Session = Depends(get_session)):
+@router.get("/hosted_podcast/{id}", response_model=List[VideoResponse], dependencies=[Depends(conditional(PODCAST_LIST))])
+async def get_hosted_podcast_from_interviewer(
+    id: int,
+    response: Response,
+    limit: int = 5,
+    cursor: str = None,
+):
     try:
-        hosted_podcasts = get_hosted_podcasts(session, id, 5)
+        last_key = decode_keyset_cursor(cursor, "published_at", False) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        hosted_podcasts = await run_read(get_hosted_podcasts, id, limit, cursor=last_key)
         if not hosted_podcasts:
             return []
-        hosted_podcasts_res = [
-            VideoResponse.model_validate(process_video_dict(p))
-            for p in hosted_podcasts
-        ]
-        return hosted_podcasts_res
+        if len(hosted_podcasts) == limit:
+            last = hosted_podcasts[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_keyset_cursor("published_at", False, last["sort_key"], last["id"])
+        hosted_podcasts_res = [process_video_dict(p) for p in hosted_podcasts]
+        return json_list_response(VIDEO_LIST_ADAPTER, hosted_podcasts_res, response)
     except Exception as e:
         print(str(e))
         raise HTTPException(status_code=500, detail=f"Error : {str(e)}")
 
 
-@router.get("/follow/{interviewer_id}")
-def follow_interviewer(
-    interviewer_id: int,
-    session: Session = Depends(get_session)
-):  
+def _check_interviewer(session: Session, interviewer_id: int) -> Interviewer:
     if not interviewer_id or interviewer_id < 1:
         raise HTTPException(
             status_code=400,
@@ -132,24 +169,69 @@ def follow_interviewer(
             status_code=404,
             detail="This interviewer does not exist."
         )
+    return interviewer
+
+
+@router.get("/follow/{interviewer_id}")
+def follow(
+    interviewer_id: int,
+    session: Session = Depends(get_session)
+):  
+    interviewer = _check_interviewer(session, interviewer_id)
 
     current_user_id = 1
 
-    exist = follow_exists(session, current_user_id, interviewer_id)  
-    if exist:
+    followed = follow_interviewer(session, user_id=current_user_id, interviewer_id=interviewer_id)
+    if followed is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Could not follow the interviewer."
+        )
+    if not followed:
         raise HTTPException(
             status_code=404,
             detail="You are already following this interviewer."
         )
 
-    follow = save_follow(session, user_id=current_user_id, interviewer_id=interviewer_id)
-    if not follow:
+    return {"message": f"You are now following {interviewer.name}."}
+
+
+@router.delete("/follow/{interviewer_id}")
+def unfollow(
+    interviewer_id: int,
+    session: Session = Depends(get_session)
+):
+    interviewer = _check_interviewer(session, interviewer_id)
+
+    current_user_id = 1
+
+    unfollowed = unfollow_interviewer(session, user_id=current_user_id, interviewer_id=interviewer_id)
+    if unfollowed is None:
         raise HTTPException(
             status_code=500,
-            detail="Could not follow the interviewer."
+            detail="Could not unfollow the interviewer."
+        )
+    if not unfollowed:
+        raise HTTPException(
+            status_code=404,
+            detail="You are not following this interviewer."
         )
 
-    interviewer.folowers_count = (interviewer.folowers_count or 0) + 1
-    update_interviewer(session, interviewer)
+    return {"message": f"You no longer follow {interviewer.name}."}
+
+
+@router.get("/followers_count/{interviewer_id}")
+def followers_count(
+    interviewer_id: int,
+    session: Session = Depends(get_session)
+):
+    _check_interviewer(session, interviewer_id)
+    return {"interviewer_id": interviewer_id, "followers_count": get_followers_count(session, interviewer_id)}
+
 
-    return {"message": f"You are now following {interviewer.name}."}
\ No newline at end of file
+@router.get("/following_count/{user_id}")
+def following_count(
+    user_id: int,
+    session: Session = Depends(get_session)
+):
+    return {"user_id": user_id, "following_count": get_following_count(session, user_id)}
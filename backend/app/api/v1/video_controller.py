@@ -1,139 +1,195 @@
+import asyncio
+
 from app.models.response_entity import InterviewerResponse, SingleVideoResponse, VideoResponse, VideoStatResponse
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from app.crud.videos_repos import *
-from app.session import get_session
+from app.session import run_read
 from app.utils.entities import process_interviewer_dict, process_video_dict
-from database.model import Video
-from app.utils.youtube_api import update_stat_video
+from app.utils.http_cache import INTERVIEWER_LIST, PODCAST_LIST, PODCAST_SEARCH, SIMILAR_PODCASTS, conditional
+from app.utils.serialization import INTERVIEWER_LIST_ADAPTER, VIDEO_LIST_ADAPTER, json_list_response
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    decode_keyset_cursor,
+    encode_cursor,
+    encode_keyset_cursor,
+)
+from app.utils.view_counters import view_counters
+from app.utils.stats_refresher import stats_refresher
 from datetime import datetime
 from datetime import datetime, timedelta
 
-REFRESH_INTERVAL_MINUTES = 30  
+MAX_STATS_BATCH = 100
 
 router = APIRouter()
 
 
-@router.get("/search", response_model=list[VideoResponse])
-def search_podcasts(query: str, offset: int = 0,limit: int = 10, session: Session= Depends(get_session)):
-    podcasts = get_podcast_by_keywords(db = session, search=query)
-    if not podcasts:
-        return []
+def _stats_response(stats: list) -> list[VideoStatResponse]:
+    """
+    Stale-while-revalidate : les stats en base sont renvoyées telles quelles et les
+    podcasts périmés sont mis en file de rafraîchissement.
+    """
+    stale_ids = [row.id for row in stats if stats_refresher.is_stale(row.visited_at)]
+    if stale_ids:
+        stats_refresher.enqueue(stale_ids)
     return [
-        VideoResponse.model_validate(process_video_dict(p))
-        for p in podcasts
+        VideoStatResponse(
+            id=row.id,
+            view_count=row.view_count,
+            like_count=row.like_count,
+            visited_at=row.visited_at,
+            status="refreshing" if row.id in stale_ids else "fresh",
+        )
+        for row in stats
     ]
 
-@router.get("/filter", response_model=list[VideoResponse])
-def make_filter(
+
+@router.get("/search", response_model=list[VideoResponse], dependencies=[Depends(conditional(PODCAST_SEARCH))])
+async def search_podcasts(
+    query: str,
+    response: Response,
+    offset: int = 0,
+    limit: int = 10,
+    cursor: str = None,
+):
+    try:
+        last_key = decode_cursor(cursor, 2) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    podcasts = await run_read(get_podcast_by_keywords, search=query, offset=offset, limit=limit, cursor=last_key)
+    if not podcasts:
+        return []
+    if len(podcasts) == limit:
+        last = podcasts[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last["rank"], last["id"])
+    return json_list_response(VIDEO_LIST_ADAPTER, [process_video_dict(p) for p in podcasts], response)
+
+@router.get("/filter", response_model=list[VideoResponse], dependencies=[Depends(conditional(PODCAST_LIST))])
+async def make_filter(
+    response: Response,
     by_main_category: str = None,
     by_sub_category: str = None,
     by_language: str = None,
+    min_duration: int = None,
+    max_duration: int = None,
     order_by: str = "published_at",
     ascending: bool = False,
     offset: int = 0,
     limit: int = 10,
-    session: Session= Depends(get_session),
+    cursor: str = None,
 
 ):
-    if order_by not in ["video_count", "view_count", "like_count", "published_at"]:
+    if order_by not in ["video_count", "view_count", "like_count", "published_at", "duration"]:
         order_by = "published_at"
+    try:
+        last_key = decode_keyset_cursor(cursor, order_by, ascending) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     podcasts = []
-    podcasts = get_podcasts_with_filter(
-                db = session,
+    podcasts = await run_read(
+                get_podcasts_with_filter,
                 offset = offset,
                 limit = limit,
                 order_by  = order_by, 
                 ascending = ascending,
                 by_main_category=by_main_category,
                 by_sub_category=by_sub_category,
-                by_language=by_language)
+                by_language=by_language,
+                min_duration=min_duration,
+                max_duration=max_duration,
+                cursor=last_key)
     if not podcasts:
         return []
-    return [
-        VideoResponse.model_validate(process_video_dict(p))
-        for p in podcasts
-    ]
+    if len(podcasts) == limit:
+        last = podcasts[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_keyset_cursor(order_by, ascending, last["sort_key"], last["id"])
+    return json_list_response(VIDEO_LIST_ADAPTER, [process_video_dict(p) for p in podcasts], response)
+
+@router.get("/update-stats", response_model=List[VideoStatResponse])
+async def update_podcasts_stats(
+    ids: List[int] = Query(..., description="IDs des podcasts (max 100)"),
+):
+    """
+    Version par lots de /{podcast_id}/update-stats : une page de liste récupère les stats
+    de tous ses podcasts en un seul appel. Les IDs inconnus sont ignorés.
+    """
+    video_ids = list(dict.fromkeys(ids))
+    if len(video_ids) > MAX_STATS_BATCH:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_STATS_BATCH} podcasts par appel")
+    return _stats_response(await run_read(get_podcast_stats, video_ids=video_ids))
+
+
 @router.get("/{podcast_id}", response_model=VideoResponse)
-def get_podcast(
+async def get_podcast(
     podcast_id: int,
-    session: Session= Depends(get_session),
 ):
-    podcast_infos = get_single_podcast(db=session, video_id=podcast_id)
+    podcast_infos = await run_read(get_single_podcast, video_id=podcast_id)
     if not podcast_infos:
         raise HTTPException(status_code=404, detail="Podcast not found")
 
-    if podcast_infos["print_count"] is None:
-        podcast_infos["print_count"] = 0
-    podcast_infos["print_count"] += 1  
-    update_video(session, Video(**podcast_infos))   
+    pending_views = view_counters.increment("video", podcast_id)
+    podcast_infos["print_count"] = (podcast_infos["print_count"] or 0) + pending_views
     processed_podcast_detail = VideoResponse.model_validate(process_video_dict(podcast_infos))
     return processed_podcast_detail
-@router.get("/hosts/{podcast_id}", response_model=List[InterviewerResponse])
-def get_host_in_podcast(
+
+@router.get("/{podcast_id}/page", response_model=SingleVideoResponse)
+async def get_podcast_page(
+    podcast_id: int,
+):
+    """
+    Tout ce qu'affiche la page d'un podcast en un seul appel : détail, intervenants,
+    podcasts similaires et stats. Les quatre requêtes sont indépendantes et lancées
+    en parallèle, chacune sur sa propre session.
+    """
+    podcast_infos, interviewers, similar_podcasts, stats = await asyncio.gather(
+        run_read(get_single_podcast, video_id=podcast_id),
+        run_read(get_interviewers_by_podcast, video_id=podcast_id, current_user_id=None),
+        run_read(get_similar_podcasts, video_id=podcast_id, limit=10),
+        run_read(get_podcast_stats, video_ids=[podcast_id]),
+    )
+    if not podcast_infos:
+        raise HTTPException(status_code=404, detail="Podcast not found")
+
+    pending_views = view_counters.increment("video", podcast_id)
+    podcast_infos["print_count"] = (podcast_infos["print_count"] or 0) + pending_views
+    return SingleVideoResponse(
+        podcast_detail=VideoResponse.model_validate(process_video_dict(podcast_infos)),
+        interviewers=[InterviewerResponse.model_validate(process_interviewer_dict(i)) for i in interviewers or []],
+        similar_podcasts=[VideoResponse.model_validate(process_video_dict(p)) for p in similar_podcasts or []],
+        stats=_stats_response(stats)[0] if stats else None,
+    )
+
+@router.get("/hosts/{podcast_id}", response_model=List[InterviewerResponse], dependencies=[Depends(conditional(INTERVIEWER_LIST))])
+async def get_host_in_podcast(
     podcast_id: int,
-    session: Session= Depends(get_session),
+    response: Response,
 ):
-    interviewers =  get_interviewers_by_podcast(db=session, video_id=podcast_id, current_user_id=None)
+    interviewers = await run_read(get_interviewers_by_podcast, video_id=podcast_id, current_user_id=None)
     if not interviewers:
         return []
-    processed_guests = [InterviewerResponse.model_validate(process_interviewer_dict(interviewer)) for interviewer in interviewers]
-    return processed_guests
+    processed_guests = [process_interviewer_dict(interviewer) for interviewer in interviewers]
+    return json_list_response(INTERVIEWER_LIST_ADAPTER, processed_guests, response)
 
-@router.get("/similar_podcast/{podcast_id}", response_model=List[VideoResponse])
-def get_podcast(
+@router.get("/similar_podcast/{podcast_id}", response_model=List[VideoResponse], dependencies=[Depends(conditional(SIMILAR_PODCASTS))])
+async def get_similar_podcast(
     podcast_id: int,
-    main_category: str,
-    sub_category: str,
-    language: str,
-    session: Session= Depends(get_session),
-): 
-    similar_podcasts = get_similar_podcasts(
-        db=session,
-        video_id=podcast_id,
-        video_main_category=main_category,
-        video_sub_category=sub_category,
-        video_language=language,
-        limit=10
-    )
-    processed_similar_podcasts = [ VideoResponse.model_validate(process_video_dict(podcast)) for podcast in similar_podcasts]
-    return processed_similar_podcasts
+    response: Response,
+    limit: int = 10,
+):
+    similar_podcasts = await run_read(get_similar_podcasts, video_id=podcast_id, limit=limit)
+    processed_similar_podcasts = [process_video_dict(podcast) for podcast in similar_podcasts or []]
+    return json_list_response(VIDEO_LIST_ADAPTER, processed_similar_podcasts, response)
 
 @router.get("/{podcast_id}/update-stats", response_model=VideoStatResponse)
-def update_podcast_stat(
+async def update_podcast_stat(
     podcast_id: int,
-    session: Session= Depends(get_session),
 ):
     """
-    Met à jour les stats de ce podcast uniquement si la dernière mise à jour remonte à plus de X minutes.
+    Retourne immédiatement les stats en base de ce podcast. Si elles datent de plus de
+    STATS_REFRESH_INTERVAL_MINUTES, un rafraîchissement YouTube est mis en file
+    et le statut vaut "refreshing".
     """
-    existing_video = get_podcast_by_id(db=session, id=podcast_id)
-    if not existing_video:
+    stats = await run_read(get_podcast_stats, video_ids=[podcast_id])
+    if not stats:
         raise HTTPException(status_code=404, detail="Podcast non trouvé")
-
-    if existing_video.visited_at:
-        time_diff = datetime.utcnow() - existing_video.visited_at
-        if time_diff < timedelta(minutes=REFRESH_INTERVAL_MINUTES):
-            return {
-                "view_count": existing_video.view_count,
-                "like_count": existing_video.like_count,
-                "visited_at": existing_video.visited_at,
-                "status": "cached"
-            }
-
-    video_stats, error = update_stat_video(existing_video.youtube_video_id)
-    if error:
-        raise HTTPException(status_code=400, detail=error)
-
-    updated_video = Video(
-        id=existing_video.id,
-        view_count=int(video_stats["view_count"]),
-        like_count=int(video_stats["like_count"]),
-        visited_at=datetime.utcnow()
-    )
-    saved_video = update_video(session, updated_video)
-
-    if not saved_video:
-        raise HTTPException(status_code=500, detail="La mise à jour de la vidéo a échoué")
-    return VideoStatResponse(view_count=saved_video.view_count, 
-                             like_count =saved_video.like_count, 
-                             visited_at=saved_video.visited_at)
\ No newline at end of file
+    return _stats_response(stats)[0]
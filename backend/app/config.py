@@ -7,6 +7,27 @@ load_dotenv(dotenv_path=env_path)
 
 class TestSettings:
     DATABASE_URL = os.getenv('vps_container_DATABASE_URL')
+    # Lectures des endpoints via un moteur async (asyncpg) au lieu du threadpool + moteur sync
+    DB_ASYNC = os.getenv('DB_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+    # Write-behind des compteurs de vues (print_count) : délai max avant écriture en base
+    VIEW_COUNTER_FLUSH_SECONDS = float(os.getenv('VIEW_COUNTER_FLUSH_SECONDS', '5'))
+    VIEW_COUNTER_MAX_PENDING = int(os.getenv('VIEW_COUNTER_MAX_PENDING', '5000'))
+    # Cache HTTP : délai max avant de relire data_version pour valider un If-None-Match
+    DATA_VERSION_TTL_SECONDS = float(os.getenv('DATA_VERSION_TTL_SECONDS', '1'))
+    # Cache des résultats des fonctions crud de lecture : "memory" (par worker), "sqlite" (partagé) ou "none"
+    QUERY_CACHE_BACKEND = os.getenv('QUERY_CACHE_BACKEND', 'memory').lower()
+    QUERY_CACHE_TTL_SECONDS = float(os.getenv('QUERY_CACHE_TTL_SECONDS', '60'))
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '10000'))
+    QUERY_CACHE_SQLITE_PATH = os.getenv('QUERY_CACHE_SQLITE_PATH', '/tmp/podcast_query_cache.sqlite')
+    # Rafraîchissement en arrière-plan des stats YouTube des podcasts
+    STATS_REFRESH_INTERVAL_MINUTES = int(os.getenv('STATS_REFRESH_INTERVAL_MINUTES', '30'))
+    STATS_REFRESH_BATCH_SIZE = int(os.getenv('STATS_REFRESH_BATCH_SIZE', '50'))
+    # Durée de réservation d'un podcast en cours de rafraîchissement, réessayé après en cas d'échec
+    STATS_REFRESH_LEASE_SECONDS = int(os.getenv('STATS_REFRESH_LEASE_SECONDS', '120'))
+    # Préfixe des images de profil dans Interviewer.display (relancer app.jobs.backfill_interviewer_display s'il change)
+    PROFILE_IMAGE_BASE_URL = os.getenv('PROFILE_IMAGE_BASE_URL', 'http://76.13.25.132/static/profil_images/')
 
 
 test_settings = TestSettings()
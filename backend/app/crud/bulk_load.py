@@ -0,0 +1,386 @@
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import Integer, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud.category_repos import invalidate_category_taxonomy
+from app.crud.data_version import INTERVIEWERS_SCOPE, PODCASTS_SCOPE, bump_data_versions
+from app.crud.interviewer_tags import sync_interviewer_tags
+from app.crud.interviewers_repos import refresh_interviewer_display
+from app.crud.videos_repos import _after_videos_write, _invalidate_video_caches
+from app.utils.entities import canonical_label, duration_to_seconds
+from app.utils.query_cache import INTERVIEWERS_TAG, query_cache
+from database.model import Channel, Interviewer, Video
+
+ENTITIES = ("video", "channel", "interviewer", "interviewervideolink")
+
+# Unique columns identifying an existing interviewer, tried in this order when a record has no id.
+# Link records can use them too, prefixed with "interviewer_" (e.g. interviewer_linkedin).
+INTERVIEWER_KEYS = ["linkedin", "wikipedia", "youtube", "twitter", "instagram", "tiktok", "facebook", "website", "mail", "phone"]
+
+# Natural keys of the merged entities, tried in order. Interviewers have no single unique
+# key, and a new interviewer without any of them is still inserted.
+MERGE_KEYS = {
+    "video": ["youtube_video_id"],
+    "channel": ["youtube_channel_id"],
+    "interviewer": ["id", *INTERVIEWER_KEYS],
+}
+
+# Colonnes stockées comme listes jointes par "|" (voir split_string_to_list) : une liste
+# JSON d'un enregistrement y est convertie.
+LIST_COLUMNS = {"expertise", "suggested_topic", "playlist", "key_words"}
+
+STAGE_TABLE = "_bulk_load_stage"
+DEFAULT_BATCH_SIZE = 5000
+
+
+@dataclass
+class LoadResult:
+    """
+    Bilan d'un chargement : lignes lues, insérées, mises à jour et ignorées. Une ligne
+    est ignorée si elle n'a pas de clé naturelle, si elle est le doublon d'une ligne
+    plus loin dans le même lot (la dernière l'emporte), si c'est un lien vers une
+    vidéo ou un intervenant inconnu, si elle viole une autre contrainte d'unicité,
+    ou si son lot viole une contrainte.
+    """
+    entity: str
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "LoadResult") -> None:
+        self.rows += other.rows
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        self.seconds += other.seconds
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """
+    Lit un fichier d'enregistrements en flux : CSV avec en-tête si l'extension est
+    .csv, sinon JSONL (un objet JSON par ligne).
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _loadable_columns(model, *excluded: str) -> dict:
+    """
+    Colonnes d'une table que les enregistrements peuvent fournir (hors colonnes
+    générées par Postgres et colonnes dérivées par l'API).
+    """
+    return {
+        column.name: column.type
+        for column in model.__table__.columns
+        if column.computed is None and column.name not in {"display", *excluded}
+    }
+
+
+def _link_columns() -> dict:
+    interviewer_columns = Interviewer.__table__.columns
+    return {
+        "video_id": Integer(),
+        "youtube_video_id": Video.youtube_video_id.type,
+        "interviewer_id": Integer(),
+        **{f"interviewer_{key}": interviewer_columns[key].type for key in INTERVIEWER_KEYS},
+    }
+
+
+def _unique_columns(model) -> list[str]:
+    return [column.name for column in model.__table__.columns if column.unique and not column.primary_key]
+
+
+COLUMNS = {
+    "video": _loadable_columns(Video, "id"),
+    "channel": _loadable_columns(Channel, "id"),
+    "interviewer": _loadable_columns(Interviewer),
+    "interviewervideolink": _link_columns(),
+}
+
+UNIQUE_COLUMNS = {
+    "video": _unique_columns(Video),
+    "channel": _unique_columns(Channel),
+    "interviewer": _unique_columns(Interviewer),
+}
+
+
+def _csv_value(value, column: str):
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list) and column in LIST_COLUMNS:
+        return "|".join(str(item).strip() for item in value if str(item).strip()) or None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _prepare(entity: str, records: list[dict]) -> list[dict]:
+    if entity == "video":
+        for record in records:
+            if record.get("duration") and not record.get("duration_seconds"):
+                record["duration_seconds"] = duration_to_seconds(record["duration"])
+            # Même forme canonique que save_video
+            for name in ("main_category", "category", "language"):
+                if name in record:
+                    record[name] = canonical_label(record[name], lower=name == "language")
+    if entity in MERGE_KEYS:
+        # Clé de dédoublonnage des lignes d'un même lot
+        for line_no, record in enumerate(records):
+            key = next((name for name in MERGE_KEYS[entity] if record.get(name) not in (None, "")), None)
+            if key is not None:
+                record["natural_key"] = f"{key}:{record[key]}"
+            elif entity == "interviewer":
+                record["natural_key"] = f"line:{line_no}"
+    return records
+
+
+def _copy_to_stage(db: Session, entity: str, records: list[dict]) -> list[str]:
+    """
+    Crée la table temporaire du lot (supprimée au commit) avec les seules colonnes
+    présentes dans les enregistrements, et la remplit par COPY.
+
+    :return: Colonnes chargées (hors line_no et natural_key).
+    """
+    types = COLUMNS[entity]
+    columns = [name for name in types if any(name in record for record in records)]
+    extra = ["natural_key"] if entity in MERGE_KEYS else []
+    dialect = db.get_bind().dialect
+    definitions = [f"{name} {types[name].compile(dialect=dialect)}" for name in columns]
+    definitions += [f"{name} text" for name in extra]
+    db.execute(text(f"CREATE TEMP TABLE {STAGE_TABLE} (line_no integer, {', '.join(definitions)}) ON COMMIT DROP"))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line_no, record in enumerate(records):
+        writer.writerow([line_no, *[_csv_value(record.get(name), name) for name in columns + extra]])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    cursor.copy_expert(
+        f"COPY {STAGE_TABLE} (line_no, {', '.join(columns + extra)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+    return columns
+
+
+def _drop_unique_conflicts(db: Session, table: str, columns: list[str]) -> None:
+    """
+    Retire de la table temporaire les mises à jour qui violeraient une contrainte
+    d'unicité (lien social, nom de chaîne...) : valeur déjà portée par une autre ligne
+    de `table`, ou par une autre ligne du lot qui met à jour un autre enregistrement.
+    Sans ce filtre, une seule ligne en conflit fait échouer l'UPDATE et tout le lot.
+    Les insertions en conflit sont écartées par ON CONFLICT DO NOTHING.
+    """
+    # Seule la dernière ligne du lot pour un même enregistrement est appliquée
+    db.execute(text(f"""
+        DELETE FROM {STAGE_TABLE} AS s
+        USING {STAGE_TABLE} AS o
+        WHERE s.target_id = o.target_id AND o.line_no > s.line_no
+    """))
+    for name in UNIQUE_COLUMNS[table]:
+        if name not in columns:
+            continue
+        db.execute(text(f"""
+            DELETE FROM {STAGE_TABLE} AS s
+            WHERE s.target_id IS NOT NULL AND s.{name} IS NOT NULL AND (
+                EXISTS (SELECT 1 FROM {table} AS t WHERE t.{name} = s.{name} AND t.id <> s.target_id)
+                OR EXISTS (
+                    SELECT 1 FROM {STAGE_TABLE} AS o
+                    WHERE o.target_id IS NOT NULL AND o.target_id <> s.target_id
+                      AND o.{name} = s.{name} AND o.line_no > s.line_no
+                )
+            )
+        """))
+
+
+def _merge(db: Session, table: str, keys: list[str], columns: list[str]) -> tuple[list[int], int, int]:
+    """
+    Fusionne la table temporaire dans `table` : chaque ligne est rattachée à la ligne
+    existante de même clé (première clé de `keys` qui correspond). Les lignes rattachées
+    la mettent à jour, les autres sont insérées. Une valeur NULL n'efface pas la valeur
+    en base (comme update_video : seuls les champs fournis sont modifiés).
+
+    La mise à jour et l'insertion sont séparées plutôt qu'un INSERT ... ON CONFLICT DO
+    UPDATE : un enregistrement partiel (youtube_video_id + compteurs) doit pouvoir mettre
+    à jour une vidéo sans fournir ses colonnes NOT NULL.
+
+    :return: (ids fusionnés, insérés, mis à jour)
+    """
+    values = [name for name in columns if name != "id"]
+    if not values:
+        return [], 0, 0
+    db.execute(text(f"ALTER TABLE {STAGE_TABLE} ADD COLUMN target_id integer"))
+    for key in keys:
+        if key in columns:
+            db.execute(text(f"""
+                UPDATE {STAGE_TABLE} AS s SET target_id = t.id
+                FROM {table} AS t
+                WHERE s.target_id IS NULL AND s.{key} IS NOT NULL AND t.{key} = s.{key}
+            """))
+    _drop_unique_conflicts(db, table, values)
+
+    updates = ", ".join(f"{name} = COALESCE(s.{name}, t.{name})" for name in values)
+    updated_ids = db.execute(text(f"""
+        UPDATE {table} AS t SET {updates}
+        FROM {STAGE_TABLE} AS s
+        WHERE t.id = s.target_id
+        RETURNING t.id
+    """)).scalars().all()
+
+    names = ", ".join(values)
+    inserted_ids = db.execute(text(f"""
+        INSERT INTO {table} ({names})
+        SELECT DISTINCT ON (natural_key) {names} FROM {STAGE_TABLE}
+        WHERE target_id IS NULL AND natural_key IS NOT NULL
+        ORDER BY natural_key, line_no DESC
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    """)).scalars().all()
+    return [*updated_ids, *inserted_ids], len(inserted_ids), len(updated_ids)
+
+
+def _merge_links(db: Session, columns: list[str]) -> tuple[list[int], int, int]:
+    """
+    Résout chaque lien (video_id ou youtube_video_id, interviewer_id ou interviewer_<lien
+    social>) puis insère ceux qui manquent. Un lien vers une vidéo ou un intervenant
+    inconnu est rejeté.
+
+    :return: (ids des vidéos liées, liens insérés, liens déjà présents)
+    """
+    video_ids = ["s.video_id"] if "video_id" in columns else []
+    if "youtube_video_id" in columns:
+        video_ids.append("(SELECT v.id FROM video AS v WHERE v.youtube_video_id = s.youtube_video_id)")
+    interviewer_ids = ["s.interviewer_id"] if "interviewer_id" in columns else []
+    interviewer_ids += [
+        f"(SELECT i.id FROM interviewer AS i WHERE i.{key} = s.interviewer_{key} LIMIT 1)"
+        for key in INTERVIEWER_KEYS
+        if f"interviewer_{key}" in columns
+    ]
+    if not video_ids or not interviewer_ids:
+        return [], 0, 0
+
+    row = db.execute(text(f"""
+        WITH resolved AS (
+            SELECT DISTINCT r.video_id, r.interviewer_id
+            FROM (
+                SELECT COALESCE({", ".join(video_ids)}) AS video_id,
+                       COALESCE({", ".join(interviewer_ids)}) AS interviewer_id
+                FROM {STAGE_TABLE} AS s
+            ) AS r
+            JOIN video AS v ON v.id = r.video_id
+            JOIN interviewer AS i ON i.id = r.interviewer_id
+        ), inserted AS (
+            INSERT INTO interviewervideolink (video_id, interviewer_id)
+            SELECT video_id, interviewer_id FROM resolved
+            ON CONFLICT DO NOTHING
+            RETURNING video_id
+        )
+        SELECT
+            (SELECT count(*) FROM resolved) AS resolved,
+            (SELECT count(*) FROM inserted) AS inserted,
+            (SELECT array_agg(DISTINCT video_id) FROM inserted) AS video_ids
+    """)).one()
+    return list(row.video_ids or []), row.inserted, row.resolved - row.inserted
+
+
+def load_batch(db: Session, entity: str, records: list[dict]) -> LoadResult:
+    """
+    Charge un lot d'enregistrements : COPY dans une table temporaire puis fusion en
+    SQL, read models et caches mis à jour comme par les fonctions save_* . Un lot qui
+    viole une contrainte (clé étrangère, unicité non filtrée) est annulé et compté comme
+    ignoré, sans arrêter le chargement. Toute autre erreur (format COPY, valeur d'un
+    mauvais type, SQL invalide) annule le lot et est propagée.
+    """
+    start = time.perf_counter()
+    result = LoadResult(entity, rows=len(records))
+    try:
+        columns = _copy_to_stage(db, entity, _prepare(entity, records))
+        if entity in MERGE_KEYS:
+            ids, result.inserted, result.updated = _merge(db, entity, MERGE_KEYS[entity], columns)
+        else:
+            ids, result.inserted, result.updated = _merge_links(db, columns)
+
+        if entity in ("video", "interviewervideolink"):
+            _after_videos_write(db, ids)
+        elif entity == "interviewer":
+            if {"expertise", "suggested_topic"} & set(columns):
+                sync_interviewer_tags(db, ids)
+            refresh_interviewer_display(db, ids)
+            bump_data_versions(db, INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
+        db.commit()
+
+        if entity == "video":
+            invalidate_category_taxonomy()
+        if entity in ("video", "interviewervideolink"):
+            _invalidate_video_caches(ids)
+        elif entity == "interviewer":
+            query_cache.invalidate(INTERVIEWERS_TAG)
+    except IntegrityError as e:
+        db.rollback()
+        print(f"Lot ignoré dans load_batch ({entity}, {len(records)} lignes):", e.orig)
+        result.inserted = result.updated = 0
+    except Exception:
+        db.rollback()
+        raise
+    result.skipped = result.rows - result.inserted - result.updated
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def bulk_load(
+    db: Session,
+    entity: str,
+    records: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[LoadResult, LoadResult], None]] = None,
+) -> LoadResult:
+    """
+    Charge en masse des vidéos, chaînes, intervenants ou liens intervenant-vidéo,
+    par lots de `batch_size` enregistrements lus en flux.
+
+        bulk_load(db, "video", read_records("videos.jsonl"))
+
+    Fusion sur les clés naturelles : youtube_video_id pour les vidéos, youtube_channel_id
+    pour les chaînes, id ou lien social (INTERVIEWER_KEYS) pour les intervenants. Les
+    colonnes absentes ou NULL d'un enregistrement ne modifient pas la ligne existante.
+
+    :param entity: Une valeur de ENTITIES.
+    :param on_batch: Appelée après chaque lot avec (bilan du lot, bilan cumulé).
+    :return: Bilan cumulé du chargement.
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Entité inconnue : {entity} (attendu : {', '.join(ENTITIES)})")
+    total = LoadResult(entity)
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        result = load_batch(db, entity, batch)
+        total.add(result)
+        if on_batch is not None:
+            on_batch(result, total)
+    return total
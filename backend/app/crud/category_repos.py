@@ -1,29 +1,100 @@
+import hashlib
+import json
+import threading
+import time
+
 from sqlalchemy import func
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database.model import Category, Suggestion, Video
 
-def get_all_main_categories(db: Session) -> list[str]:
-    stmt = select(Video.main_category).distinct().where(Video.main_category.isnot(None))
-    result = db.execute(stmt)
-    categories = [row[0] for row in result.all()]
-    return categories
+# Les autres workers uvicorn ne reçoivent pas l'invalidation : ils reconstruisent au plus tard après ce délai.
+TAXONOMY_TTL_SECONDS = 600
 
-def get_subcategories_by_main_category(db: Session, main_category: str) -> list[str]:
-    stmt = (
-        select(Video.category)  
-        .distinct()
-        .where(
-            func.lower(Video.main_category) == func.lower(main_category),
-            Video.category.isnot(None),
-            func.lower(Video.category) != func.lower(main_category)  
 
+class CategoryTaxonomy:
+    """
+    Arbre main_category -> sous-catégories gardé en mémoire, reconstruit à l'ingestion
+    de vidéos (invalidate) ou après TAXONOMY_TTL_SECONDS. `version` change avec le contenu
+    et sert d'ETag.
+    """
+
+    def __init__(self, ttl_seconds: int = TAXONOMY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # (arbre, arbre indexé par main_category en minuscules, version), remplacé d'un bloc
+        self._snapshot = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return snapshot
+        return None
+
+    def _load(self, db: Session):
+        rows = db.execute(
+            select(Video.main_category, Video.category)
+            .where(Video.main_category.isnot(None))
+            .group_by(Video.main_category, Video.category)
+        ).all()
+        tree: dict[str, set[str]] = {}
+        by_lower_main: dict[str, set[str]] = {}
+        for main_category, category in rows:
+            subcategories = tree.setdefault(main_category, set())
+            lower_subcategories = by_lower_main.setdefault(main_category.lower(), set())
+            if category and category.lower() != main_category.lower():
+                subcategories.add(category)
+                lower_subcategories.add(category)
+        tree = {main: sorted(subs) for main, subs in sorted(tree.items())}
+        payload = json.dumps(tree, sort_keys=True).encode("utf-8")
+        return (
+            tree,
+            {main: sorted(subs) for main, subs in by_lower_main.items()},
+            hashlib.sha1(payload).hexdigest()[:16],
         )
-    )
-    result = db.execute(stmt)
-    subcategories = [row[0] for row in result.all()]
-    return subcategories
+
+    def snapshot(self, db: Session) -> tuple[dict[str, list[str]], dict[str, list[str]], str]:
+        """
+        :return: (arbre, arbre indexé par main_category en minuscules, version).
+        """
+        snapshot = self._current()
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._current()
+                if snapshot is None:
+                    snapshot = self._load(db)
+                    self._snapshot = snapshot
+                    self._loaded_at = time.monotonic()
+        return snapshot
+
+
+category_taxonomy = CategoryTaxonomy()
+
+
+def invalidate_category_taxonomy() -> None:
+    """A appeler après le commit d'une ingestion de vidéos."""
+    category_taxonomy.invalidate()
+
+
+def get_category_tree(db: Session) -> tuple[dict[str, list[str]], str]:
+    tree, _, version = category_taxonomy.snapshot(db)
+    return tree, version
+
+
+def get_all_main_categories(db: Session) -> list[str]:
+    tree, _, _ = category_taxonomy.snapshot(db)
+    return list(tree)
+
+def get_subcategories_by_main_category(db: Session, main_category: str) -> list[str]:
+    if not main_category:
+        return []
+    _, by_lower_main, _ = category_taxonomy.snapshot(db)
+    return list(by_lower_main.get(main_category.strip().lower(), []))
 
 def get_suggested_categories(session: Session, user_id: int):
     # Récupérer les catégories associées à l'utilisateur
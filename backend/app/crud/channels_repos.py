@@ -1,7 +1,9 @@
-from typing import List, Optional
-from sqlalchemy import select
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import Row, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from app.crud.partial_update import changed_values, update_many, update_returning
 from database.model import Channel
 
 
@@ -60,29 +62,31 @@ def get_channel_by_youtube_name(db: Session, channel_name: str) -> Optional[Chan
         return None
 
 
-def update_channel(db: Session, updated_channel: Channel) -> Optional[Channel]:
+def update_channel(db: Session, updated_channel: Channel) -> Optional[Row]:
+    """
+    Met à jour un objet Channel existant avec uniquement les champs modifiés, en un seul
+    UPDATE ... RETURNING.
+
+    :param db: Session de base de données.
+    :param updated_channel: Objet Channel contenant l'ID et les champs à mettre à jour.
+    :return: L'ID et les champs modifiés relus depuis la base, ou None si non trouvé ou erreur.
+    """
     try:
         if updated_channel.id is None:
             print("update_channel_if_exists: Aucun ID fourni.")
             return None
 
-        statement = select(Channel).where(Channel.id == updated_channel.id)
-        result = db.execute(statement)
-        existing_channel = result.scalars().first()
-
-        if not existing_channel:
+        changes = changed_values(updated_channel)
+        if isinstance(changes.get("playlist"), list):
+            changes["playlist"] = "|".join(changes["playlist"])
+        updated = update_returning(db, Channel, updated_channel.id, changes)
+        if updated is None:
+            db.rollback()
             print(f"Aucun channel trouvé avec l'ID {updated_channel.id}")
             return None
 
-        for field, value in updated_channel.model_dump(exclude_unset=True).items():
-            if field == "playlist" and value is not None:
-                value = "|".join(value)
-            if value is not None:
-                setattr(existing_channel, field, value)
-
         db.commit()
-        db.refresh(existing_channel)
-        return existing_channel
+        return updated
 
     except SQLAlchemyError as e:
         print("Erreur dans update_channel_if_exists:", e)
@@ -214,6 +218,78 @@ def get_channels_with_state_zero(
     except Exception as e:
         print("Erreur dans get_channels_with_state_zero:", e)
         return None
-    
 
-    
\ No newline at end of file
+
+def get_channels_to_sweep(
+    db: Session,
+    state: int,
+    after_id: int = 0,
+    limit: int = 500
+) -> List[tuple[int, str]]:
+    """
+    Page suivante (par id croissant) des channels dont le state est inférieur ou égal
+    à `state` et qui ont un identifiant YouTube.
+
+    :param db: Session de base de données.
+    :param state: Valeur maximale du champ `state`.
+    :param after_id: Dernier id de la page précédente.
+    :param limit: Taille de la page.
+    :return: Liste de (id, youtube_channel_id).
+    """
+    statement = (
+        select(Channel.id, Channel.youtube_channel_id)
+        .where(
+            Channel.state <= state,
+            Channel.id > after_id,
+            Channel.youtube_channel_id.is_not(None),
+        )
+        .order_by(Channel.id)
+        .limit(limit)
+    )
+    return [(row.id, row.youtube_channel_id) for row in db.execute(statement).all()]
+
+
+def update_channels_stats(
+    db: Session,
+    stats_by_id: Dict[int, dict],
+    state: int,
+    visited_ids: List[int] = (),
+) -> int:
+    """
+    Écrit les stats de plusieurs channels en un seul UPDATE ... FROM (VALUES ...) :
+    les compteurs courants passent dans les colonnes prev_* et sont remplacés par les
+    nouveaux (dans un UPDATE, le membre droit lit toujours l'ancienne valeur de la ligne).
+    Les channels de `visited_ids` sans stats (chaîne supprimée ou privée) passent
+    seulement au `state` suivant. Ne commit pas.
+
+    :param db: Session de base de données.
+    :param stats_by_id: {channel.id: {"subs_count", "view_count", "video_count"}}.
+    :param state: Nouveau state des channels traités.
+    :param visited_ids: IDs traités dont YouTube n'a pas renvoyé de stats.
+    :return: Nombre de channels dont les stats ont été mises à jour.
+    """
+    now = datetime.utcnow()
+    update_many(
+        db,
+        Channel,
+        [
+            {"id": channel_id, **{key: stats[key] for key in ("subs_count", "view_count", "video_count")}}
+            for channel_id, stats in stats_by_id.items()
+        ],
+        extra={
+            "prev_subs_count": Channel.subs_count,
+            "prev_view_count": Channel.view_count,
+            "prev_video_count": Channel.video_count,
+            "prev_date_visited": Channel.visited_at,
+            "visited_at": now,
+            "state": state,
+        },
+    )
+    if visited_ids:
+        db.execute(
+            update(Channel)
+            .where(Channel.id.in_(sorted(visited_ids)))
+            .values(state=state)
+            .execution_options(synchronize_session=False)
+        )
+    return len(stats_by_id)
@@ -0,0 +1,39 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database.model import DataVersion
+
+PODCASTS_SCOPE = "podcasts"
+INTERVIEWERS_SCOPE = "interviewers"
+
+
+def bump_data_versions(db: Session, *scopes: str) -> None:
+    """
+    Incrémente la version des scopes donnés. Ne commit pas : appelée dans la
+    transaction d'écriture, le plus tard possible (la ligne reste verrouillée
+    jusqu'au commit), les ETags changent donc en même temps que les données.
+    """
+    for scope in sorted(set(scopes)):
+        upsert = pg_insert(DataVersion).values(scope=scope, version=1)
+        db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[DataVersion.scope],
+                set_={"version": DataVersion.version + 1},
+            )
+        )
+
+
+def get_data_versions(db: Session, scopes: Iterable[str]) -> dict[str, int]:
+    """
+    Versions actuelles des scopes donnés (0 pour un scope jamais modifié).
+    """
+    scopes = list(scopes)
+    rows = db.execute(
+        select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+    ).all()
+    versions = dict.fromkeys(scopes, 0)
+    versions.update({row.scope: row.version for row in rows})
+    return versions
@@ -1,8 +1,13 @@
-from sqlalchemy import distinct, select
+from datetime import datetime
+
+from sqlalchemy import delete, distinct, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from database.model import Follow
+from app.crud.data_version import INTERVIEWERS_SCOPE, bump_data_versions
+from app.utils.query_cache import interviewer_tag, query_cache, user_follows_tag
+from database.model import Follow, InterviewerStats, User
 
 
 def get_followed_interviewers(db: Session, user_id: int) -> List[int]:
@@ -139,19 +144,109 @@ def get_interviewer_followers(db: Session, interviewer_id: int) -> List[int]:
         return []
 
 
+def _apply_follow_change(db: Session, changed, delta: int, user_id: int, interviewer_id: int) -> bool:
+    """
+    Run the follow/unfollow CTE `changed` and, in the same statement, shift the
+    interviewer's folowers_count and the user's following_count by `delta` for
+    each row it actually inserted or deleted.
+    """
+    stats_update = (
+        update(InterviewerStats)
+        .where(InterviewerStats.interviewer_id == changed.c.interviewer_id)
+        .values(
+            folowers_count=func.greatest(func.coalesce(InterviewerStats.folowers_count, 0) + delta, 0),
+            # updated_at tracks the aggregated columns (see rebuild_interviewer_stats)
+            updated_at=InterviewerStats.updated_at,
+        )
+        .returning(InterviewerStats.interviewer_id)
+        .cte("stats_update")
+    )
+    user_update = (
+        update(User)
+        .where(User.id == changed.c.user_id)
+        .values(following_count=func.greatest(User.following_count + delta, 0))
+        .returning(User.id)
+        .cte("user_update")
+    )
+    stmt = select(func.count()).select_from(changed).add_cte(stats_update, user_update)
+    changed_rows = db.execute(stmt).scalar()
+    if changed_rows:
+        # folowers_count est une clé de tri de /interviewers/filter
+        bump_data_versions(db, INTERVIEWERS_SCOPE)
+    db.commit()
+    if changed_rows:
+        query_cache.invalidate(interviewer_tag(interviewer_id), user_follows_tag(user_id))
+    return changed_rows > 0
+
+
+def follow_interviewer(db: Session, user_id: int, interviewer_id: int) -> Optional[bool]:
+    """
+    Follow an interviewer in a single atomic statement: insert-or-ignore of the
+    follow row plus the counter increments, applied only if the row was inserted.
+
+    :param db: Database session.
+    :param user_id: ID of the user.
+    :param interviewer_id: ID of the interviewer.
+    :return: True if the user now follows the interviewer, False if they already did, None on error.
+    """
+    try:
+        inserted = (
+            pg_insert(Follow)
+            .values(user_id=user_id, interviewer_id=interviewer_id, followed_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[Follow.user_id, Follow.interviewer_id])
+            .returning(Follow.user_id, Follow.interviewer_id)
+            .cte("inserted")
+        )
+        return _apply_follow_change(db, inserted, 1, user_id, interviewer_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Error in follow_interviewer: {e}")
+        return None
+
+
+def unfollow_interviewer(db: Session, user_id: int, interviewer_id: int) -> Optional[bool]:
+    """
+    Unfollow an interviewer in a single atomic statement (delete plus counter decrements).
+
+    :param db: Database session.
+    :param user_id: ID of the user.
+    :param interviewer_id: ID of the interviewer.
+    :return: True if the follow was removed, False if there was none, None on error.
+    """
+    try:
+        deleted = (
+            delete(Follow)
+            .where(Follow.user_id == user_id, Follow.interviewer_id == interviewer_id)
+            .returning(Follow.user_id, Follow.interviewer_id)
+            .cte("deleted")
+        )
+        return _apply_follow_change(db, deleted, -1, user_id, interviewer_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Error in unfollow_interviewer: {e}")
+        return None
+
+
 def get_followers_count(db: Session, interviewer_id: int) -> int:
     """
-    Get the count of followers for a specific interviewer.
+    Get the count of followers for a specific interviewer, from the maintained
+    counter. Interviewers without podcasts have no stats row and are counted
+    from the follow index instead.
 
     :param db: Database session.
     :param interviewer_id: ID of the interviewer.
     :return: Number of followers.
     """
     try:
-        stmt = select(Follow).where(Follow.interviewer_id == interviewer_id)
-        result = db.execute(stmt)
-        follows = result.scalars().all()
-        return len(follows)
+        count = db.execute(
+            select(InterviewerStats.folowers_count)
+            .where(InterviewerStats.interviewer_id == interviewer_id)
+        ).scalar()
+        if count is None:
+            count = db.execute(
+                select(func.count()).select_from(Follow).where(Follow.interviewer_id == interviewer_id)
+            ).scalar()
+        return count
     except Exception as e:
         print(f"Error in get_followers_count: {e}")
         return 0
@@ -159,17 +254,52 @@ def get_followers_count(db: Session, interviewer_id: int) -> int:
 
 def get_following_count(db: Session, user_id: int) -> int:
     """
-    Get the count of interviewers followed by a user.
+    Get the count of interviewers followed by a user, from the maintained counter.
 
     :param db: Database session.
     :param user_id: ID of the user.
     :return: Number of interviewers followed.
     """
     try:
-        stmt = select(Follow).where(Follow.user_id == user_id)
-        result = db.execute(stmt)
-        follows = result.scalars().all()
-        return len(follows)
+        count = db.execute(select(User.following_count).where(User.id == user_id)).scalar()
+        return count or 0
     except Exception as e:
         print(f"Error in get_following_count: {e}")
-        return 0
\ No newline at end of file
+        return 0
+
+
+def reconcile_follow_counters(db: Session) -> tuple[int, int]:
+    """
+    Recompute folowers_count and following_count from the follow table and fix
+    the rows that drifted (writes that bypassed follow_interviewer/unfollow_interviewer).
+
+    :param db: Database session.
+    :return: (number of interviewer_stats rows fixed, number of users fixed).
+    """
+    followers = (
+        select(func.count())
+        .where(Follow.interviewer_id == InterviewerStats.interviewer_id)
+        .scalar_subquery()
+    )
+    fixed_interviewers = db.execute(
+        update(InterviewerStats)
+        .where(func.coalesce(InterviewerStats.folowers_count, -1) != followers)
+        .values(folowers_count=followers, updated_at=InterviewerStats.updated_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    following = (
+        select(func.count())
+        .where(Follow.user_id == User.id)
+        .scalar_subquery()
+    )
+    fixed_users = db.execute(
+        update(User)
+        .where(User.following_count != following)
+        .values(following_count=following)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if fixed_interviewers:
+        bump_data_versions(db, INTERVIEWERS_SCOPE)
+    db.commit()
+    return fixed_interviewers, fixed_users
@@ -1,42 +1,178 @@
+from datetime import datetime
+from typing import Iterable
 
-from sqlalchemy import func, select
+from sqlalchemy import column, delete, exists, func, literal, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.session import get_session_direct
-from database.model import InterviewerStats, InterviewerVideoLink, Video
+from sqlalchemy.schema import CreateIndex
 
+from app.crud.data_version import INTERVIEWERS_SCOPE, bump_data_versions
+from database.model import Follow, InterviewerStats, InterviewerVideoLink, Video
 
-def rebuild_interviewer_stats(db: Session):
-    stmt = (
+STATS_COLUMNS = [
+    "interviewer_id",
+    "video_count",
+    "total_views",
+    "total_likes",
+    "latest_published_at",
+    "updated_at",
+    "folowers_count",
+]
+
+# Columns recomputed from the videos; folowers_count is a counter maintained by the follow write path.
+AGGREGATED_COLUMNS = STATS_COLUMNS[1:-1]
+
+# Video columns the stats are derived from: an update touching none of them leaves the stats as is.
+STATS_SOURCE_FIELDS = {"is_podcast", "view_count", "like_count", "published_at"}
+
+STATS_TABLE = InterviewerStats.__table__.name
+BUILD_TABLE = f"{STATS_TABLE}_new"
+
+
+def _stats_rows_select(now: datetime):
+    """
+    SELECT agrégeant les stats de chaque intervenant sur ses podcasts. Le nombre de
+    followers n'est compté que pour initialiser une nouvelle ligne.
+    """
+    followers = (
+        select(func.count())
+        .where(Follow.interviewer_id == InterviewerVideoLink.interviewer_id)
+        .correlate(InterviewerVideoLink)
+        .scalar_subquery()
+    )
+    return (
         select(
-            InterviewerVideoLink.interviewer_id.label("interviewer_id"),
-            func.count(Video.id).label("video_count"),
-            func.coalesce(func.sum(Video.view_count), 0).label("total_views"),
-            func.coalesce(func.sum(Video.like_count), 0).label("total_likes"),
-            func.max(Video.published_at).label("latest_published_at"),
+            InterviewerVideoLink.interviewer_id,
+            func.count(Video.id),
+            func.coalesce(func.sum(Video.view_count), 0),
+            func.coalesce(func.sum(Video.like_count), 0),
+            func.max(Video.published_at),
+            literal(now, InterviewerStats.updated_at.type),
+            followers,
         )
         .join(Video, Video.id == InterviewerVideoLink.video_id)
         .where(Video.is_podcast.is_(True))
         .group_by(InterviewerVideoLink.interviewer_id)
     )
 
-    results = db.execute(stmt).all()
-
-    # 🔥 Strategy : DELETE + INSERT (plus simple et sûr)
-    db.query(InterviewerStats).delete()
-
-    db.bulk_insert_mappings(
-        InterviewerStats,
-        [
-            {
-                "interviewer_id": r.interviewer_id,
-                "video_count": r.video_count,
-                "total_views": r.total_views,
-                "total_likes": r.total_likes,
-                "latest_published_at": r.latest_published_at,
-            }
-            for r in results
-        ],
+
+def interviewers_of_videos(db: Session, video_ids: Iterable[int]) -> list[int]:
+    """
+    IDs des intervenants liés aux vidéos données.
+    """
+    video_ids = list(video_ids)
+    if not video_ids:
+        return []
+    return db.execute(
+        select(InterviewerVideoLink.interviewer_id)
+        .where(InterviewerVideoLink.video_id.in_(video_ids))
+        .distinct()
+    ).scalars().all()
+
+
+def refresh_interviewer_stats(db: Session, interviewer_ids: Iterable[int]) -> None:
+    """
+    Recalcule les stats des intervenants donnés par un upsert atomique : les autres
+    lignes ne sont pas touchées et les lecteurs ne voient jamais la table vide.
+    Un intervenant qui n'a plus de podcast sort de la table, comme lors d'une
+    reconstruction complète. Ne commit pas.
+
+    :param db: Session de base de données.
+    :param interviewer_ids: IDs des intervenants dont les vidéos, liens ou compteurs ont changé.
+    """
+    interviewer_ids = sorted({interviewer_id for interviewer_id in interviewer_ids if interviewer_id is not None})
+    if not interviewer_ids:
+        return
+
+    rows = _stats_rows_select(datetime.utcnow()).where(InterviewerVideoLink.interviewer_id.in_(interviewer_ids))
+    upsert = pg_insert(InterviewerStats).from_select(STATS_COLUMNS, rows)
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[InterviewerStats.interviewer_id],
+            set_={name: upsert.excluded[name] for name in AGGREGATED_COLUMNS},
+        )
     )
 
+    has_podcast = exists(
+        select(InterviewerVideoLink.video_id)
+        .join(Video, Video.id == InterviewerVideoLink.video_id)
+        .where(
+            InterviewerVideoLink.interviewer_id == InterviewerStats.interviewer_id,
+            Video.is_podcast.is_(True),
+        )
+    )
+    db.execute(
+        delete(InterviewerStats)
+        .where(InterviewerStats.interviewer_id.in_(interviewer_ids), ~has_podcast)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _build_index_statements() -> list[tuple[str, str]]:
+    """
+    CREATE INDEX des index du modèle, ciblant la table de construction sous un nom
+    temporaire, et le nom définitif de chaque index.
+    """
+    statements = []
+    for index in InterviewerStats.__table__.indexes:
+        sql = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        sql = sql.replace(f"INDEX {index.name} ", f"INDEX {index.name}_new ", 1)
+        sql = sql.replace(f" ON {STATS_TABLE} ", f" ON {BUILD_TABLE} ", 1)
+        statements.append((sql, index.name))
+    return statements
+
+
+def rebuild_interviewer_stats(db: Session) -> int:
+    """
+    Reconstruction complète hors ligne, sans fenêtre où la table est vide ou verrouillée
+    longtemps : les stats sont calculées dans interviewer_stats_new (avec ses index),
+    puis une courte transaction échange les deux tables. Les lignes que les écritures
+    de l'API ont rafraîchies pendant la construction, ainsi que folowers_count,
+    sont reprises de l'ancienne table au moment de l'échange.
+
+    :return: Nombre d'intervenants dans la nouvelle table.
+    """
+    build_started_at = datetime.utcnow()
+    db.execute(text(f"DROP TABLE IF EXISTS {BUILD_TABLE}"))
+    db.execute(text(
+        f"CREATE TABLE {BUILD_TABLE} (LIKE {STATS_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    build_table = table(BUILD_TABLE, *[column(name) for name in STATS_COLUMNS])
+    db.execute(build_table.insert().from_select(STATS_COLUMNS, _stats_rows_select(build_started_at)))
+    db.execute(text(f"ALTER TABLE {BUILD_TABLE} ADD CONSTRAINT {BUILD_TABLE}_pkey PRIMARY KEY (interviewer_id)"))
+    index_statements = _build_index_statements()
+    for sql, _ in index_statements:
+        db.execute(text(sql))
+    db.commit()
+
+    # Échange : seule étape qui bloque les lecteurs, le temps de quelques renommages
+    columns = ", ".join(STATS_COLUMNS)
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in STATS_COLUMNS[1:])
+    db.execute(text(f"LOCK TABLE {STATS_TABLE} IN ACCESS EXCLUSIVE MODE"))
+    db.execute(text(f"""
+        INSERT INTO {BUILD_TABLE} ({columns})
+        SELECT {columns} FROM {STATS_TABLE} WHERE updated_at >= :build_started_at
+        ON CONFLICT (interviewer_id) DO UPDATE SET {updates}
+    """), {"build_started_at": build_started_at})
+    db.execute(text(f"""
+        UPDATE {BUILD_TABLE} AS new SET folowers_count = old.folowers_count
+        FROM {STATS_TABLE} AS old
+        WHERE old.interviewer_id = new.interviewer_id
+    """))
+    db.execute(text(f"DROP TABLE {STATS_TABLE}"))
+    db.execute(text(f"ALTER TABLE {BUILD_TABLE} RENAME TO {STATS_TABLE}"))
+    db.execute(text(f"ALTER TABLE {STATS_TABLE} RENAME CONSTRAINT {BUILD_TABLE}_pkey TO {STATS_TABLE}_pkey"))
+    for _, name in index_statements:
+        db.execute(text(f"ALTER INDEX {name}_new RENAME TO {name}"))
+    db.execute(text(f"""
+        ALTER TABLE {STATS_TABLE} ADD CONSTRAINT {STATS_TABLE}_interviewer_id_fkey
+        FOREIGN KEY (interviewer_id) REFERENCES interviewer (id) ON DELETE CASCADE NOT VALID
+    """))
+    bump_data_versions(db, INTERVIEWERS_SCOPE)
+    db.commit()
+
+    # Validation de la clé étrangère hors de l'échange (ne bloque pas les lecteurs)
+    db.execute(text(f"ALTER TABLE {STATS_TABLE} VALIDATE CONSTRAINT {STATS_TABLE}_interviewer_id_fkey"))
     db.commit()
-rebuild_interviewer_stats(get_session_direct())
+    return db.execute(select(func.count()).select_from(InterviewerStats)).scalar()
@@ -0,0 +1,74 @@
+from typing import List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.utils.entities import split_string_to_list
+from database.model import ExpertiseTag, Interviewer, InterviewerExpertise, InterviewerTopic, Topic
+
+# (source column, tag table, link table, link column), tables de database/migrations/005_interviewer_tags.sql
+TAG_KINDS = [
+    (Interviewer.expertise, ExpertiseTag, InterviewerExpertise, InterviewerExpertise.expertise_id),
+    (Interviewer.suggested_topic, Topic, InterviewerTopic, InterviewerTopic.topic_id),
+]
+
+
+def normalize_tag(value: str) -> str:
+    """
+    Forme canonique d'un tag : minuscules, espaces normalisés ("AI  Researcher " -> "ai researcher").
+    """
+    return " ".join(value.split()).lower()
+
+
+def split_tags(value) -> List[str]:
+    """
+    Découpe une chaîne "a|b|c" en tags canoniques, sans doublons, dans l'ordre d'origine.
+    """
+    tags = []
+    for item in split_string_to_list(value) or []:
+        tag = normalize_tag(item)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def sync_interviewer_tags(db: Session, interviewer_ids: List[int]) -> None:
+    """
+    Recalcule les tags expertise/topic des intervenants donnés à partir de leurs chaînes
+    `expertise` et `suggested_topic`. Ne commit pas : l'appelant garde la main sur la transaction.
+
+    :param db: Session de base de données.
+    :param interviewer_ids: IDs des intervenants dont les chaînes ont changé.
+    """
+    if not interviewer_ids:
+        return
+
+    rows = db.execute(
+        select(Interviewer.id, Interviewer.expertise, Interviewer.suggested_topic)
+        .where(Interviewer.id.in_(interviewer_ids))
+    ).all()
+
+    for source_col, tag_model, link_model, link_col in TAG_KINDS:
+        tags_by_interviewer = {row.id: split_tags(getattr(row, source_col.key)) for row in rows}
+        names = {tag for tags in tags_by_interviewer.values() for tag in tags}
+
+        tag_ids = {}
+        if names:
+            db.execute(
+                pg_insert(tag_model)
+                .values([{"name": name} for name in sorted(names)])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            tag_ids = dict(
+                db.execute(select(tag_model.name, tag_model.id).where(tag_model.name.in_(names))).all()
+            )
+
+        db.execute(delete(link_model).where(link_model.interviewer_id.in_(interviewer_ids)))
+        links = [
+            {"interviewer_id": interviewer_id, link_col.key: tag_ids[tag], "position": position}
+            for interviewer_id, tags in tags_by_interviewer.items()
+            for position, tag in enumerate(tags, start=1)
+        ]
+        if links:
+            db.execute(insert(link_model), links)
@@ -2,10 +2,15 @@ from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import contains_eager
-from sqlalchemy import and_,  select, func, and_, or_, literal
-from database.model import Channel, Follow, Interviewer, InterviewerStats,  Video ,InterviewerVideoLink
+from sqlalchemy import Row, and_,  select, func, and_, or_, literal, update
+from app.crud.data_version import INTERVIEWERS_SCOPE, PODCASTS_SCOPE, bump_data_versions
+from app.crud.interviewer_tags import normalize_tag, sync_interviewer_tags
+from app.crud.partial_update import changed_values, update_returning
+from app.utils.entities import DISPLAY_SOURCE_FIELDS, interviewer_display
+from app.utils.pagination import keyset_after, keyset_order
+from app.utils.query_cache import INTERVIEWERS_TAG, interviewer_tag, query_cache, user_follows_tag
+from database.model import INTERVIEWER_SORT_KEYS, Channel, ExpertiseTag, Follow, Interviewer, InterviewerExpertise, InterviewerStats, SimilarInterviewer,  Video ,InterviewerVideoLink
 from sqlalchemy.exc import SQLAlchemyError
-import random
 
 from sqlalchemy import and_, or_, func, literal, select
 from sqlalchemy.orm import Session
@@ -20,38 +25,43 @@ def get_interviewers_with_filter(
     ascending: bool = False,
     offset: int = 0,
     limit: int = 10,
+    cursor: tuple | None = None,
 ):
+    """
+    Liste filtrée et triée des intervenants, avec leurs 3 derniers podcasts.
+    Chaque élément porte sa clé de tri dans "sort_key" pour construire le curseur de la page suivante.
+
+    :param cursor: (sort_key, id) du dernier élément de la page précédente ; s'il est fourni, offset est ignoré.
+    """
     # -------------------------------------------------
     # 1️⃣ Base conditions (SANS Video)
     # -------------------------------------------------
     conditions = [
-        or_(
-            Interviewer.linkedin.like("%|existed"),
-            Interviewer.twitter.like("%|existed"),
-            Interviewer.instagram.like("%|existed"),
-            Interviewer.tiktok.like("%|existed"),
-            Interviewer.youtube.like("%|existed"),
-        )
+        Interviewer.has_verified_social.is_(True),
     ]
 
     if by_expertise:
-        conditions.append(Interviewer.expertise.ilike(f"%{by_expertise.strip()}%"))
+        # Jointure indexée sur les tags (ix_ie_expertise_id) au lieu d'un ILIKE '%x%' :
+        # le filtre porte sur un tag entier, sans tenir compte de la casse ni des espaces
+        conditions.append(
+            select(InterviewerExpertise.interviewer_id)
+            .join(ExpertiseTag, ExpertiseTag.id == InterviewerExpertise.expertise_id)
+            .where(
+                InterviewerExpertise.interviewer_id == Interviewer.id,
+                ExpertiseTag.name == normalize_tag(by_expertise),
+            )
+            .exists()
+        )
 
     if by_location:
         conditions.append(Interviewer.location.ilike(f"%{by_location.strip()}%"))
 
     # -------------------------------------------------
-    # 2️⃣ Mapping colonne de tri (SAFE)
+    # 2️⃣ Clé de tri (SAFE) : sort key + id, servie par les index ix_interviewer_stats_*_keyset
     # -------------------------------------------------
-    order_map = {
-        "published_at": InterviewerStats.latest_published_at,
-        "video_count": InterviewerStats.video_count,
-        "view_count": InterviewerStats.total_views,
-        "like_count": InterviewerStats.total_likes,
-        "followers": InterviewerStats.folowers_count,
-    }
-
-    order_col = order_map.get(order_by, InterviewerStats.latest_published_at)
+    sort_key = INTERVIEWER_SORT_KEYS.get(order_by, INTERVIEWER_SORT_KEYS["published_at"])
+    if cursor is not None:
+        conditions.append(keyset_after(sort_key, InterviewerStats.interviewer_id, ascending, *cursor))
 
     # -------------------------------------------------
     # 3️⃣ Query principale (FAST)
@@ -60,24 +70,14 @@ def get_interviewers_with_filter(
         select(
             Interviewer.id,
             Interviewer.name,
-            Interviewer.activity,
-            Interviewer.expertise,
             Interviewer.location,
-            Interviewer.image_profil,
-            Interviewer.linkedin,
-            Interviewer.twitter,
-            Interviewer.instagram,
-            Interviewer.facebook,
-            Interviewer.youtube,
-            Interviewer.tiktok,
-            Interviewer.wikipedia,
-            Interviewer.website,
-            Interviewer.suggested_topic,
+            Interviewer.display,
             InterviewerStats.folowers_count,
             InterviewerStats.video_count,
             InterviewerStats.total_views,
             InterviewerStats.total_likes,
             InterviewerStats.latest_published_at,
+            sort_key.label("sort_key"),
         )
         .join(InterviewerStats, InterviewerStats.interviewer_id == Interviewer.id)
         .where(and_(*conditions))
@@ -105,8 +105,10 @@ def get_interviewers_with_filter(
     # -------------------------------------------------
     # 5️⃣ Ordering + Pagination
     # -------------------------------------------------
-    order_expr = order_col.asc().nullslast() if ascending else order_col.desc().nullslast()
-    stmt = stmt.order_by(order_expr).offset(offset).limit(limit)
+    stmt = stmt.order_by(*keyset_order(sort_key, InterviewerStats.interviewer_id, ascending))
+    if cursor is None:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit)
 
     result = db.execute(stmt)
     interviewers = result.mappings().all()
@@ -172,6 +174,13 @@ def get_interviewers_with_filter(
 from sqlalchemy import and_, or_, func, literal, select
 from sqlalchemy.orm import Session
 
+# Poids de la popularité dans le score de recherche : ln(1 + vues) vaut ~20 pour 500M de vues,
+# soit jusqu'à ~0.2 ajouté à une similarité comprise entre 0 et 1. Un invité très vu peut donc
+# passer devant une correspondance meilleure de moins de 0.2 (ex. 0.6 contre 0.75) ; seuls les
+# écarts de similarité plus grands ne sont jamais inversés.
+SEARCH_POPULARITY_WEIGHT = 0.01
+SEARCH_EXPERTISE_WEIGHT = 0.8
+
 
 def get_interviewers_by_keywords(
     db: Session,
@@ -186,58 +195,57 @@ def get_interviewers_by_keywords(
     keywords = [kw.strip() for kw in search.split() if kw.strip()]
     if not keywords:
         return []
+    search_text = " ".join(keywords)
 
-    search_conditions = []
+    # Tous ces prédicats sont servis par les index GIN trigram (name / expertise) :
+    # préfixe, sous-chaîne et correspondance approximative (fautes de frappe).
+    search_conditions = [
+        Interviewer.name.op("%>")(search_text),
+        Interviewer.expertise.op("%>")(search_text),
+    ]
     for kw in keywords:
-        search_conditions.append(
-            or_(
-                Interviewer.name.ilike(f"{kw}%"),
-                Interviewer.expertise.ilike(f"{kw}%"),
-            )
-        )
+        escaped = kw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        search_conditions.append(Interviewer.name.ilike(f"{escaped}%"))
+        search_conditions.append(Interviewer.expertise.ilike(f"{escaped}%"))
 
     # -------------------------------------------------
     # 2️⃣ Base conditions (NO video join)
     # -------------------------------------------------
     base_conditions = [
         or_(*search_conditions),
-        or_(
-            Interviewer.linkedin.like("%|existed"),
-            Interviewer.twitter.like("%|existed"),
-            Interviewer.instagram.like("%|existed"),
-            Interviewer.tiktok.like("%|existed"),
-            Interviewer.youtube.like("%|existed"),
-        ),
+        Interviewer.has_verified_social.is_(True),
     ]
 
     # -------------------------------------------------
-    # 3️⃣ Main interviewer query (FAST)
+    # 3️⃣ Score : similarité trigram + popularité
+    # -------------------------------------------------
+    similarity = func.greatest(
+        func.word_similarity(search_text, func.coalesce(Interviewer.name, "")),
+        func.word_similarity(search_text, func.coalesce(Interviewer.expertise, "")) * SEARCH_EXPERTISE_WEIGHT,
+    )
+    popularity = func.ln(1 + func.coalesce(InterviewerStats.total_views, 0))
+    score = (similarity + popularity * SEARCH_POPULARITY_WEIGHT).label("score")
+
+    # -------------------------------------------------
+    # 4️⃣ Main interviewer query (FAST)
     # -------------------------------------------------
     stmt = (
         select(
             Interviewer.id,
             Interviewer.name,
-            Interviewer.activity,
-            Interviewer.expertise,
             Interviewer.location,
-            Interviewer.image_profil,
-            Interviewer.linkedin,
-            Interviewer.twitter,
-            Interviewer.instagram,
-            Interviewer.facebook,
-            Interviewer.youtube,
-            Interviewer.tiktok,
-            Interviewer.wikipedia,
-            Interviewer.website,
-            Interviewer.suggested_topic,
+            Interviewer.display,
+            score,
         )
+        .outerjoin(InterviewerStats, InterviewerStats.interviewer_id == Interviewer.id)
         .where(and_(*base_conditions))
+        .order_by(score.desc(), Interviewer.id.desc())
         .offset(offset)
         .limit(limit)
     )
 
     # -------------------------------------------------
-    # 4️⃣ Follow flag
+    # 5️⃣ Follow flag
     # -------------------------------------------------
     if current_user_id:
         stmt = (
@@ -268,6 +276,10 @@ def get_interviewers_by_keywords(
     return result
 
 
+@query_cache.cached(
+    "get_single_interviewer",
+    tags=lambda args: [interviewer_tag(args["id"]), INTERVIEWERS_TAG, user_follows_tag(args["current_user_id"])],
+)
 def get_single_interviewer(
     db: Session, 
     id: int, 
@@ -280,13 +292,10 @@ def get_single_interviewer(
     """
     try:
         stmt = select(Interviewer.id, 
-                Interviewer.image_profil, 
                 Interviewer.name, 
-                Interviewer.activity,
-                Interviewer.expertise,
                 Interviewer.biography,
-                Interviewer.suggested_topic,
-                Interviewer.print_count
+                Interviewer.print_count,
+                Interviewer.display
             ).where(Interviewer.id == id)
         
         #step4: check if current user has followed the podcast
@@ -312,80 +321,76 @@ def get_single_interviewer(
         print("error in function get_interviewer_by_id:", e)
         return None
 
+@query_cache.cached(
+    "get_similar_interviewers",
+    tags=lambda args: [INTERVIEWERS_TAG, user_follows_tag(args["current_user_id"])],
+)
 def get_similar_interviewers(
     db: Session,
     interviewer_id: int,
-    expertises: List[str],
     current_user_id: Optional[int] = None,
     limit: int = 10
 ) -> List[dict]:
     """
-    Récupère des intervenants partageant les mêmes expertises que celui en paramètre.
+    Intervenants similaires précalculés (table similar_interviewer, voir
+    app.crud.similar_interviewers), du plus proche au plus éloigné : un parcours de clé
+    primaire, résultat stable. Un intervenant absent de l'index (ajouté depuis la
+    dernière construction) reçoit ceux qui partagent le plus de ses deux premiers tags.
     Inclut le champ calculé 'follower' si current_user_id est fourni.
     """
-    if not expertises:
-        return []
-
-    # Construction des mots-clés à partir des deux premières expertises
-    selected_expertises = expertises[:2]
-    expertise_words = []
-    for exp in selected_expertises:
-        expertise_words.extend(exp.split())
-
-    # Conditions pour la recherche
-    conditions = [
-        Interviewer.expertise.ilike(f"%{word}%") for word in expertise_words
-    ]
-
-    # Sélection des champs
     base_select = [
         Interviewer.id,
         Interviewer.name,
-        Interviewer.expertise,
-        Interviewer.image_profil,
-        Interviewer.biography
+        Interviewer.biography,
+        Interviewer.display
     ]
-
-    # Ajouter la colonne calculée follower si current_user_id est fourni
     if current_user_id is not None:
-        base_select.append(
-            func.coalesce(Follow.user_id.isnot(None), False).label("follower")
-        )
-        join_follow = (Follow.interviewer_id == Interviewer.id) & (Follow.user_id == current_user_id)
+        base_select.append(func.coalesce(Follow.user_id.isnot(None), False).label("follower"))
     else:
         base_select.append(literal(None).label("follower"))
-        join_follow = None
-
-    # Construction de la requête
-    stmt = select(*base_select).join(
-        InterviewerVideoLink, Interviewer.id == InterviewerVideoLink.interviewer_id
-    )
 
-    if current_user_id is not None:
-        stmt = stmt.outerjoin(Follow, join_follow)
-
-    stmt = stmt.where(
-        Interviewer.id != interviewer_id,
-        or_(*conditions),
-        or_(
-            Interviewer.linkedin.like("%|existed"),
-            Interviewer.twitter.like("%|existed"),
-            Interviewer.instagram.like("%|existed"),
-            Interviewer.tiktok.like("%|existed"),
-            Interviewer.youtube.like("%|existed"),
+    def _displayable(stmt):
+        if current_user_id is not None:
+            stmt = stmt.outerjoin(
+                Follow, (Follow.interviewer_id == Interviewer.id) & (Follow.user_id == current_user_id)
+            )
+        return stmt.where(
+            Interviewer.has_verified_social.is_(True),
+            select(InterviewerVideoLink.video_id)
+            .where(InterviewerVideoLink.interviewer_id == Interviewer.id)
+            .exists(),
         )
-    ).distinct().limit(limit)
 
-    # Exécution et conversion en dict
+    stmt = _displayable(
+        select(*base_select)
+        .join(SimilarInterviewer, SimilarInterviewer.similar_interviewer_id == Interviewer.id)
+        .where(SimilarInterviewer.interviewer_id == interviewer_id)
+    ).order_by(SimilarInterviewer.rank).limit(limit)
     results = db.execute(stmt).mappings().all()
-    if not results:
-        return []
+    if results:
+        return [dict(row) for row in results]
 
-    interviewers = [dict(row) for row in results]
-    random.shuffle(interviewers)
-
-    # Retour selon la limite souhaitée
-    return interviewers[:min(limit +20, len(interviewers))]
+    # Repli : nombre de tags partagés parmi les deux premiers (index ix_ie_expertise_id)
+    own_tags = select(InterviewerExpertise.expertise_id).where(
+        InterviewerExpertise.interviewer_id == interviewer_id,
+        InterviewerExpertise.position <= 2,
+    )
+    shared = (
+        select(
+            InterviewerExpertise.interviewer_id,
+            func.count().label("shared_tags"),
+        )
+        .where(
+            InterviewerExpertise.expertise_id.in_(own_tags),
+            InterviewerExpertise.interviewer_id != interviewer_id,
+        )
+        .group_by(InterviewerExpertise.interviewer_id)
+        .subquery()
+    )
+    stmt = _displayable(
+        select(*base_select).join(shared, shared.c.interviewer_id == Interviewer.id)
+    ).order_by(shared.c.shared_tags.desc(), Interviewer.id).limit(limit)
+    return [dict(row) for row in db.execute(stmt).mappings().all()]
 
 
 def get_interviewer_by_id(db: Session, id: int) -> Optional[Interviewer]:
@@ -454,37 +459,43 @@ def get_podcasts_by_interviewer(
         db.rollback()
         print("error in get_podcasts_by_interviewer:", e)
         return None
-def update_interviewer(db: Session, updated_interviewer: Interviewer) -> Optional[Interviewer]:
+def update_interviewer(db: Session, updated_interviewer: Interviewer) -> Optional[Row]:
     """
-    Met à jour un objet Interviewer existant avec uniquement les champs modifiés.
+    Met à jour un objet Interviewer existant avec uniquement les champs modifiés, en un
+    seul UPDATE ... RETURNING. Si un champ source de display change, les autres sources
+    sont relues par le même RETURNING et display est réécrit par un second UPDATE.
     
     :param db: Session de base de données.
     :param updated_interviewer: Objet Interviewer contenant l'ID et les champs à mettre à jour.
-    :return: L'objet Interviewer mis à jour, ou None si non trouvé ou erreur.
+    :return: L'ID et les champs modifiés relus depuis la base, ou None si non trouvé ou erreur.
     """
     try:
         if updated_interviewer.id is None:
             print("update_interviewer: Aucun ID fourni.")
             return None
 
-        statement = select(Interviewer).where(Interviewer.id == updated_interviewer.id)
-        result = db.execute(statement)
-        existing_interviewer = result.scalars().first()
-
-        if not existing_interviewer:
+        changes = changed_values(updated_interviewer)
+        changes.pop("display", None)  # toujours dérivé des colonnes sources
+        display_changed = bool(changes.keys() & DISPLAY_SOURCE_FIELDS)
+        updated = update_returning(
+            db, Interviewer, updated_interviewer.id, changes,
+            returning=sorted(DISPLAY_SOURCE_FIELDS) if display_changed else (),
+        )
+        if updated is None:
+            db.rollback()
             print(f"Aucun interviewer trouvé avec l'ID {updated_interviewer.id}")
             return None
 
-        # On parcourt les attributs de updated_interviewer et on met à jour uniquement ceux non None
-        for field, value in vars(updated_interviewer).items():
-            if field.startswith("_"):  # ignorer les attributs internes SQLAlchemy
-                continue
-            if value is not None:
-                setattr(existing_interviewer, field, value)
+        if display_changed:
+            update_returning(db, Interviewer, updated.id, {"display": interviewer_display(dict(updated._mapping))})
+
+        if changes.keys() & {"expertise", "suggested_topic"}:
+            sync_interviewer_tags(db, [updated.id])
 
+        bump_data_versions(db, INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
         db.commit()
-        db.refresh(existing_interviewer)
-        return existing_interviewer
+        query_cache.invalidate(INTERVIEWERS_TAG, interviewer_tag(updated.id))
+        return updated
 
     except Exception as e:
         print("Erreur dans update_interviewer:", e)
@@ -492,10 +503,34 @@ def update_interviewer(db: Session, updated_interviewer: Interviewer) -> Optiona
         return None
 
 
+def refresh_interviewer_display(db: Session, interviewer_ids: List[int]) -> None:
+    """
+    Recalcule la colonne display des intervenants donnés à partir de leurs colonnes
+    sources, pour les écritures faites en SQL (chargement en masse, backfill).
+    Ne commit pas.
+    """
+    if not interviewer_ids:
+        return
+    source_columns = [getattr(Interviewer, field) for field in sorted(DISPLAY_SOURCE_FIELDS)]
+    rows = db.execute(
+        select(Interviewer.id, *source_columns).where(Interviewer.id.in_(interviewer_ids))
+    ).mappings().all()
+    if rows:
+        db.execute(
+            update(Interviewer),
+            [{"id": row["id"], "display": interviewer_display(dict(row))} for row in rows],
+        )
+
+
 def save_interviewer(db: Session, interviewer: Interviewer) -> Optional[Interviewer]:
     try:
+        interviewer.display = interviewer_display(interviewer)
         db.add(interviewer)
+        db.flush()
+        sync_interviewer_tags(db, [interviewer.id])
+        bump_data_versions(db, INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
         db.commit()
+        query_cache.invalidate(INTERVIEWERS_TAG, interviewer_tag(interviewer.id))
         db.refresh(interviewer)
         return interviewer
     except Exception as e:
@@ -0,0 +1,93 @@
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Row, cast, column, func, inspect, null, select, update, values
+from sqlalchemy.orm import Session
+
+
+def changed_values(entity) -> dict[str, Any]:
+    """
+    Colonnes renseignées (non None) d'un objet transitoire, hors clé primaire : les
+    champs à écrire par une mise à jour partielle.
+    """
+    mapper = inspect(type(entity))
+    primary_keys = {key.key for key in mapper.primary_key}
+    return {
+        attr.key: value
+        for attr in mapper.column_attrs
+        if attr.key not in primary_keys and (value := vars(entity).get(attr.key)) is not None
+    }
+
+
+def update_returning(
+    db: Session,
+    model,
+    entity_id: int,
+    changes: dict[str, Any],
+    returning: Iterable[str] = (),
+) -> Optional[Row]:
+    """
+    Mise à jour partielle en un aller-retour :
+    UPDATE ... SET <changes> WHERE id = ... RETURNING id, <changes>, <returning>.
+    Sans changement, seule l'existence de la ligne est vérifiée. Ne commit pas.
+
+    :param changes: {colonne: valeur} à écrire.
+    :param returning: Colonnes supplémentaires à relire (ex. celles dont dépend un champ calculé).
+    :return: La ligne relue, ou None si aucune entité n'a cet ID.
+    """
+    columns = [model.id, *[getattr(model, key) for key in dict.fromkeys([*changes, *returning]) if key != "id"]]
+    if not changes:
+        return db.execute(select(*columns).where(model.id == entity_id)).first()
+    return db.execute(
+        update(model)
+        .where(model.id == entity_id)
+        .values(**changes)
+        .returning(*columns)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+
+def update_many(
+    db: Session,
+    model,
+    rows: list[dict[str, Any]],
+    increment: Iterable[str] = (),
+    extra: Optional[dict[str, Any]] = None,
+) -> int:
+    """
+    Met à jour plusieurs lignes en un seul UPDATE ... FROM (VALUES ...) : chaque dict de
+    `rows` contient l'id et les mêmes colonnes. Comme pour update_returning, une valeur
+    None n'efface pas la valeur en base (COALESCE(nouvelle, ancienne)). Les lignes sont
+    triées par id (deux écritures concurrentes verrouillent dans le même ordre et ne
+    peuvent pas s'interbloquer). Ne commit pas.
+
+    :param increment: Colonnes de `rows` ajoutées à la valeur en base au lieu de la remplacer.
+    :param extra: {colonne: valeur ou expression} communs à toutes les lignes ; une
+        expression sur les colonnes du modèle lit l'ancienne valeur de la ligne.
+    :return: Nombre de lignes mises à jour.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+    keys = [key for key in rows[0] if key != "id"]
+    increment = set(increment)
+    columns = [column(key, table.c[key].type) for key in ["id", *keys]]
+    # NULL typé : une colonne de VALUES sans autre valeur serait sinon de type text
+    new_values = values(*columns, name="new_values").data([
+        tuple(cast(null(), col.type) if row[col.name] is None else row[col.name] for col in columns)
+        for row in sorted(rows, key=lambda row: row["id"])
+    ])
+    assignments = {
+        key: (
+            func.coalesce(getattr(model, key), 0) + func.coalesce(new_values.c[key], 0)
+            if key in increment
+            else func.coalesce(new_values.c[key], getattr(model, key))
+        )
+        for key in keys
+    }
+    result = db.execute(
+        update(model)
+        .where(model.id == new_values.c.id)
+        .values(**assignments, **(extra or {}))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
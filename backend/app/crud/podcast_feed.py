@@ -0,0 +1,106 @@
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.crud.data_version import PODCASTS_SCOPE, bump_data_versions
+from database.model import NULL_DATE, InterviewerVideoLink, PodcastFeed, Video
+
+FEED_COLUMNS = [
+    "video_id",
+    "main_category",
+    "category",
+    "language",
+    "published_at",
+    "view_count",
+    "like_count",
+    "duration_seconds",
+    "guest_count",
+    "updated_at",
+]
+
+# Video columns the feed is derived from: an update touching none of them leaves the feed as is.
+FEED_SOURCE_FIELDS = {
+    "is_podcast",
+    "main_category",
+    "category",
+    "language",
+    "published_at",
+    "view_count",
+    "like_count",
+    "duration_seconds",
+}
+
+
+def _feed_rows_select():
+    """
+    SELECT producing the podcast_feed rows from video: only podcasts with at least
+    one guest, with every sort key coalesced so the feed never holds NULLs.
+    """
+    guest_count = (
+        select(func.count())
+        .where(InterviewerVideoLink.video_id == Video.id)
+        .correlate(Video)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Video.id,
+            func.lower(Video.main_category),
+            func.lower(Video.category),
+            func.lower(Video.language),
+            func.coalesce(Video.published_at, NULL_DATE),
+            func.coalesce(Video.view_count, 0),
+            func.coalesce(Video.like_count, 0),
+            func.coalesce(Video.duration_seconds, 0),
+            guest_count,
+            func.now(),
+        )
+        .where(Video.is_podcast.is_(True), guest_count > 0)
+    )
+
+
+def refresh_podcast_feed(db: Session, video_ids: Iterable[int]) -> None:
+    """
+    Recalcule les lignes du feed pour les vidéos données (vidéo modifiée, liens
+    intervenants ajoutés/supprimés) par un upsert : deux transactions qui rafraîchissent
+    la même vidéo ne peuvent pas entrer en conflit sur la clé primaire. Une vidéo qui
+    n'est plus listable sort du feed. Ne commit pas : le rafraîchissement fait partie
+    de la transaction d'écriture, les lecteurs voient donc l'ancien ou le nouvel état,
+    jamais un trou.
+
+    :param db: Session de base de données.
+    :param video_ids: IDs des vidéos modifiées.
+    """
+    video_ids = sorted({video_id for video_id in video_ids if video_id is not None})
+    if not video_ids:
+        return
+    rows = _feed_rows_select().where(Video.id.in_(video_ids))
+    upsert = pg_insert(PodcastFeed).from_select(FEED_COLUMNS, rows)
+    db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[PodcastFeed.video_id],
+            set_={name: upsert.excluded[name] for name in FEED_COLUMNS if name != "video_id"},
+        )
+    )
+    listable = rows.with_only_columns(Video.id)
+    db.execute(
+        delete(PodcastFeed)
+        .where(PodcastFeed.video_id.in_(video_ids), PodcastFeed.video_id.not_in(listable))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_podcast_feed(db: Session) -> int:
+    """
+    Reconstruit tout le feed dans une seule transaction (les lecteurs continuent de
+    voir l'ancien contenu jusqu'au commit).
+
+    :return: Nombre de podcasts dans le feed.
+    """
+    db.execute(delete(PodcastFeed))
+    db.execute(insert(PodcastFeed).from_select(FEED_COLUMNS, _feed_rows_select()))
+    bump_data_versions(db, PODCASTS_SCOPE)
+    db.commit()
+    return db.execute(select(func.count()).select_from(PodcastFeed)).scalar()
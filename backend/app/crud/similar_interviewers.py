@@ -0,0 +1,118 @@
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.crud.data_version import INTERVIEWERS_SCOPE, bump_data_versions
+from app.crud.similar_podcasts import INSERT_CHUNK_SIZE, top_k_neighbours
+from app.utils.query_cache import INTERVIEWERS_TAG, query_cache
+from database.model import InterviewerExpertise, InterviewerVideoLink, SimilarInterviewer, Video
+
+DEFAULT_TOP_K = 30
+
+# Share of each signal in the final score (the weights add up to 1, so the score
+# stays a cosine in [0, 1]). Appearing in the same podcast is the strongest signal.
+SIGNAL_WEIGHTS = {"video": 0.5, "channel": 0.3, "expertise": 0.2}
+
+
+def _incidence_matrix(pairs: list[tuple[int, int]], rows: dict[int, int]) -> sparse.csr_matrix:
+    """
+    Matrice intervenants x éléments (podcasts, chaînes ou tags), pondérée par idf : un
+    élément partagé par beaucoup d'intervenants (grosse chaîne, tag générique) les
+    rapproche moins qu'un élément rare. Lignes normalisées L2.
+    """
+    pairs = sorted(set(pairs))
+    columns: dict[int, int] = {}
+    row_indices = np.array([rows[interviewer_id] for interviewer_id, _ in pairs], dtype=np.int32)
+    column_indices = np.array([columns.setdefault(item, len(columns)) for _, item in pairs], dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (row_indices, column_indices)),
+        shape=(len(rows), len(columns)),
+    )
+
+    frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log((1 + len(rows)) / (1 + frequency)).astype(np.float32)
+    idf[frequency < 2] = 0  # un élément d'un seul intervenant ne rapproche personne
+    matrix = (matrix @ sparse.diags(idf)).tocsr()
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ matrix).tocsr()
+
+
+def similarity_matrix(signals: dict[str, list[tuple[int, int]]], rows: dict[int, int]) -> sparse.csr_matrix:
+    """
+    Concatène les matrices d'incidence de chaque signal, chacune multipliée par la
+    racine de son poids : le produit scalaire de deux lignes est la somme pondérée
+    des cosinus par signal.
+    """
+    return sparse.hstack(
+        [np.sqrt(SIGNAL_WEIGHTS[name]) * _incidence_matrix(pairs, rows) for name, pairs in signals.items()],
+        format="csr",
+        dtype=np.float32,
+    )
+
+
+def build_similar_interviewers(db: Session, k: int = DEFAULT_TOP_K, block_size: int = 512) -> int:
+    """
+    Reconstruit la table similar_interviewer : les k plus proches voisins de chaque
+    intervenant selon les podcasts et chaînes où ils apparaissent et leurs tags
+    d'expertise. La table est remplacée dans une seule transaction.
+
+    Les voisins ne sont pas filtrés ici (has_verified_social peut changer entre deux
+    constructions) : la lecture écarte les intervenants non affichables, d'où k plus
+    grand que la limite de l'endpoint.
+
+    :param k: Nombre de voisins conservés par intervenant.
+    :param block_size: Nombre de lignes de la matrice de similarité calculées à la fois.
+    :return: Nombre d'intervenants ayant au moins un voisin.
+    """
+    appearances = db.execute(
+        select(InterviewerVideoLink.interviewer_id, Video.id, Video.channel_id)
+        .join(Video, Video.id == InterviewerVideoLink.video_id)
+        .where(Video.is_podcast.is_(True))
+    ).all()
+    expertises = db.execute(
+        select(InterviewerExpertise.interviewer_id, InterviewerExpertise.expertise_id)
+    ).all()
+    signals = {
+        "video": [(interviewer_id, video_id) for interviewer_id, video_id, _ in appearances],
+        "channel": [
+            (interviewer_id, channel_id)
+            for interviewer_id, _, channel_id in appearances
+            if channel_id is not None
+        ],
+        "expertise": [tuple(row) for row in expertises],
+    }
+
+    interviewer_ids = sorted({interviewer_id for pairs in signals.values() for interviewer_id, _ in pairs})
+    if not interviewer_ids:
+        return 0
+    rows = {interviewer_id: row for row, interviewer_id in enumerate(interviewer_ids)}
+    matrix = similarity_matrix(signals, rows)
+
+    db.execute(delete(SimilarInterviewer))
+    indexed, pending = 0, []
+    for row, neighbours, scores in top_k_neighbours(matrix, k, block_size):
+        if not len(neighbours):
+            continue
+        indexed += 1
+        pending.extend(
+            {
+                "interviewer_id": interviewer_ids[row],
+                "rank": rank,
+                "similar_interviewer_id": interviewer_ids[neighbour],
+                "score": float(score),
+            }
+            for rank, (neighbour, score) in enumerate(zip(neighbours, scores), start=1)
+        )
+        if len(pending) >= INSERT_CHUNK_SIZE:
+            db.execute(insert(SimilarInterviewer), pending)
+            pending = []
+    if pending:
+        db.execute(insert(SimilarInterviewer), pending)
+    bump_data_versions(db, INTERVIEWERS_SCOPE)
+    db.commit()
+    query_cache.invalidate(INTERVIEWERS_TAG)
+    return indexed
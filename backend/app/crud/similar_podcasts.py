@@ -0,0 +1,164 @@
+import re
+from collections import Counter
+from typing import Iterator
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.crud.data_version import PODCASTS_SCOPE, bump_data_versions
+from app.utils.query_cache import PODCASTS_TAG, query_cache
+from database.model import SimilarPodcast, Video
+
+DEFAULT_TOP_K = 20
+
+# Weight of each field in a podcast vector: categories and the short fields say more
+# about the subject than the long description.
+CATEGORY_WEIGHTS = {"main_category": 3.0, "category": 3.0}
+TEXT_WEIGHTS = {"topic": 2.0, "key_words": 2.0, "rich_description": 1.0}
+
+# Words of 3 letters or more, in any alphabet
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{3,}")
+
+STOP_WORDS = frozenset("""
+    the and for are but not you all any can her was one our out his has had how its may new now
+    see who did get him let say she too use this that with from they will have what when your
+    which their there about would these other into more some than then them been were also just
+    over such only very after most where those being should could between through while
+    les des une pour que qui dans par sur pas plus est son ses aux avec ont mais comme tout
+    nous vous ils elle elles leur leurs cette ces sont été être avoir fait faire entre sans
+""".split())
+
+INSERT_CHUNK_SIZE = 10_000
+
+
+def podcast_terms(row) -> Counter:
+    """
+    Termes pondérés d'un podcast. Les catégories sont des termes entiers préfixés
+    (une catégorie "music" n'est pas le mot "music" d'une description).
+    """
+    terms = Counter()
+    for field, weight in CATEGORY_WEIGHTS.items():
+        value = getattr(row, field)
+        if value and value.strip():
+            terms[f"{field}:{value.strip().lower()}"] += weight
+    for field, weight in TEXT_WEIGHTS.items():
+        for token in TOKEN_PATTERN.findall((getattr(row, field) or "").lower()):
+            if token not in STOP_WORDS:
+                terms[token] += weight
+    return terms
+
+
+def tfidf_matrix(documents: list[Counter]) -> sparse.csr_matrix:
+    """
+    Matrice TF-IDF (tf sous-linéaire, idf lissé) des documents, lignes normalisées L2 :
+    le produit scalaire de deux lignes est leur similarité cosinus. Un terme présent
+    dans un seul document ne peut rapprocher deux podcasts, son poids est mis à zéro.
+    """
+    vocabulary: dict[str, int] = {}
+    indptr, indices, data = [0], [], []
+    for terms in documents:
+        for term, weight in terms.items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(weight)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.log1p(np.asarray(data, dtype=np.float32)), np.asarray(indices, dtype=np.int32), indptr),
+        shape=(len(documents), len(vocabulary)),
+    )
+
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+    idf[document_frequency < 2] = 0
+    matrix = (matrix @ sparse.diags(idf)).tocsr()
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ matrix).tocsr().astype(np.float32)
+
+
+def top_k_neighbours(
+    matrix: sparse.csr_matrix,
+    k: int,
+    block_size: int = 512,
+) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Les k lignes les plus proches (cosinus > 0) de chaque ligne, par ordre de score
+    décroissant puis de ligne croissante : (ligne, voisins, scores). Les similarités
+    sont calculées par blocs de `block_size` lignes pour borner la mémoire à
+    block_size x n flottants.
+    """
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    transposed = matrix.T.tocsc()
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        scores = (matrix[start:stop] @ transposed).toarray()
+        rows = np.arange(stop - start)
+        scores[rows, rows + start] = 0  # un podcast n'est pas son propre voisin
+
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.lexsort((candidates, -candidate_scores), axis=1)
+        neighbours = np.take_along_axis(candidates, order, axis=1)
+        neighbour_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        for row in rows:
+            keep = neighbour_scores[row] > 0
+            yield start + row, neighbours[row][keep], neighbour_scores[row][keep]
+
+
+def build_similar_podcasts(db: Session, k: int = DEFAULT_TOP_K, block_size: int = 512) -> int:
+    """
+    Reconstruit la table similar_podcast : vecteurs TF-IDF de tous les podcasts, puis
+    les k plus proches voisins de chacun parmi les podcasts de même langue. La table
+    est remplacée dans une seule transaction (les lecteurs voient l'ancien index
+    jusqu'au commit).
+
+    :param k: Nombre de voisins conservés par podcast.
+    :param block_size: Nombre de lignes de la matrice de similarité calculées à la fois.
+    :return: Nombre de podcasts ayant au moins un voisin.
+    """
+    podcasts = db.execute(
+        select(
+            Video.id,
+            func.lower(Video.language).label("language"),
+            *[getattr(Video, field) for field in (*CATEGORY_WEIGHTS, *TEXT_WEIGHTS)],
+        )
+        .where(Video.is_podcast.is_(True))
+        .order_by(Video.id)
+    ).all()
+    if not podcasts:
+        return 0
+    video_ids = np.array([podcast.id for podcast in podcasts])
+    matrix = tfidf_matrix([podcast_terms(podcast) for podcast in podcasts])
+
+    rows_by_language: dict[str | None, list[int]] = {}
+    for position, podcast in enumerate(podcasts):
+        rows_by_language.setdefault(podcast.language, []).append(position)
+
+    db.execute(delete(SimilarPodcast))
+    indexed, pending = 0, []
+    for positions in rows_by_language.values():
+        positions = np.array(positions)
+        for row, neighbours, scores in top_k_neighbours(matrix[positions], k, block_size):
+            if not len(neighbours):
+                continue
+            indexed += 1
+            video_id = int(video_ids[positions[row]])
+            pending.extend(
+                {"video_id": video_id, "rank": rank, "similar_video_id": int(similar_id), "score": float(score)}
+                for rank, (similar_id, score) in enumerate(zip(video_ids[positions[neighbours]], scores), start=1)
+            )
+            if len(pending) >= INSERT_CHUNK_SIZE:
+                db.execute(insert(SimilarPodcast), pending)
+                pending = []
+    if pending:
+        db.execute(insert(SimilarPodcast), pending)
+    bump_data_versions(db, PODCASTS_SCOPE)
+    db.commit()
+    query_cache.invalidate(PODCASTS_TAG)
+    return indexed
@@ -1,12 +1,42 @@
-import random
+import re
+from datetime import datetime, timedelta
 from typing import List, Optional
-from sqlalchemy import and_, distinct, func, literal, or_
+from sqlalchemy import REAL, Row, and_, cast, distinct, func, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from sqlalchemy import update
 
-from app.utils.entities import process_video_dict
-from database.model import  Follow, Interviewer, InterviewerVideoLink, Video
+from app.utils.entities import canonical_label, duration_to_seconds, process_video_dict
+from app.crud.category_repos import invalidate_category_taxonomy
+from app.crud.data_version import INTERVIEWERS_SCOPE, PODCASTS_SCOPE, bump_data_versions
+from app.crud.interviewer_stats import STATS_SOURCE_FIELDS, interviewers_of_videos, refresh_interviewer_stats
+from app.crud.podcast_feed import FEED_SOURCE_FIELDS, refresh_podcast_feed
+from app.crud.partial_update import changed_values, update_many, update_returning
+from app.utils.pagination import keyset_after, keyset_order
+from app.utils.query_cache import INTERVIEWERS_TAG, PODCASTS_TAG, interviewer_tag, query_cache, user_follows_tag, video_tag
+from database.model import  FEED_SORT_KEYS, SEARCH_TEXT_CONFIG, VIDEO_PUBLISHED_AT_KEY, Follow, Interviewer, InterviewerVideoLink, PodcastFeed, SimilarPodcast, Video
+
+# Colonnes réécrites en continu (stats YouTube, compteur de vues, date de rafraîchissement) :
+# les listes les affichent mais leur écriture ne change pas les versions des listes.
+COUNTER_FIELDS = {"view_count", "like_count", "print_count", "visited_at"}
+
+def _fill_duration_seconds(video: Video) -> None:
+    """
+    Dérive duration_seconds (colonne triable/filtrable) de la durée "HH:MM:SS" si elle n'est pas fournie.
+    """
+    if video.duration and video.duration_seconds is None:
+        video.duration_seconds = duration_to_seconds(video.duration)
+
+def _canonicalize_labels(video: Video) -> None:
+    """
+    Catégories et langue canoniques à l'écriture (espaces retirés, langue en minuscules) :
+    les comparaisons par égalité (podcasts similaires, arbre des catégories) restent
+    servies par les index btree sans passer par lower().
+    """
+    video.main_category = canonical_label(video.main_category)
+    video.category = canonical_label(video.category)
+    video.language = canonical_label(video.language, lower=True)
 
 def save_video(session: Session, video: Video) -> Video | None:
     """
@@ -17,8 +47,14 @@ def save_video(session: Session, video: Video) -> Video | None:
     :return: L'objet Video avec son ID, ou None en cas d'erreur.
     """
     try:
+        _fill_duration_seconds(video)
+        _canonicalize_labels(video)
         session.add(video)
+        session.flush()
+        _after_videos_write(session, [video.id])
         session.commit()
+        invalidate_category_taxonomy()
+        _invalidate_video_caches([video.id])
         session.refresh(video)  
         return video
     except Exception as e:
@@ -26,40 +62,108 @@ def save_video(session: Session, video: Video) -> Video | None:
         print("Erreur dans create_video:", e)
         return None
 
+def _invalidate_video_caches(video_ids: List[int], changed_fields: Optional[set] = None) -> None:
+    """
+    A appeler après le commit : les listes et les stats des intervenants dépendent des vidéos.
+    Une écriture qui ne touche que des compteurs (`changed_fields`) n'invalide que les
+    entrées des vidéos elles-mêmes : les listes en cache gardent des compteurs un peu
+    anciens jusqu'à leur TTL au lieu de vider tout le cache à chaque rafraîchissement.
+    """
+    tags = [video_tag(video_id) for video_id in video_ids]
+    if changed_fields is None or changed_fields - COUNTER_FIELDS:
+        tags += [PODCASTS_TAG, INTERVIEWERS_TAG]
+    query_cache.invalidate(*tags)
+
+def _after_videos_write(db: Session, video_ids: List[int], changed_fields: Optional[set] = None) -> None:
+    """
+    Met à jour les read models dérivés des vidéos modifiées, dans la même transaction.
+    Pour une mise à jour partielle, `changed_fields` limite le travail : les read models
+    ne sont recalculés que si une de leurs colonnes sources change, et les versions des
+    listes (verrou sur data_version jusqu'au commit, ETags) ne changent pas pour une
+    écriture qui ne touche que des compteurs.
+    """
+    if changed_fields is None or changed_fields & (FEED_SOURCE_FIELDS | STATS_SOURCE_FIELDS):
+        refresh_podcast_feed(db, video_ids)
+        refresh_interviewer_stats(db, interviewers_of_videos(db, video_ids))
+    if changed_fields is None or changed_fields - COUNTER_FIELDS:
+        bump_data_versions(db, PODCASTS_SCOPE, INTERVIEWERS_SCOPE)
+
+def save_interviewer_video_links(db: Session, links: List[tuple[int, int]]) -> bool:
+    """
+    Lie des intervenants à des vidéos (les liens déjà existants sont ignorés).
+
+    :param db: Session de base de données.
+    :param links: Liste de couples (video_id, interviewer_id).
+    :return: True si succès, False sinon.
+    """
+    if not links:
+        return True
+    try:
+        db.execute(
+            pg_insert(InterviewerVideoLink)
+            .values([{"video_id": video_id, "interviewer_id": interviewer_id} for video_id, interviewer_id in links])
+            .on_conflict_do_nothing()
+        )
+        _after_videos_write(db, [video_id for video_id, _ in links])
+        db.commit()
+        _invalidate_video_caches([video_id for video_id, _ in links])
+        return True
+    except Exception as e:
+        db.rollback()
+        print("Erreur dans save_interviewer_video_links:", e)
+        return False
+
 def save_all_videos(db: Session, videos: list[Video]) -> list[Video] | None:
     """
     Sauvegarde une liste de vidéos dans la base de données et retourne les objets avec leurs IDs mis à jour.
     """
     try:
+        for video in videos:
+            _fill_duration_seconds(video)
+            _canonicalize_labels(video)
         db.add_all(videos)
         db.flush()  
+        _after_videos_write(db, [video.id for video in videos])
         db.commit()
+        invalidate_category_taxonomy()
+        _invalidate_video_caches([video.id for video in videos])
         return videos
     except Exception as e:
         db.rollback()
         print("❌ Erreur dans save_all_videos:", e)
         return None
 
+def build_search_tsquery(search: str):
+    """
+    Construit une tsquery préfixe ("mach:* & learn:*") à partir de la saisie utilisateur.
+    Seuls les mots alphanumériques sont gardés, la syntaxe tsquery ne peut donc pas être injectée.
+    """
+    terms = re.findall(r"[^\W_]+", search.lower())
+    if not terms:
+        return None
+    return func.to_tsquery(SEARCH_TEXT_CONFIG, " & ".join(f"{term}:*" for term in terms))
+
 def get_podcast_by_keywords(
     db: Session, 
     search: str, 
-    limit: int = 20
+    offset: int = 0,
+    limit: int = 20,
+    cursor: list | None = None,
 ):
     """
-    Recherche des podcasts en fonction de mots-clés dans plusieurs colonnes.
-    Retourne toujours une liste de dictionnaires.
+    Recherche plein texte des podcasts sur title, topic, catégories, key_words et rich_description.
+    Les résultats sont triés par pertinence (ts_rank_cd) puis par id.
+    Retourne toujours une liste de dictionnaires, chacun portant son score dans "rank".
+
+    :param cursor: Valeurs [rank, id] du dernier élément de la page précédente (prioritaire sur offset).
     """
 
     try:
-        # Construction des conditions
-        conditions = []
-        keywords = search.split()
-        for keyword in keywords:
-            conditions.append(Video.category.ilike(f"%{keyword}%"))
-            conditions.append(Video.main_category.ilike(f"%{keyword}%"))
-            #conditions.append(Video.title.ilike(f"%{keyword}%"))
-            conditions.append(Video.topic.ilike(f"%{keyword}%"))
+        ts_query = build_search_tsquery(search)
+        if ts_query is None:
+            return []
 
+        rank = func.ts_rank_cd(Video.search_vector, ts_query).label("rank")
 
         # Base du SELECT
         base_select = [
@@ -72,12 +176,21 @@ def get_podcast_by_keywords(
                        Video.view_count,
                        Video.like_count,
                        Video.main_category,
-                       Video.published_at
+                       Video.published_at,
+                       rank,
                        ]
 
         # Construction de la requête
-        stmt = select(*base_select).where(Video.is_podcast.is_(True), or_(*conditions))
-        stmt = stmt.order_by(Video.published_at.desc().nulls_last())
+        stmt = select(*base_select).where(Video.is_podcast.is_(True), Video.search_vector.op("@@")(ts_query))
+        if cursor is not None:
+            last_rank, last_id = cursor
+            # ts_rank_cd renvoie un real : on compare en real pour ne pas perdre l'égalité sur le dernier rang
+            stmt = stmt.where(
+                tuple_(rank, Video.id) < tuple_(cast(literal(last_rank), REAL), last_id)
+            )
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(rank.desc(), Video.id.desc())
 
         stmt = stmt.limit(limit)
         result = db.execute(stmt)
@@ -94,6 +207,7 @@ def get_podcast_by_keywords(
                  "like_count": video.like_count,
                  "logo_url": video.logo_url,
                  "published_at": video.published_at,
+                 "rank": video.rank,
                 }
                 for video in videos
             ]
@@ -102,37 +216,36 @@ def get_podcast_by_keywords(
         print("error in function get_videos_by_keywords:", e)
         return None
 
-def update_video(db: Session, updated_video: Video) -> Optional[Video]:
+def update_video(db: Session, updated_video: Video) -> Optional[Row]:
     """
-    Met à jour un objet Video existant avec uniquement les champs modifiés.
+    Met à jour un objet Video existant avec uniquement les champs modifiés, en un seul
+    UPDATE ... RETURNING (pas de chargement préalable de la ligne).
 
     :param db: Session de base de données.
     :param updated_video: Objet Video contenant l'ID et les champs à mettre à jour.
-    :return: L'objet Video mis à jour, ou None si non trouvé ou erreur.
+    :return: L'ID et les champs modifiés relus depuis la base, ou None si non trouvé ou erreur.
     """
     try:
         if updated_video.id is None:
             print("update_video: Aucun ID fourni.")
             return None
 
-        statement = select(Video).where(Video.id == updated_video.id)
-        result = db.execute(statement)
-        existing_video = result.scalars().first()
-
-        if not existing_video:
+        _fill_duration_seconds(updated_video)
+        _canonicalize_labels(updated_video)
+        changes = changed_values(updated_video)
+        updated = update_returning(db, Video, updated_video.id, changes)
+        if updated is None:
+            db.rollback()
             print(f"Aucune vidéo trouvée avec l'ID {updated_video.id}")
             return None
 
-        # Parcourt des attributs et mise à jour uniquement des champs non None
-        for field, value in vars(updated_video).items():
-            if field.startswith("_"):  # Ignorer les attributs internes SQLAlchemy
-                continue
-            if value is not None:
-                setattr(existing_video, field, value)
+        _after_videos_write(db, [updated.id], set(changes))
 
         db.commit()
-        db.refresh(existing_video)  # Retourne l'objet mis à jour depuis la base
-        return existing_video
+        if changes.keys() & {"main_category", "category"}:
+            invalidate_category_taxonomy()
+        _invalidate_video_caches([updated.id], set(changes))
+        return updated
 
     except Exception as e:
         print("Erreur dans update_video:", e)
@@ -140,6 +253,31 @@ def update_video(db: Session, updated_video: Video) -> Optional[Video]:
         return None
 
 
+def update_videos_stats(db: Session, stats: List[dict]) -> int:
+    """
+    Écrit les compteurs de plusieurs vidéos en un seul UPDATE ... FROM (VALUES ...),
+    puis met à jour les read models qui en dépendent.
+
+    :param db: Session de base de données.
+    :param stats: [{"id", "view_count", "like_count", ...}], mêmes colonnes pour chaque vidéo.
+    :return: Nombre de vidéos mises à jour.
+    """
+    if not stats:
+        return 0
+    try:
+        video_ids = [row["id"] for row in stats]
+        updated = update_many(db, Video, stats)
+        changed_fields = set(stats[0]) - {"id"}
+        _after_videos_write(db, video_ids, changed_fields)
+        db.commit()
+        _invalidate_video_caches(video_ids, changed_fields)
+        return updated
+    except Exception as e:
+        print("Erreur dans update_videos_stats:", e)
+        db.rollback()
+        return 0
+
+
 def filter_videos_by_ids(session: Session, video_ids: List[int]) -> (List[Video], List[int]): # type: ignore
     """
     Fonction pour récupérer les vidéos correspondant à une liste d'IDs et retourner les IDs manquants.
@@ -160,6 +298,7 @@ def filter_videos_by_ids(session: Session, video_ids: List[int]) -> (List[Video]
         print("erreur in function filter_videos_by_ids: ",e)
         return None, None
 
+@query_cache.cached("get_podcasts_with_filter", tags=lambda args: [PODCASTS_TAG])
 def get_podcasts_with_filter(
     db: Session,
     offset: int = 0,
@@ -169,27 +308,42 @@ def get_podcasts_with_filter(
     by_main_category: str | None = None,
     by_sub_category: str | None = None,     
     by_language: str | None = None,
+    min_duration: int | None = None,
+    max_duration: int | None = None,
+    cursor: tuple | None = None,
 ):
     """
-    Retourne les podcasts (vidéos) filtrés et triés.
+    Retourne les podcasts (vidéos) filtrés et triés, lus dans le read model podcast_feed
+    (une ligne par podcast avec invité, clés de tri précalculées).
+    Chaque élément porte sa clé de tri dans "sort_key" pour construire le curseur de la page suivante.
+
+    :param min_duration: Durée minimale en secondes.
+    :param max_duration: Durée maximale en secondes.
+    :param cursor: (sort_key, id) du dernier élément de la page précédente ; s'il est fourni, offset est ignoré.
     """
-    #step1: select videos wich are podcasts
-    base_conditions = [
-        Video.is_podcast.is_(True),
-       
-    ]
-    # step2: apply filters
+    base_conditions = []
+    # step1: apply filters (stored lower-cased in the feed)
     if by_main_category:
         fv = by_main_category.strip()
-        base_conditions.append(func.lower(Video.main_category) == fv.lower())
+        base_conditions.append(PodcastFeed.main_category == fv.lower())
 
     if by_sub_category:
         fv = by_sub_category.strip()
-        base_conditions.append(func.lower(Video.category) == fv.lower())
+        base_conditions.append(PodcastFeed.category == fv.lower())
     if by_language:
         fv = by_language.strip()
-        base_conditions.append(func.lower(Video.language) == fv.lower())
-    # step3: make request
+        base_conditions.append(PodcastFeed.language == fv.lower())
+    if min_duration is not None:
+        base_conditions.append(PodcastFeed.duration_seconds >= min_duration)
+    if max_duration is not None:
+        base_conditions.append(PodcastFeed.duration_seconds <= max_duration)
+
+    # step2: sort key (sort key + id, served by the ix_podcast_feed_*_keyset indexes)
+    sort_key = FEED_SORT_KEYS.get(order_by, FEED_SORT_KEYS["published_at"])
+    if cursor is not None:
+        base_conditions.append(keyset_after(sort_key, PodcastFeed.video_id, ascending, *cursor))
+
+    # step3: make request, the video row is only fetched by primary key for the page
     stmt = (
         select(
                Video.id,
@@ -202,28 +356,17 @@ def get_podcasts_with_filter(
                Video.published_at, 
                Video.rich_description,
                Video.duration,
-               Video.main_category
+               Video.main_category,
+               sort_key.label("sort_key"),
             )
-        .join(InterviewerVideoLink, Video.id == InterviewerVideoLink.video_id)
-        .join(Interviewer, Interviewer.id == InterviewerVideoLink.interviewer_id)
+        .select_from(PodcastFeed)
+        .join(Video, Video.id == PodcastFeed.video_id)
         .where(and_(*base_conditions))
+        .order_by(*keyset_order(sort_key, PodcastFeed.video_id, ascending))
     )
-    # step4: apply orders
-    if order_by == "view_count":
-        col = Video.view_count
-    elif order_by == "like_count":
-        col = Video.like_count
-    elif order_by == "duration":
-        col = Video.duration
-    else:  
-        col = Video.published_at
-
-    if ascending:
-        stmt = stmt.order_by(col.asc().nulls_last())
-    else:
-        stmt = stmt.order_by(col.desc().nulls_last())
-
-    stmt = stmt.offset(offset).limit(limit)
+    if cursor is None:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit)
 
     result = db.execute(stmt)
     videos = result.mappings().all()
@@ -240,10 +383,12 @@ def get_podcasts_with_filter(
         "published_at": v.get("published_at"),
         "rich_description": v.get("rich_description"),
         "duration": v.get("duration"),
+        "sort_key": v.get("sort_key"),
     }
     for v in videos]
     return [process_video_dict(video) for video in videos_list]
 
+@query_cache.cached("get_single_podcast", tags=lambda args: [video_tag(args["video_id"])])
 def get_single_podcast(
     db: Session,
     video_id: int,
@@ -278,6 +423,10 @@ def get_single_podcast(
     return dict(video)
     
 
+@query_cache.cached(
+    "get_interviewers_by_podcast",
+    tags=lambda args: [video_tag(args["video_id"]), INTERVIEWERS_TAG, user_follows_tag(args["current_user_id"])],
+)
 def get_interviewers_by_podcast(
     db: Session,
     video_id: int,
@@ -291,8 +440,7 @@ def get_interviewers_by_podcast(
     stmt = (
         select(Interviewer.id, 
                Interviewer.name, 
-               Interviewer.expertise, 
-               Interviewer.image_profil)
+               Interviewer.display)
         .join(InterviewerVideoLink, Interviewer.id == InterviewerVideoLink.interviewer_id)
         .where(InterviewerVideoLink.video_id == video_id)
     )
@@ -311,61 +459,56 @@ def get_interviewers_by_podcast(
     return [dict(interviewer) for interviewer in interviewer_rows ]
 
 
-def get_similar_podcasts(db: Session, video_id: int,video_main_category: str,video_sub_category: str, video_language: str, limit: int = 5):
+@query_cache.cached("get_similar_podcasts", tags=lambda args: [PODCASTS_TAG])
+def get_similar_podcasts(db: Session, video_id: int, limit: int = 10) -> List[dict]:
     """
-    Récupère les vidéos similaires basées sur la même catégorie que la vidéo donnée.
+    Podcasts similaires précalculés (table similar_podcast, voir app.crud.similar_podcasts),
+    du plus proche au plus éloigné : un parcours de clé primaire, résultat stable.
+    Un podcast absent de l'index (publié depuis la dernière construction) reçoit les
+    podcasts les plus récents de même catégorie et de même langue.
     """
-    stmt = (
-        select(Video.id,
-               Video.title,
-               Video.topic,
-               Video.logo_url,
-               Video.duration
-               )
-        .where(
-            Video.category == video_sub_category,
-            Video.is_podcast.is_(True),
-            Video.id != video_id,
-            Video.language == video_language  
-        )
-        .order_by(Video.published_at.desc().nulls_last())
+    columns = (Video.id, Video.title, Video.topic, Video.logo_url, Video.duration)
+    rows = db.execute(
+        select(*columns)
+        .join(SimilarPodcast, SimilarPodcast.similar_video_id == Video.id)
+        .where(SimilarPodcast.video_id == video_id)
+        .order_by(SimilarPodcast.rank)
         .limit(limit)
-    )
-    result = db.execute(stmt)
-    videos = result.scalars().all()
-    if len(videos) <= 0:
-        stmt = (
-        select(Video.id,
-               Video.title,
-               Video.topic,
-               Video.logo_url,
-               Video.duration)
+    ).mappings().all()
+    if rows:
+        return [dict(row) for row in rows]
+
+    video = db.execute(select(Video.category, Video.language).where(Video.id == video_id)).first()
+    if video is None:
+        return []
+    rows = db.execute(
+        select(*columns)
         .where(
-            Video.main_category == video_main_category,
+            Video.category == video.category,
+            Video.language == video.language,
             Video.is_podcast.is_(True),
             Video.id != video_id,
-            Video.language == video_language  
         )
-        .order_by(Video.published_at.desc().nulls_last())
+        .order_by(Video.published_at.desc().nulls_last(), Video.id.desc())
         .limit(limit)
-    )
-    result = db.execute(stmt)
-    videos = result.mappings().all()  
-    videos = [
-    {
-        "id": v["id"],
-        "title": v.get("title"),
-        "topic": v.get("topic"),
-        "logo_url": v.get("logo_url"),
-        "duration": v.get("duration"),
-    }
-    for v in videos]
-    videos_dict = [process_video_dict(video) for video in videos]
-     
-    random.shuffle(videos_dict)
-    return videos_dict[:min(limit+20, len(videos_dict))]
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+@query_cache.cached("get_hosted_podcasts", tags=lambda args: [interviewer_tag(args["interviewer_id"]), PODCASTS_TAG])
+def get_hosted_podcasts(db: Session, interviewer_id: int, limit: int = 5, cursor: tuple | None = None):
+    """
+    Podcasts d'un intervenant, du plus récent au plus ancien.
+
+    :param cursor: (sort_key, id) du dernier podcast de la page précédente.
+    """
+    sort_key = VIDEO_PUBLISHED_AT_KEY
+    conditions = [
+        Video.is_podcast.is_(True),
+        InterviewerVideoLink.interviewer_id == interviewer_id,
+    ]
+    if cursor is not None:
+        conditions.append(keyset_after(sort_key, Video.id, False, *cursor))
 
-def get_hosted_podcasts(db: Session, interviewer_id: int, limit: int = 5):
     stmt = (
         select(
             Video.id,
@@ -377,13 +520,11 @@ def get_hosted_podcasts(db: Session, interviewer_id: int, limit: int = 5):
             Video.duration,
             Video.view_count,
             Video.like_count,
+            sort_key.label("sort_key"),
         )
         .join(InterviewerVideoLink, Video.id == InterviewerVideoLink.video_id)
-        .where(
-            Video.is_podcast.is_(True),
-            InterviewerVideoLink.interviewer_id == interviewer_id,
-        )
-        .order_by(Video.published_at.desc().nulls_last())
+        .where(*conditions)
+        .order_by(*keyset_order(sort_key, Video.id, False))
         .limit(limit)
     )
 
@@ -392,6 +533,68 @@ def get_hosted_podcasts(db: Session, interviewer_id: int, limit: int = 5):
     return [dict(row) for row in rows]
 
 
+def get_podcast_stats(db: Session, video_ids: List[int]) -> List[Video]:
+    """
+    Récupère les stats en base (vues, likes, date de dernière mise à jour) de plusieurs podcasts.
+
+    :param db: Session de base de données.
+    :param video_ids: IDs des podcasts.
+    :return: Les vidéos trouvées, dans l'ordre de `video_ids`.
+    """
+    try:
+        rows = db.execute(
+            select(Video.id, Video.view_count, Video.like_count, Video.visited_at)
+            .where(Video.id.in_(video_ids), Video.is_podcast.is_(True))
+        ).all()
+        by_id = {row.id: row for row in rows}
+        return [by_id[video_id] for video_id in video_ids if video_id in by_id]
+    except Exception as e:
+        db.rollback()
+        print("Erreur dans get_podcast_stats function:", e)
+        return []
+
+
+def claim_stale_podcasts(
+    db: Session,
+    video_ids: List[int],
+    stale_before: datetime,
+    lease: timedelta,
+) -> List[tuple[int, str]]:
+    """
+    Réserve les podcasts dont les stats sont plus anciennes que `stale_before`. L'UPDATE
+    est atomique : si plusieurs workers demandent le même rafraîchissement, un seul
+    d'entre eux récupère la vidéo et appelle YouTube.
+
+    La réservation est un bail : visited_at passe à `stale_before + lease`, les stats
+    redeviennent donc périmées après `lease` si le rafraîchissement échoue (erreur de
+    l'API, vidéo absente de la réponse). Un rafraîchissement réussi écrit la vraie date.
+
+    :param db: Session de base de données.
+    :param video_ids: IDs des podcasts à rafraîchir.
+    :param stale_before: Date en dessous de laquelle les stats sont considérées périmées.
+    :param lease: Durée de la réservation.
+    :return: Liste de (id, youtube_video_id) réservés par cet appel.
+    """
+    try:
+        rows = db.execute(
+            update(Video)
+            .where(
+                Video.id.in_(video_ids),
+                Video.is_podcast.is_(True),
+                or_(Video.visited_at.is_(None), Video.visited_at < stale_before),
+            )
+            .values(visited_at=stale_before + lease)
+            .returning(Video.id, Video.youtube_video_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return [(row.id, row.youtube_video_id) for row in rows]
+    except Exception as e:
+        db.rollback()
+        print("Erreur dans claim_stale_podcasts function:", e)
+        return []
+
+
 def get_podcast_by_id(db: Session, id: str) -> Optional[Video]:
     """
     Récupère une vidéo depuis la base de données à partir de son  ID .
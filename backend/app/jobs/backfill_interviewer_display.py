@@ -0,0 +1,58 @@
+"""
+Backfill of `interviewer.display`, the display-ready fields the API returns
+as is (see app.utils.entities.interviewer_display).
+
+    python -m app.jobs.backfill_interviewer_display [--batch-size 1000]
+
+Run it once after migration 013, after writers that bypass the crud layer
+(crawler, psql), and whenever PROFILE_IMAGE_BASE_URL changes. Idempotent: every
+batch recomputes the display of its interviewers, so the job can be re-run or
+resumed with --from-id after an interruption.
+"""
+import argparse
+
+from sqlalchemy import select
+
+from app.crud.data_version import INTERVIEWERS_SCOPE, PODCASTS_SCOPE, bump_data_versions
+from app.crud.interviewers_repos import refresh_interviewer_display
+from app.session import get_session_direct
+from app.utils.query_cache import INTERVIEWERS_TAG, query_cache
+from database.model import Interviewer
+
+
+def backfill_interviewer_display(batch_size: int = 1000, from_id: int = 0) -> int:
+    db = get_session_direct()
+    last_id = from_id
+    processed = 0
+    try:
+        while True:
+            ids = db.execute(
+                select(Interviewer.id)
+                .where(Interviewer.id > last_id)
+                .order_by(Interviewer.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            refresh_interviewer_display(db, ids)
+            bump_data_versions(db, INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
+            db.commit()
+            processed += len(ids)
+            last_id = ids[-1]
+            print(f"display computed for {processed} interviewers (last id {last_id})")
+    except Exception as e:
+        db.rollback()
+        print(f"Error in backfill_interviewer_display after id {last_id}: {e}")
+        raise
+    finally:
+        db.close()
+        query_cache.invalidate(INTERVIEWERS_TAG)
+    return processed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--from-id", type=int, default=0)
+    args = parser.parse_args()
+    backfill_interviewer_display(args.batch_size, args.from_id)
@@ -0,0 +1,52 @@
+"""
+One-off backfill of the expertise/topic tag tables from the pipe-delimited
+`interviewer.expertise` and `interviewer.suggested_topic` strings.
+
+    python -m app.jobs.backfill_interviewer_tags [--batch-size 1000]
+
+Idempotent: every batch rewrites the tags of its interviewers, so the job can be
+re-run or resumed with --from-id after an interruption.
+"""
+import argparse
+
+from sqlalchemy import select
+
+from app.crud.interviewer_tags import sync_interviewer_tags
+from app.session import get_session_direct
+from database.model import Interviewer
+
+
+def backfill_interviewer_tags(batch_size: int = 1000, from_id: int = 0) -> int:
+    db = get_session_direct()
+    last_id = from_id
+    processed = 0
+    try:
+        while True:
+            ids = db.execute(
+                select(Interviewer.id)
+                .where(Interviewer.id > last_id)
+                .order_by(Interviewer.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            sync_interviewer_tags(db, ids)
+            db.commit()
+            processed += len(ids)
+            last_id = ids[-1]
+            print(f"tags synced for {processed} interviewers (last id {last_id})")
+    except Exception as e:
+        db.rollback()
+        print(f"Error in backfill_interviewer_tags after id {last_id}: {e}")
+        raise
+    finally:
+        db.close()
+    return processed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--from-id", type=int, default=0)
+    args = parser.parse_args()
+    backfill_interviewer_tags(args.batch_size, args.from_id)
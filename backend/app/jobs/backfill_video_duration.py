@@ -0,0 +1,56 @@
+"""
+One-off backfill of video.duration_seconds from the "HH:MM:SS" duration strings.
+
+    python -m app.jobs.backfill_video_duration [--batch-size 5000]
+
+Works by id ranges with one commit per batch, so it never holds long locks and
+can be re-run safely (only rows without duration_seconds are touched). Durations
+are parsed by duration_to_seconds, like on the write paths; unparsable ones stay
+NULL. Run app.jobs.rebuild_podcast_feed afterwards so the feed picks up the new values.
+"""
+import argparse
+
+from sqlalchemy import func, select
+
+from app.crud.partial_update import update_many
+from app.session import get_session_direct
+from app.utils.entities import duration_to_seconds
+from database.model import Video
+
+
+def backfill_video_duration(batch_size: int = 5000) -> int:
+    db = get_session_direct()
+    updated = 0
+    try:
+        max_id = db.execute(select(func.max(Video.id))).scalar() or 0
+        for start in range(0, max_id + 1, batch_size):
+            rows = db.execute(
+                select(Video.id, Video.duration).where(
+                    Video.id >= start,
+                    Video.id < start + batch_size,
+                    Video.duration_seconds.is_(None),
+                    Video.duration.isnot(None),
+                )
+            ).all()
+            durations = [
+                {"id": video_id, "duration_seconds": seconds}
+                for video_id, duration in rows
+                if (seconds := duration_to_seconds(duration)) is not None
+            ]
+            updated += update_many(db, Video, durations)
+            db.commit()
+        print(f"duration_seconds filled for {updated} videos")
+    except Exception as e:
+        db.rollback()
+        print(f"Error in backfill_video_duration: {e}")
+        raise
+    finally:
+        db.close()
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    backfill_video_duration(args.batch_size)
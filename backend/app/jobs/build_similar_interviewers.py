@@ -0,0 +1,30 @@
+"""
+Build the similar_interviewer index: top-k neighbours of every interviewer.
+
+    python -m app.jobs.build_similar_interviewers [--top-k 30] [--block-size 512]
+
+Interviewers are compared on three signals: the podcasts they appear in, the
+channels of those podcasts and their expertise tags. Each signal is an
+idf-weighted cosine, and the score is their weighted sum (SIGNAL_WEIGHTS). The
+table is replaced in one transaction. Interviewers added since the last run fall
+back to the shared-tags query until the next run.
+"""
+import argparse
+import time
+
+from app.crud.similar_interviewers import DEFAULT_TOP_K, build_similar_interviewers
+from app.session import get_session_direct
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--block-size", type=int, default=512)
+    args = parser.parse_args()
+
+    db = get_session_direct()
+    try:
+        start = time.perf_counter()
+        count = build_similar_interviewers(db, k=args.top_k, block_size=args.block_size)
+        print(f"similar_interviewer built: {count} interviewers indexed in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
@@ -0,0 +1,31 @@
+"""
+Build the similar_podcast index: top-k TF-IDF neighbours of every podcast.
+
+    python -m app.jobs.build_similar_podcasts [--top-k 20] [--block-size 512]
+
+Each podcast becomes a TF-IDF vector over its topic, rich_description, key_words
+and categories. Neighbours are the podcasts of the same language with the
+highest cosine similarity, computed --block-size rows at a time. The table is
+replaced in one transaction. Podcasts published since the last run fall back to
+the latest podcasts of their category until the next run, so schedule it
+(e.g. nightly) after the crawler.
+"""
+import argparse
+import time
+
+from app.crud.similar_podcasts import DEFAULT_TOP_K, build_similar_podcasts
+from app.session import get_session_direct
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--block-size", type=int, default=512)
+    args = parser.parse_args()
+
+    db = get_session_direct()
+    try:
+        start = time.perf_counter()
+        count = build_similar_podcasts(db, k=args.top_k, block_size=args.block_size)
+        print(f"similar_podcast built: {count} podcasts indexed in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
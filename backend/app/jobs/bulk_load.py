@@ -0,0 +1,48 @@
+"""
+Bulk load of crawler output into video, channel, interviewer or interviewervideolink.
+
+    python -m app.jobs.bulk_load video videos.jsonl [--batch-size 5000]
+    python -m app.jobs.bulk_load interviewervideolink links.csv
+
+Records are read from a JSONL file (one object per line) or a CSV file with a
+header row. They are streamed in batches. Each batch is COPYed into a temporary
+table and merged on its natural key: youtube_video_id, youtube_channel_id, or
+id / a social link for interviewers. Link records give video_id or
+youtube_video_id, and interviewer_id or interviewer_<social link>. Keys a record
+omits, or sets to null, leave the existing value untouched. A batch violating a
+constraint (e.g. a foreign key) is rolled back and counted as skipped, and the load
+goes on. Any other error (bad COPY data, wrong value type) rolls the batch back and
+stops the load; the batches already committed stay loaded.
+
+Load order for a fresh crawl: channel, video, interviewer, interviewervideolink.
+"""
+import argparse
+
+from app.crud.bulk_load import DEFAULT_BATCH_SIZE, ENTITIES, LoadResult, bulk_load, read_records
+from app.session import get_session_direct
+
+
+def report(batch: LoadResult, total: LoadResult) -> None:
+    print(
+        f"{total.rows} {total.entity} rows: +{batch.inserted} inserted, {batch.updated} updated, "
+        f"{batch.skipped} skipped in this batch ({batch.rows_per_second:.0f} rows/s, "
+        f"{total.rows_per_second:.0f} rows/s overall)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("entity", choices=ENTITIES)
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = get_session_direct()
+    try:
+        total = bulk_load(db, args.entity, read_records(args.path), args.batch_size, on_batch=report)
+        print(
+            f"{args.entity} loaded: {total.rows} rows ({total.inserted} inserted, {total.updated} updated, "
+            f"{total.skipped} skipped) in {total.seconds:.1f}s, {total.rows_per_second:.0f} rows/s"
+        )
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+"""
+Full rebuild of interviewer_stats.
+
+    python -m app.jobs.rebuild_interviewer_stats
+
+The API keeps the stats up to date incrementally on its write paths; run this
+after the initial deployment and after writers that bypass the crud layer
+(crawler, psql). The new table is built next to the live one and swapped in,
+so /interviewers/filter keeps serving the old stats during the rebuild.
+"""
+import time
+
+from app.crud.interviewer_stats import rebuild_interviewer_stats
+from app.session import get_session_direct
+
+if __name__ == "__main__":
+    db = get_session_direct()
+    try:
+        start = time.perf_counter()
+        count = rebuild_interviewer_stats(db)
+        print(f"interviewer_stats rebuilt: {count} interviewers in {time.perf_counter() - start:.1f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,21 @@
+"""
+Full rebuild of the podcast_feed read model.
+
+    python -m app.jobs.rebuild_podcast_feed
+
+The API keeps the feed up to date on its own write paths; run this after the
+initial migration and after writers that bypass the crud layer (crawler, psql).
+"""
+import time
+
+from app.crud.podcast_feed import rebuild_podcast_feed
+from app.session import get_session_direct
+
+if __name__ == "__main__":
+    db = get_session_direct()
+    try:
+        start = time.perf_counter()
+        count = rebuild_podcast_feed(db)
+        print(f"podcast_feed rebuilt: {count} podcasts in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
@@ -0,0 +1,19 @@
+"""
+Fix drift between the follow table and the follower counters
+(interviewer_stats.folowers_count, user.following_count).
+
+    python -m app.jobs.reconcile_follow_counters
+
+The API keeps the counters exact on its own follow/unfollow path; drift only
+comes from writers that bypass it (psql, imports). Safe to run at any time.
+"""
+from app.crud.follower import reconcile_follow_counters
+from app.session import get_session_direct
+
+if __name__ == "__main__":
+    db = get_session_direct()
+    try:
+        fixed_interviewers, fixed_users = reconcile_follow_counters(db)
+        print(f"follower counters reconciled: {fixed_interviewers} interviewers, {fixed_users} users fixed")
+    finally:
+        db.close()
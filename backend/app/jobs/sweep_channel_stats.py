@@ -0,0 +1,115 @@
+"""
+Refresh the YouTube statistics of every channel whose `state` is at most --state.
+
+    python -m app.jobs.sweep_channel_stats --state 0 [--concurrency 4] [--page-size 500]
+
+Channels are streamed by id, one page at a time. Each page is fetched with
+channels.list calls of 50 ids, at most --concurrency in flight. The whole page is
+then written with one set-based UPDATE that moves the current counters to the
+prev_* columns and sets `state` to --state + 1.
+
+Resuming: after every committed page the last channel id is saved to the
+--checkpoint file, and the next run with the same --state starts after it. The
+checkpoint is removed once the sweep reaches the last channel, so the next cycle
+(after states are reset) starts from the first channel again. A swept channel
+also leaves the `state <= --state` selection, so re-running without the
+checkpoint never refreshes a channel twice. The sweep stops at the
+first API error (e.g. quota exceeded) without writing the current page.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from googleapiclient.errors import HttpError
+
+from app.crud.channels_repos import get_channels_to_sweep, update_channels_stats
+from app.session import get_session_direct
+from app.utils.youtube_api import YOUTUBE_MAX_IDS, http_error_message, youtube_client
+
+DEFAULT_CHECKPOINT = ".sweep_channel_stats.json"
+
+
+def read_checkpoint(path: str, state: int) -> int:
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return 0
+    return checkpoint["last_id"] if checkpoint.get("state") == state else 0
+
+
+def write_checkpoint(path: str, state: int, last_id: int) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"state": state, "last_id": last_id}, f)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sweep_channel_stats(
+    state: int,
+    concurrency: int = 4,
+    page_size: int = 500,
+    checkpoint: str = DEFAULT_CHECKPOINT,
+) -> int:
+    db = get_session_direct()
+    last_id = read_checkpoint(checkpoint, state)
+    swept = 0
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                page = get_channels_to_sweep(db, state, after_id=last_id, limit=page_size)
+                if not page:
+                    clear_checkpoint(checkpoint)
+                    break
+                youtube_ids = [youtube_id for _, youtube_id in page]
+                chunks = [youtube_ids[i:i + YOUTUBE_MAX_IDS] for i in range(0, len(youtube_ids), YOUTUBE_MAX_IDS)]
+                stats_by_youtube_id = {}
+                for chunk_stats in executor.map(youtube_client.channels_stats, chunks):
+                    stats_by_youtube_id.update(chunk_stats)
+
+                stats_by_id = {
+                    channel_id: stats_by_youtube_id[youtube_id]
+                    for channel_id, youtube_id in page
+                    if youtube_id in stats_by_youtube_id
+                }
+                missing_ids = [channel_id for channel_id, _ in page if channel_id not in stats_by_id]
+                update_channels_stats(db, stats_by_id, state + 1, visited_ids=missing_ids)
+                db.commit()
+
+                last_id = page[-1][0]
+                write_checkpoint(checkpoint, state, last_id)
+                swept += len(page)
+                print(
+                    f"{swept} channels swept (last id {last_id}, {len(missing_ids)} missing on YouTube, "
+                    f"{swept / (time.perf_counter() - start):.0f} channels/s)"
+                )
+    except HttpError as e:
+        db.rollback()
+        print(f"YouTube API error after channel id {last_id}, stopping: {http_error_message(e)}")
+    except Exception as e:
+        db.rollback()
+        print(f"Error in sweep_channel_stats after channel id {last_id}: {e}")
+        raise
+    finally:
+        db.close()
+    return swept
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--state", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    args = parser.parse_args()
+    sweep_channel_stats(args.state, args.concurrency, args.page_size, args.checkpoint)
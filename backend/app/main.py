@@ -1,9 +1,33 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.api.v1 import category_controller, interviewer_controller, video_controller
+from app.api.v1 import cache_controller, category_controller, interviewer_controller, video_controller
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.stats_refresher import stats_refresher
+from app.utils.view_counters import view_counters
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = [
+        asyncio.create_task(view_counters.run()),
+        asyncio.create_task(stats_refresher.run()),
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    # Les vues encore en mémoire sont écrites avant l'arrêt du worker
+    await run_in_threadpool(view_counters.flush_now)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 origins = [
     "http://localhost:4200",  
     "http://127.0.0.1:4200",
@@ -15,8 +39,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],              
     allow_headers=["*"],             
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.include_router(interviewer_controller.router, prefix="/interviewers", tags=["interviewers"])
 app.include_router(video_controller.router, prefix="/podcasts", tags=["podcasts"])
-app.include_router(category_controller.router, prefix="/categories", tags=["categories"])
\ No newline at end of file
+app.include_router(category_controller.router, prefix="/categories", tags=["categories"])
+app.include_router(cache_controller.router, prefix="/cache", tags=["cache"])
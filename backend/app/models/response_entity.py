@@ -41,21 +41,27 @@ class InterviewerResponse(BaseModel):
     videos: Optional[List[VideoResponse]] = None
     model_config = ConfigDict(from_attributes=True)
 
-class SingleVideoResponse(BaseModel):
-    podcast_detail: VideoResponse
-    interviewers: List[InterviewerResponse]
-    similar_podcasts: List[VideoResponse]
-    model_config = ConfigDict(from_attributes=True)
-
 class VideoStatResponse(BaseModel):
-    view_count: Optional[int] = None,
-    like_count: Optional[int] = None,
+    id: Optional[int] = None
+    view_count: Optional[int] = None
+    like_count: Optional[int] = None
     visited_at: Optional[datetime] = None
+    # "fresh" : stats à jour, "refreshing" : stats en cache, rafraîchissement en cours
+    status: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+class SingleVideoResponse(BaseModel):
+    podcast_detail: VideoResponse
+    interviewers: List[InterviewerResponse] = []
+    similar_podcasts: List[VideoResponse] = []
+    stats: Optional[VideoStatResponse] = None
     model_config = ConfigDict(from_attributes=True)
 
 class SingleInterviewerResponse(BaseModel):
     interviewer_detail: InterviewerResponse 
-    hosted_podcasts: List[VideoResponse] = None,
-    simular_interviewers: List[InterviewerResponse] = None
+    hosted_podcasts: List[VideoResponse] = []
+    similar_interviewers: List[InterviewerResponse] = []
+    # Curseur de la page suivante de hosted_podcasts (à passer à /hosted_podcast/{id})
+    hosted_podcasts_next_cursor: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
@@ -1,5 +1,9 @@
+from typing import Callable, TypeVar
+
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -12,8 +16,8 @@ DATABASE_URL = test_settings.DATABASE_URL
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=test_settings.DB_POOL_SIZE,
+    max_overflow=test_settings.DB_MAX_OVERFLOW
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -29,3 +33,45 @@ def get_session():
 
 def get_session_direct():
     return SessionLocal()
+
+
+# Moteur async (asyncpg), utilisé par les endpoints de lecture quand DB_ASYNC est activé
+async_engine = None
+AsyncSessionLocal = None
+if test_settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+        pool_pre_ping=True,
+        pool_size=test_settings.DB_POOL_SIZE,
+        max_overflow=test_settings.DB_MAX_OVERFLOW,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+T = TypeVar("T")
+
+
+async def run_read(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Exécute une fonction crud `fn(db, *args, **kwargs)` depuis un endpoint async.
+
+    Avec DB_ASYNC, la fonction tourne sur une AsyncSession (run_sync) : les attentes
+    réseau rendent la main à la boucle d'événements au lieu d'occuper un thread.
+    Sinon elle tourne avec une session sync dans le threadpool, comme un endpoint `def`.
+
+    Les fonctions crud ne sont pas dupliquées en versions async : sous run_sync,
+    SQLAlchemy exécute la fonction dans un greenlet et chaque requête attend asyncpg
+    sur la boucle, ce qui donne le même comportement d'E/S qu'une réécriture avec
+    `await`. Les deux piles partagent ainsi les requêtes et le cache de query_cache.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            return await session.run_sync(fn, *args, **kwargs)
+
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
@@ -1,11 +1,39 @@
 from datetime import datetime, timezone
 
+from app.config import test_settings
+
 def split_string_to_list(value):
     """Convertit une chaîne séparée par '|' en liste"""
     if isinstance(value, str):
         return [item.strip() for item in value.split("|") if item.strip()]
     return value
 
+def duration_to_seconds(duration):
+    """
+    Convertit une durée "HH:MM:SS" (format de convert_iso_duration), "H:MM:SS" ou "MM:SS"
+    en secondes, None si vide ou invalide (minutes et secondes sur deux chiffres, < 60)
+    """
+    if not isinstance(duration, str):
+        return None
+    parts = duration.strip().split(":")
+    if len(parts) not in (2, 3) or not all(part.isascii() and part.isdigit() for part in parts):
+        return None
+    if any(len(part) != 2 or int(part) >= 60 for part in parts[1:]):
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def canonical_label(value, lower: bool = False):
+    """Libellé de catégorie ou de langue tel qu'il est stocké : espaces superflus retirés, None si vide"""
+    if not isinstance(value, str):
+        return value
+    value = " ".join(value.split())
+    if not value:
+        return None
+    return value.lower() if lower else value
+
 def format_video_duration(published_at) -> str:
     """
     Converts a publication date (datetime or ISO string) into a human-readable
@@ -52,29 +80,51 @@ def format_video_duration(published_at) -> str:
         years = seconds // 31536000
         return f"{years} year{'s' if years > 1 else ''} ago"
 
-def process_interviewer_dict(interviewer_dict):
-    """Traite un dictionnaire interviewer comme le faisaient les validators Pydantic"""
-    interviewer_dict['expertise'] = split_string_to_list(interviewer_dict.get('expertise'))
-    interviewer_dict['suggested_topic'] = split_string_to_list(interviewer_dict.get('suggested_topic'))
-    
-    if interviewer_dict.get('image_profil'):
-        interviewer_dict['image_profil'] = f"http://76.13.25.132/static/profil_images/{interviewer_dict['image_profil']}"
-
-    if interviewer_dict.get('expertise') and len(interviewer_dict['expertise']) > 2:
-        interviewer_dict['expertise'] = interviewer_dict['expertise'][:2]
-
-    if interviewer_dict.get('activity'):
-        interviewer_dict['activity'] = interviewer_dict['activity'].replace(";", ",")
-
-    social_links = ["linkedin", "twitter", "instagram", "facebook", "youtube", "tiktok", "wikipedia", "website"]
-    for link in social_links:
-        url = interviewer_dict.get(link)
+SOCIAL_LINK_FIELDS = ["linkedin", "twitter", "instagram", "facebook", "youtube", "tiktok", "wikipedia", "website"]
+
+# Colonnes Interviewer dont dérive Interviewer.display
+DISPLAY_SOURCE_FIELDS = {"expertise", "suggested_topic", "image_profil", "activity", *SOCIAL_LINK_FIELDS}
+
+
+def interviewer_display(interviewer) -> dict:
+    """
+    Champs d'affichage d'un intervenant (objet Interviewer ou dict), calculés à l'écriture
+    et stockés dans Interviewer.display : listes d'expertises et de sujets, URL complète
+    de l'image, liens sociaux vérifiés ("url|existed"). Les champs sources NULL et les
+    liens non vérifiés ne sont pas stockés et valent None dans la réponse ; une chaîne
+    vide reste vide ([] pour les listes), comme lorsque la réponse était calculée à la lecture.
+    """
+    get = interviewer.get if isinstance(interviewer, dict) else lambda field: getattr(interviewer, field, None)
+    display = {}
+
+    expertise = split_string_to_list(get("expertise"))
+    if expertise is not None:
+        display["expertise"] = expertise[:2]
+    suggested_topic = split_string_to_list(get("suggested_topic"))
+    if suggested_topic is not None:
+        display["suggested_topic"] = suggested_topic
+
+    image_profil = get("image_profil")
+    if image_profil is not None:
+        display["image_profil"] = f"{test_settings.PROFILE_IMAGE_BASE_URL}{image_profil}" if image_profil else image_profil
+    activity = get("activity")
+    if activity is not None:
+        display["activity"] = activity.replace(";", ",")
+
+    for link in SOCIAL_LINK_FIELDS:
+        url = get(link)
         if url and url.endswith("|existed"):
-            url = url.split("|")[0].strip()
-            interviewer_dict[link] = url
-        else:
-            interviewer_dict[link] = None
+            display[link] = url.split("|")[0].strip()
+
+    return display
 
+
+def process_interviewer_dict(interviewer_dict):
+    """
+    Prépare un dictionnaire interviewer pour la réponse : les champs d'affichage sont
+    lus tels quels depuis la colonne display (voir interviewer_display).
+    """
+    interviewer_dict.update(interviewer_dict.pop("display", None) or {})
     return interviewer_dict
 
 def process_video_dict(video_dict):
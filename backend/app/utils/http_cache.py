@@ -0,0 +1,121 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.config import test_settings
+from app.crud.category_repos import get_category_tree
+from app.crud.data_version import INTERVIEWERS_SCOPE, PODCASTS_SCOPE, get_data_versions
+from app.session import run_read
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Politique de cache HTTP d'un endpoint de lecture.
+
+    L'ETag dérive de la version des données (`scopes`, ou `version` pour les données
+    qui ont leur propre version) et de l'URL : tant qu'aucune écriture ne touche ces
+    scopes, la même requête a le même ETag.
+    """
+    name: str
+    max_age: int
+    stale_while_revalidate: int = 0
+    scopes: tuple[str, ...] = ()
+    version: Optional[Callable[[Session], str]] = None
+
+    @property
+    def cache_control(self) -> str:
+        directives = ["public", f"max-age={self.max_age}"]
+        if self.stale_while_revalidate:
+            directives.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(directives)
+
+
+def _taxonomy_version(db: Session) -> str:
+    _, version = get_category_tree(db)
+    return version
+
+
+PODCAST_LIST = CachePolicy("podcast-list", max_age=30, stale_while_revalidate=300, scopes=(PODCASTS_SCOPE,))
+PODCAST_SEARCH = CachePolicy("podcast-search", max_age=60, stale_while_revalidate=600, scopes=(PODCASTS_SCOPE,))
+SIMILAR_PODCASTS = CachePolicy("similar-podcasts", max_age=300, stale_while_revalidate=3600, scopes=(PODCASTS_SCOPE,))
+INTERVIEWER_LIST = CachePolicy(
+    "interviewer-list", max_age=30, stale_while_revalidate=300, scopes=(INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
+)
+INTERVIEWER_SEARCH = CachePolicy(
+    "interviewer-search", max_age=60, stale_while_revalidate=600, scopes=(INTERVIEWERS_SCOPE, PODCASTS_SCOPE)
+)
+CATEGORY_TAXONOMY = CachePolicy("category-taxonomy", max_age=60, stale_while_revalidate=3600, version=_taxonomy_version)
+
+
+class DataVersionCache:
+    """
+    Copie locale (par worker) des versions de data_version, relue au plus toutes les
+    `ttl_seconds` : un If-None-Match à jour est validé sans aller en base.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._loaded_at = 0.0
+
+    def get(self, db: Session, scopes: tuple[str, ...]) -> dict[str, int]:
+        with self._lock:
+            fresh = time.monotonic() - self._loaded_at < self.ttl_seconds
+            if fresh and all(scope in self._versions for scope in scopes):
+                return {scope: self._versions[scope] for scope in scopes}
+        versions = get_data_versions(db, (PODCASTS_SCOPE, INTERVIEWERS_SCOPE, *scopes))
+        with self._lock:
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+        return {scope: versions[scope] for scope in scopes}
+
+
+data_versions = DataVersionCache(ttl_seconds=test_settings.DATA_VERSION_TTL_SECONDS)
+
+
+def _resolve_version(db: Session, policy: CachePolicy) -> str:
+    if policy.version is not None:
+        return policy.version(db)
+    versions = data_versions.get(db, policy.scopes)
+    return ".".join(f"{scope}:{versions[scope]}" for scope in policy.scopes)
+
+
+def make_etag(policy: CachePolicy, version: str, request: Request) -> str:
+    # Paramètres triés : ?a=1&b=2 et ?b=2&a=1 partagent le même ETag
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    raw = f"{policy.name}|{version}|{request.url.path}|{query}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or "*" in candidates
+
+
+def conditional(policy: CachePolicy):
+    """
+    Dépendance FastAPI appliquant `policy` à un endpoint : ajoute ETag et Cache-Control
+    à la réponse, et répond 304 avant même d'exécuter l'endpoint (donc sans lancer
+    sa requête) quand If-None-Match contient l'ETag courant.
+
+        @router.get("/filter", dependencies=[Depends(conditional(PODCAST_LIST))])
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        version = await run_read(_resolve_version, policy)
+        etag = make_etag(policy, version, request)
+        headers = {"ETag": etag, "Cache-Control": policy.cache_control}
+        if etag_matches(request, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
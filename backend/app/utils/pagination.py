@@ -0,0 +1,86 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key values of the last row of a page into an opaque cursor.
+
+    :param values: Sort key values, last one being the id tie-breaker.
+    :return: A url-safe base64 string.
+    """
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor made by `encode_cursor`.
+
+    :param cursor: The opaque cursor sent back by the client.
+    :param size: Expected number of values in the cursor.
+    :return: The list of sort key values.
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError("Invalid cursor: unexpected shape")
+    last_id = payload[-1] if payload else None
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor: the last value must be an id")
+
+    try:
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: bad date {e}")
+
+
+def encode_keyset_cursor(order_by: str, ascending: bool, sort_key, last_id: int) -> str:
+    """
+    Cursor for the sorted listings: carries the sort it was made for, so that a
+    cursor is never applied to a different ordering.
+    """
+    return encode_cursor(order_by, bool(ascending), sort_key, last_id)
+
+
+def decode_keyset_cursor(cursor: str, order_by: str, ascending: bool) -> tuple:
+    """
+    :return: (sort_key, last_id) of the last row of the previous page.
+    :raises ValueError: If the cursor is malformed or was made for another ordering.
+    """
+    cursor_order_by, cursor_ascending, sort_key, last_id = decode_cursor(cursor, 4)
+    if cursor_order_by != order_by or cursor_ascending != bool(ascending):
+        raise ValueError("Invalid cursor: it was issued for another ordering")
+    return sort_key, last_id
+
+
+def keyset_order(sort_expr, id_col, ascending: bool) -> list:
+    """ORDER BY clauses matching the (sort key, id) composite indexes."""
+    if ascending:
+        return [sort_expr.asc(), id_col.asc()]
+    return [sort_expr.desc(), id_col.desc()]
+
+
+def keyset_after(sort_expr, id_col, ascending: bool, sort_key, last_id: int):
+    """Row comparison selecting the rows that come after (sort_key, last_id)."""
+    row = tuple_(sort_expr, id_col)
+    if ascending:
+        return row > tuple_(sort_key, last_id)
+    return row < tuple_(sort_key, last_id)
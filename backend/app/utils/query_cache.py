@@ -0,0 +1,295 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from app.config import test_settings
+
+# Tags de collection : invalidés par toute écriture qui change une liste
+PODCASTS_TAG = "podcasts"
+INTERVIEWERS_TAG = "interviewers"
+
+
+def video_tag(video_id) -> str:
+    return f"video:{video_id}"
+
+
+def interviewer_tag(interviewer_id) -> str:
+    return f"interviewer:{interviewer_id}"
+
+
+def user_follows_tag(user_id) -> str:
+    return f"user:{user_id}:follows"
+
+
+class MemoryBackend:
+    """
+    Cache en mémoire du worker : LRU borné à `max_entries`, chaque entrée expire
+    après son TTL. Les valeurs sont stockées picklées, chaque lecture rend donc une
+    copie que l'appelant peut modifier sans toucher au cache.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: bytes, ttl: float, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, payload, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._keys_by_tag.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+
+class SqliteBackend:
+    """
+    Cache partagé par tous les workers uvicorn d'une machine, dans un fichier sqlite
+    (remplaçant local d'un Redis) : une écriture faite par un worker invalide les
+    entrées des autres. Même sémantique que MemoryBackend (TTL, LRU, tags).
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at);
+                CREATE TABLE IF NOT EXISTS tags (
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (tag, key)
+                );
+                CREATE INDEX IF NOT EXISTS ix_tags_key ON tags (key);
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> bytes | None:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute("SELECT payload, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            self._delete_keys(conn, [key])
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, payload: bytes, ttl: float, tags: Iterable[str]) -> None:
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now),
+            )
+            conn.executemany("INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags])
+            overflow = conn.execute("SELECT count(*) FROM entries").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                oldest = conn.execute(
+                    "SELECT key FROM entries ORDER BY accessed_at LIMIT ?", (overflow,)
+                ).fetchall()
+                self._delete_keys(conn, [row[0] for row in oldest])
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        conn = self._connection()
+        placeholders = ",".join("?" * len(tags))
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM tags WHERE tag IN ({placeholders})", tags
+            ).fetchall()]
+            self._delete_keys(conn, keys)
+        return len(keys)
+
+    @staticmethod
+    def _delete_keys(conn: sqlite3.Connection, keys: list[str]) -> None:
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM entries WHERE key IN ({placeholders})", chunk)
+            conn.execute(f"DELETE FROM tags WHERE key IN ({placeholders})", chunk)
+
+    def size(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM tags")
+
+
+class QueryCache:
+    """
+    Cache des résultats de fonctions crud de lecture.
+
+        @query_cache.cached("get_single_podcast", tags=lambda args: [video_tag(args["video_id"])])
+        def get_single_podcast(db: Session, video_id: int): ...
+
+    La clé est le nom plus les arguments (sans la session). Les écritures appellent
+    `invalidate(...)` après leur commit avec les tags qu'elles rendent obsolètes.
+    Les résultats None (erreurs des fonctions crud) ne sont pas mis en cache.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, {"hits": 0, "misses": 0})
+            stats[outcome] += 1
+
+    def cached(self, name: str, tags: Callable[[dict], Iterable[str]] = lambda args: (), ttl: float | None = None):
+        def decorator(fn):
+            if self.backend is None:
+                return fn
+            signature = inspect.signature(fn)
+            session_param = next(iter(signature.parameters))
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                call_args = {key: value for key, value in bound.arguments.items() if key != session_param}
+                raw_key = f"{name}:{sorted(call_args.items())!r}"
+                key = f"{name}:{hashlib.sha1(raw_key.encode('utf-8')).hexdigest()}"
+
+                try:
+                    payload = self.backend.get(key)
+                except Exception as e:
+                    print(f"Erreur dans QueryCache.get ({name}):", e)
+                    payload = None
+                if payload is not None:
+                    self._count(name, "hits")
+                    return pickle.loads(payload)
+
+                self._count(name, "misses")
+                result = fn(*args, **kwargs)
+                if result is not None:
+                    try:
+                        self.backend.set(key, pickle.dumps(result), ttl or self.ttl_seconds, tags(call_args))
+                    except Exception as e:
+                        print(f"Erreur dans QueryCache.set ({name}):", e)
+                return result
+
+            wrapper.uncached = fn
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags: str) -> int:
+        if self.backend is None or not tags:
+            return 0
+        try:
+            return self.backend.invalidate_tags(tags)
+        except Exception as e:
+            # Le cache ne doit jamais faire échouer une écriture déjà commitée
+            print("Erreur dans QueryCache.invalidate:", e)
+            return 0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            functions = {name: dict(stats) for name, stats in self._stats.items()}
+        hits = sum(stats["hits"] for stats in functions.values())
+        misses = sum(stats["misses"] for stats in functions.values())
+        return {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "entries": self.backend.size() if self.backend is not None else 0,
+            "pid": os.getpid(),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else None,
+            "functions": functions,
+        }
+
+
+def _make_backend():
+    backend = test_settings.QUERY_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryBackend(test_settings.QUERY_CACHE_MAX_ENTRIES)
+    if backend == "sqlite":
+        return SqliteBackend(test_settings.QUERY_CACHE_SQLITE_PATH, test_settings.QUERY_CACHE_MAX_ENTRIES)
+    return None
+
+
+query_cache = QueryCache(_make_backend(), ttl_seconds=test_settings.QUERY_CACHE_TTL_SECONDS)
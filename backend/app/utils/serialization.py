@@ -0,0 +1,25 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.models.response_entity import InterviewerResponse, VideoResponse
+
+VIDEO_LIST_ADAPTER = TypeAdapter(list[VideoResponse])
+INTERVIEWER_LIST_ADAPTER = TypeAdapter(list[InterviewerResponse])
+
+# En-têtes propres au corps, recalculés par la réponse finale
+_BODY_HEADERS = {"content-length", "content-type"}
+
+
+def json_list_response(adapter: TypeAdapter, rows: list[dict], response: Response) -> Response:
+    """
+    Réponse JSON d'une liste de dicts déjà traités par process_*_dict : la liste est
+    validée une seule fois puis sérialisée directement en bytes par pydantic-core.
+
+    Une Response renvoyée par l'endpoint court-circuite le response_model (gardé dans
+    le décorateur pour l'OpenAPI) et la seconde validation de FastAPI. Elle ne reprend
+    pas non plus les en-têtes de la réponse injectée : ceux posés par l'endpoint ou
+    ses dépendances (curseur, ETag, Cache-Control) sont recopiés depuis `response`.
+    """
+    body = adapter.dump_json(adapter.validate_python(rows))
+    headers = {key: value for key, value in response.headers.items() if key not in _BODY_HEADERS}
+    return Response(content=body, media_type="application/json", headers=headers)
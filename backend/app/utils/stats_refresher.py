@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from fastapi.concurrency import run_in_threadpool
+from googleapiclient.errors import HttpError
+from sqlalchemy.orm import Session
+
+from app.config import test_settings
+from app.crud.videos_repos import claim_stale_podcasts, update_videos_stats
+from app.session import get_session_direct
+from app.utils.youtube_api import http_error_message, youtube_client
+
+
+class StatsRefreshQueue:
+    """
+    File de rafraîchissement des stats YouTube (stale-while-revalidate) : les endpoints
+    répondent avec les stats en base et se contentent d'ajouter les podcasts périmés
+    à la file, qui est vidée par une tâche de fond hors du chemin de la requête.
+    Une vidéo déjà en file n'y est ajoutée qu'une fois.
+    """
+
+    def __init__(self, interval_minutes: int, batch_size: int, lease_seconds: int):
+        self.interval = timedelta(minutes=interval_minutes)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: dict[int, None] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def is_stale(self, visited_at: datetime | None) -> bool:
+        return visited_at is None or datetime.utcnow() - visited_at >= self.interval
+
+    def enqueue(self, video_ids: Iterable[int]) -> None:
+        with self._lock:
+            for video_id in video_ids:
+                self._pending[video_id] = None
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_batch(self) -> List[int]:
+        with self._lock:
+            batch = list(self._pending)[: self.batch_size]
+            for video_id in batch:
+                del self._pending[video_id]
+        return batch
+
+    def refresh(self, db: Session, video_ids: List[int]) -> int:
+        """
+        Rafraîchit les stats des podcasts donnés qui sont toujours périmés en base,
+        avec un seul appel videos.list par lot de 50 et un seul UPDATE pour tout le lot.
+
+        :return: Nombre de podcasts mis à jour.
+        """
+        claimed = claim_stale_podcasts(db, video_ids, datetime.utcnow() - self.interval, self.lease)
+        if not claimed:
+            return 0
+        try:
+            stats_by_youtube_id = youtube_client.videos_stats(youtube_id for _, youtube_id in claimed)
+        except HttpError as e:
+            print("Erreur dans StatsRefreshQueue.refresh:", http_error_message(e))
+            return 0
+        visited_at = datetime.utcnow()
+        stats = []
+        for video_id, youtube_video_id in claimed:
+            video_stats = stats_by_youtube_id.get(youtube_video_id)
+            if not video_stats:
+                print(f"Erreur dans StatsRefreshQueue.refresh ({video_id}): Video info not exist or access denied")
+                continue
+            stats.append({
+                "id": video_id,
+                "view_count": int(video_stats["view_count"]),
+                "like_count": int(video_stats["like_count"]),
+                "visited_at": visited_at,
+            })
+        return update_videos_stats(db, stats)
+
+    def refresh_now(self, video_ids: List[int]) -> int:
+        db = get_session_direct()
+        try:
+            return self.refresh(db, video_ids)
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        """
+        Tâche de fond à lancer au démarrage : traite la file par lots de `batch_size`.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while batch := self._take_batch():
+                try:
+                    await run_in_threadpool(self.refresh_now, batch)
+                except Exception as e:
+                    print("Erreur dans StatsRefreshQueue.run:", e)
+
+
+stats_refresher = StatsRefreshQueue(
+    interval_minutes=test_settings.STATS_REFRESH_INTERVAL_MINUTES,
+    batch_size=test_settings.STATS_REFRESH_BATCH_SIZE,
+    lease_seconds=test_settings.STATS_REFRESH_LEASE_SECONDS,
+)
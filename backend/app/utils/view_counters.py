@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.config import test_settings
+from app.crud.partial_update import update_many
+from app.session import get_session_direct
+from app.utils.query_cache import interviewer_tag, query_cache, video_tag
+from database.model import Interviewer, Video
+
+COUNTED_MODELS = {
+    "video": Video,
+    "interviewer": Interviewer,
+}
+
+CACHE_TAGS = {
+    "video": video_tag,
+    "interviewer": interviewer_tag,
+}
+
+SHARD_COUNT = 16
+
+
+class ViewCounterBuffer:
+    """
+    Write-behind des incréments de print_count. Chaque worker uvicorn a son propre
+    buffer, découpé en shards (un verrou chacun) pour que les threads du threadpool
+    ne se bloquent pas entre eux. Les incréments sont écrits par `flush` en un seul
+    UPDATE ... SET print_count = print_count + n par table.
+    """
+
+    def __init__(self, flush_seconds: float, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._shards = [(threading.Lock(), {}) for _ in range(SHARD_COUNT)]
+        self._flush_lock = threading.Lock()
+        self._flush_requested: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _shard(self, key: int):
+        return self._shards[key % SHARD_COUNT]
+
+    def increment(self, kind: str, entity_id: int, count: int = 1) -> int:
+        """
+        Ajoute `count` vues à l'entité et retourne le nombre de vues encore en attente pour elle.
+        """
+        lock, pending = self._shard(entity_id)
+        with lock:
+            key = (kind, entity_id)
+            pending[key] = pending.get(key, 0) + count
+            total = pending[key]
+            size = len(pending)
+        if size * SHARD_COUNT >= self.max_pending:
+            self._request_flush()
+        return total
+
+    def pending(self, kind: str, entity_id: int) -> int:
+        lock, pending = self._shard(entity_id)
+        with lock:
+            return pending.get((kind, entity_id), 0)
+
+    def _drain(self) -> dict[str, dict[int, int]]:
+        drained: dict[str, dict[int, int]] = {}
+        for lock, pending in self._shards:
+            with lock:
+                items = list(pending.items())
+                pending.clear()
+            for (kind, entity_id), count in items:
+                by_id = drained.setdefault(kind, {})
+                by_id[entity_id] = by_id.get(entity_id, 0) + count
+        return drained
+
+    def _restore(self, drained: dict[str, dict[int, int]]) -> None:
+        for kind, by_id in drained.items():
+            for entity_id, count in by_id.items():
+                self.increment(kind, entity_id, count)
+
+    def flush(self, db: Session) -> int:
+        """
+        Écrit tous les incréments en attente, un UPDATE atomique par table.
+        En cas d'erreur les incréments sont remis dans le buffer.
+
+        :return: Nombre d'entités mises à jour.
+        """
+        with self._flush_lock:
+            drained = self._drain()
+            if not drained:
+                return 0
+            try:
+                for kind, by_id in drained.items():
+                    # update_many écrit par ids croissants : deux workers qui flushent en même temps ne peuvent pas s'interbloquer
+                    update_many(
+                        db,
+                        COUNTED_MODELS[kind],
+                        [{"id": entity_id, "print_count": n} for entity_id, n in by_id.items()],
+                        increment=["print_count"],
+                    )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._restore(drained)
+                print("Erreur dans ViewCounterBuffer.flush:", e)
+                return 0
+            # Les pages en cache affichent print_count + vues en attente : le compteur
+            # écrit en base remplace désormais les vues qui viennent d'être vidées
+            query_cache.invalidate(*[
+                CACHE_TAGS[kind](entity_id) for kind, by_id in drained.items() for entity_id in by_id
+            ])
+            return sum(len(by_id) for by_id in drained.values())
+
+    def flush_now(self) -> int:
+        db = get_session_direct()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    def _request_flush(self) -> None:
+        if self._loop is not None and self._flush_requested is not None:
+            self._loop.call_soon_threadsafe(self._flush_requested.set)
+
+    async def run(self) -> None:
+        """
+        Boucle de flush périodique, à lancer au démarrage de l'application.
+        Flush au plus tard toutes les `flush_seconds`, plus tôt si le buffer dépasse `max_pending`.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._flush_requested = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await run_in_threadpool(self.flush_now)
+            except Exception as e:
+                print("Erreur dans ViewCounterBuffer.run:", e)
+
+
+view_counters = ViewCounterBuffer(
+    flush_seconds=test_settings.VIEW_COUNTER_FLUSH_SECONDS,
+    max_pending=test_settings.VIEW_COUNTER_MAX_PENDING,
+)
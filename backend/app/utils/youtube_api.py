@@ -1,47 +1,148 @@
 import json
-from googleapiclient.discovery import build
+import threading
+from typing import Dict, Iterable, List
+
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 
 from dotenv import load_dotenv
 import os
 
+from app.utils.entities import duration_to_seconds
+
 load_dotenv()
 api_youtube_key = os.getenv('YOUTUBE_API_KEY')
 
-def get_channel_id(channel_name):
-    youtube = build('youtube', 'v3', developerKey=api_youtube_key )
-    try:
-        request = youtube.search().list(
+# Nombre maximal d'ids acceptés par videos.list / channels.list
+YOUTUBE_MAX_IDS = 50
+YOUTUBE_HTTP_TIMEOUT = 10
+
+
+class YouTubeClient:
+    """
+    Client YouTube Data API partagé par toute l'application.
+
+    Le document de découverte est chargé et parsé une seule fois. httplib2.Http
+    n'étant pas thread-safe, chaque thread garde son propre service (et donc sa
+    connexion keep-alive), créé au premier appel puis réutilisé.
+    """
+
+    def __init__(self, api_key: str, api_endpoint: str | None = None, timeout: int = YOUTUBE_HTTP_TIMEOUT):
+        self.api_key = api_key
+        self.api_endpoint = api_endpoint
+        self.timeout = timeout
+        self._document = None
+        self._document_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _discovery_document(self) -> dict:
+        with self._document_lock:
+            if self._document is None:
+                self._document = json.loads(get_static_doc("youtube", "v3"))
+            return self._document
+
+    @property
+    def service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            client_options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+            service = build_from_document(
+                self._discovery_document(),
+                http=httplib2.Http(timeout=self.timeout),
+                developerKey=self.api_key,
+                client_options=client_options,
+            )
+            self._local.service = service
+        return service
+
+    @staticmethod
+    def _chunks(ids: Iterable[str]) -> Iterable[List[str]]:
+        ids = list(dict.fromkeys(i for i in ids if i))
+        for start in range(0, len(ids), YOUTUBE_MAX_IDS):
+            yield ids[start:start + YOUTUBE_MAX_IDS]
+
+    def search_channel_id(self, channel_name: str) -> str | None:
+        response = self.service.search().list(
             part='snippet',
             q=channel_name,
             type='channel'
-        )
-        response = request.execute()
+        ).execute()
+        items = response.get('items') or []
+        return items[0]['id']['channelId'] if items else None
 
-        if 'items' in response and response['items']:
-            channel = response['items'][0]
-            channel_id = channel['id']['channelId']
-            return channel_id
+    def videos_stats(self, video_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Stats de plusieurs vidéos, par lots de 50 ids par appel videos.list.
+
+        :param video_ids: IDs YouTube des vidéos.
+        :return: {youtube_video_id: stats}. Les vidéos inexistantes ou privées sont absentes.
+        :raises HttpError: Si l'API renvoie une erreur.
+        """
+        stats = {}
+        for chunk in self._chunks(video_ids):
+            response = self.service.videos().list(
+                part="statistics,contentDetails",
+                id=",".join(chunk),
+                maxResults=YOUTUBE_MAX_IDS,
+            ).execute()
+            for video_info in response.get('items', []):
+                duration = convert_iso_duration(video_info['contentDetails']['duration'])
+                stats[video_info['id']] = {
+                    "id": video_info['id'],
+                    "view_count": video_info['statistics'].get('viewCount', 0),
+                    "like_count": video_info['statistics'].get('likeCount', 0),
+                    "duration": duration,
+                    "duration_seconds": duration_to_seconds(duration),
+                }
+        return stats
+
+    def channels_stats(self, channel_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Stats de plusieurs chaînes, par lots de 50 ids par appel channels.list.
+
+        :param channel_ids: IDs YouTube des chaînes.
+        :return: {channel_id: stats}. Les chaînes inexistantes sont absentes.
+        :raises HttpError: Si l'API renvoie une erreur.
+        """
+        stats = {}
+        for chunk in self._chunks(channel_ids):
+            response = self.service.channels().list(
+                part='statistics',
+                id=",".join(chunk),
+                maxResults=YOUTUBE_MAX_IDS,
+            ).execute()
+            for channel in response.get('items', []):
+                statistics = channel['statistics']
+                stats[channel['id']] = {
+                    'subs_count': int(statistics.get('subscriberCount', 0)),
+                    'view_count': int(statistics.get('viewCount', 0)),
+                    'video_count': int(statistics.get('videoCount', 0)),
+                }
+        return stats
+
+
+youtube_client = YouTubeClient(api_youtube_key)
+
+
+def http_error_message(e: HttpError) -> str:
+    try:
+        return json.loads(e.content.decode('utf-8'))['error']['message']
+    except Exception:
+        return str(e)
+
+
+def get_channel_id(channel_name):
+    try:
+        return youtube_client.search_channel_id(channel_name)
     except HttpError as e:
         print(f"Error: {e}")
     return None
 
 def update_stat_channel(channel_id):
-    youtube = build('youtube', 'v3', developerKey=api_youtube_key)
     try:
-        request = youtube.channels().list(
-            part='statistics', 
-            id=channel_id
-        )
-        response = request.execute()
-        if 'items' in response:
-            channel = response['items'][0]
-            stats = {
-                'subs_count': int(channel['statistics']['subscriberCount']),  
-                'view_count': int(channel['statistics']['viewCount']),  
-                'video_count': int(channel['statistics']['videoCount']) 
-            }            
-            return stats
+        return youtube_client.channels_stats([channel_id]).get(channel_id)
     except HttpError as e:
         print(f"Error: {e}")
     return None
@@ -49,33 +150,13 @@ def update_stat_channel(channel_id):
 
 def update_stat_video(video_id):
     try:
-        API_SERVICE_NAME = "youtube"
-        API_VERSION = "v3"
-        youtube = build(API_SERVICE_NAME, API_VERSION, developerKey=api_youtube_key)
-        request = youtube.videos().list(
-            part="statistics,contentDetails", 
-            id=video_id
-        )
-        response = request.execute()
-        if not response.get('items'):
+        video_stats = youtube_client.videos_stats([video_id]).get(video_id)
+        if not video_stats:
             return None, "Video info not exist or access denied"
-        video_info = response['items'][0]
-        view_count = video_info['statistics']['viewCount']
-        like_count = video_info['statistics'].get('likeCount', 0)  
-        duration = convert_iso_duration(video_info['contentDetails']['duration'])
-        video_stats = {
-            "id": video_id,
-            "view_count": view_count,
-            "like_count": like_count,
-            "duration": duration
-        }
         print("update stat:::", video_stats)
-        return video_stats, None  
+        return video_stats, None
     except HttpError as e:
-        error_json = e.content.decode('utf-8')
-        error = json.loads(error_json)['error']
-        error_message = error['message']
-        return None, error_message  
+        return None, http_error_message(e)
     except Exception as e:
         return None, f"Unexpected Error: {str(e)}"
     
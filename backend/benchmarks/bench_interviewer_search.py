@@ -0,0 +1,72 @@
+"""
+Latency of /interviewers/search on a large interviewer table (trigram indexes).
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_interviewer_search --interviewers 500000
+"""
+import argparse
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.interviewers_repos import get_interviewers_by_keywords
+from benchmarks.common import get_bench_engine, print_report, time_calls
+
+FIRST_NAMES = ["elon", "lex", "andrew", "jordan", "naval", "sam", "tim", "joe", "steven", "mel",
+               "yuval", "sadhguru", "marc", "peter", "jay", "simon", "brene", "daniel", "lisa", "oprah"]
+LAST_NAMES = ["musk", "fridman", "huberman", "peterson", "ravikant", "altman", "ferriss", "rogan",
+              "bartlett", "robbins", "harari", "andreessen", "thiel", "shetty", "sinek", "brown"]
+EXPERTISES = ["Entrepreneur", "CEO", "Podcaster", "Journalist", "Scientist", "AI researcher",
+              "Neuroscientist", "Physicist", "Software engineer", "Philosopher", "Athlete", "Comedian"]
+
+SEARCHES = ["elon", "elon musk", "elno muks", "huberm", "neuroscientist", "jordan peterson"]
+
+
+def _array(values):
+    return "ARRAY[" + ",".join(f"'{v}'" for v in values) + "]"
+
+
+def seed_interviewers(session: Session, target: int):
+    current = session.execute(text("SELECT count(*) FROM interviewer")).scalar()
+    if current >= target:
+        return
+
+    def pick(values):
+        return f"({_array(values)})[1 + floor(random() * {len(values)})::int]"
+
+    session.execute(text(f"""
+        INSERT INTO interviewer (name, expertise, linkedin)
+        SELECT initcap({pick(FIRST_NAMES)}) || ' ' || initcap({pick(LAST_NAMES)}) || ' ' || g,
+               {pick(EXPERTISES)} || '|' || {pick(EXPERTISES)},
+               CASE WHEN random() < 0.7 THEN 'https://linkedin.com/in/bench' || g || '|existed' END
+        FROM generate_series(:start, :stop) AS g
+    """), {"start": current + 1, "stop": target})
+    session.execute(text("""
+        INSERT INTO interviewer_stats (interviewer_id, video_count, total_views, total_likes, updated_at)
+        SELECT id, 1 + (random() * 20)::int, (random() * 1e8)::bigint, (random() * 1e6)::bigint, now()
+        FROM interviewer
+        ON CONFLICT (interviewer_id) DO NOTHING
+    """))
+    session.commit()
+    session.execute(text("ANALYZE interviewer"))
+    session.execute(text("ANALYZE interviewer_stats"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interviewers", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    with Session(engine) as session:
+        seed_interviewers(session, args.interviewers)
+        rows = [
+            (f"'{search}'", time_calls(lambda: get_interviewers_by_keywords(session, search, limit=10), args.repeat))
+            for search in SEARCHES
+        ]
+
+    print_report(f"/interviewers/search on {args.interviewers:,} interviewers", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Latency of /podcasts/search at scale: legacy ILIKE scan vs full-text index.
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_podcast_search --videos 1000000
+"""
+import argparse
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from app.crud.videos_repos import get_podcast_by_keywords
+from benchmarks.common import get_bench_engine, print_report, time_calls
+from database.model import Video
+
+VOCABULARY = [
+    "startup", "investing", "neuroscience", "machine", "learning", "history",
+    "health", "nutrition", "football", "music", "politics", "physics", "crypto",
+    "leadership", "philosophy", "comedy", "fitness", "marketing", "climate", "space",
+    "psychology", "education", "parenting", "travel", "cinema", "chess", "biology",
+    "economics", "design", "writing",
+]
+
+SEARCHES = ["machine learning", "neuro", "startup investing", "climate space", "chess"]
+
+
+def seed_videos(session: Session, target: int):
+    current = session.execute(text("SELECT count(*) FROM video")).scalar()
+    if current >= target:
+        return
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in VOCABULARY) + "]"
+    pick = f"({words})[1 + floor(random() * {len(VOCABULARY)})::int]"
+    session.execute(text(f"""
+        INSERT INTO video (url, youtube_video_id, title, topic, category, main_category,
+                           key_words, rich_description, language, is_podcast, published_at,
+                           view_count, like_count)
+        SELECT 'https://youtu.be/bench' || g,
+               'bench' || g,
+               initcap({pick}) || ' and ' || {pick},
+               {pick} || ' ' || {pick},
+               {pick},
+               {pick},
+               {pick} || '|' || {pick} || '|' || {pick},
+               repeat({pick} || ' ' || {pick} || ' ', 20),
+               'en',
+               random() < 0.9,
+               now() - (random() * interval '3650 days'),
+               (random() * 1e7)::bigint,
+               (random() * 1e5)::bigint
+        FROM generate_series(:start, :stop) AS g
+    """), {"start": current + 1, "stop": target})
+    session.commit()
+    session.execute(text("ANALYZE video"))
+
+
+def legacy_search(session: Session, search: str, limit: int = 10):
+    conditions = []
+    for keyword in search.split():
+        conditions.append(Video.category.ilike(f"%{keyword}%"))
+        conditions.append(Video.main_category.ilike(f"%{keyword}%"))
+        conditions.append(Video.topic.ilike(f"%{keyword}%"))
+    stmt = (
+        select(Video.id, Video.title)
+        .where(Video.is_podcast.is_(True), or_(*conditions))
+        .order_by(Video.published_at.desc().nulls_last())
+        .limit(limit)
+    )
+    return session.execute(stmt).all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    with Session(engine) as session:
+        seed_videos(session, args.videos)
+
+        rows = []
+        for search in SEARCHES:
+            rows.append((f"ilike  '{search}'", time_calls(lambda: legacy_search(session, search), args.repeat)))
+            rows.append((f"fts    '{search}'", time_calls(lambda: get_podcast_by_keywords(session, search, limit=10), args.repeat)))
+
+        # Deep page: offset vs cursor on the same ranking
+        first_page = get_podcast_by_keywords(session, "machine", limit=10, offset=5000)
+        if first_page:
+            last = first_page[-1]
+            rows.append(("fts offset=5000", time_calls(
+                lambda: get_podcast_by_keywords(session, "machine", limit=10, offset=5000), args.repeat)))
+            rows.append(("fts cursor @5000", time_calls(
+                lambda: get_podcast_by_keywords(session, "machine", limit=10, cursor=[last["rank"], last["id"]]), args.repeat)))
+
+    print_report(f"/podcasts/search on {args.videos:,} videos", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Per-item serialization cost of the list endpoints, without database or HTTP.
+
+    python -m benchmarks.bench_serialization [--items 100] [--repeat 300]
+
+Two paths are timed on the same synthetic pages of podcasts and of
+interviewers (each with 3 nested podcasts):
+
+- response_model: what the list controllers used to do. Each dict goes through
+  process_*_dict and model_validate, then FastAPI validates and serializes the
+  list again through the endpoint's response_model and renders a JSONResponse.
+- fast path: process_*_dict, then json_list_response (one TypeAdapter
+  validation, JSON bytes from pydantic-core).
+
+Both include copying the page, because process_*_dict mutates the rows. The
+"copy only" line gives that share.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.response_entity import InterviewerResponse, VideoResponse
+from app.utils.entities import interviewer_display, process_interviewer_dict, process_video_dict
+from app.utils.serialization import INTERVIEWER_LIST_ADAPTER, VIDEO_LIST_ADAPTER, json_list_response
+from benchmarks.common import print_report, time_calls
+
+
+def video_row(i: int) -> dict:
+    published_at = datetime(2024, 1, 1) + timedelta(days=i)
+    return {
+        "id": i,
+        "url": f"https://www.youtube.com/watch?v={i:011d}",
+        "youtube_video_id": f"{i:011d}",
+        "title": f"Podcast épisode {i} : l'avenir de l'IA",
+        "topic": "Artificial intelligence",
+        "category": "AI",
+        "main_category": "Technology",
+        "language": "fr",
+        "duration": "01:12:45",
+        "rich_description": "Une conversation sur les modèles de langage. " * 8,
+        "view_count": 1000 + i,
+        "like_count": 10 + i,
+        "print_count": i,
+        "logo_url": f"https://i.ytimg.com/vi/{i:011d}/hqdefault.jpg",
+        "published_at": published_at,
+        "sort_key": published_at,
+    }
+
+
+def interviewer_row(i: int) -> dict:
+    display = interviewer_display({
+        "expertise": "Machine learning|Robotics|Ethics",
+        "suggested_topic": "AI safety|Startups",
+        "image_profil": f"{i}.jpg",
+        "activity": "Researcher;Author",
+        "linkedin": f"https://linkedin.com/in/{i}|existed",
+        "twitter": f"https://x.com/{i}|missing",
+        "website": f"https://example.com/{i}|existed",
+    })
+    return {
+        "id": i,
+        "name": f"Interviewer {i}",
+        "biography": "Chercheuse et autrice. " * 6,
+        "display": display,
+        "follower": None,
+        "sort_key": 1000 + i,
+        "videos": [video_row(i * 3 + j) for j in range(3)],
+    }
+
+
+def copy_videos(page: list[dict]) -> list[dict]:
+    return [dict(row) for row in page]
+
+
+def copy_interviewers(page: list[dict]) -> list[dict]:
+    return [dict(row, videos=copy_videos(row["videos"])) for row in page]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    videos = [video_row(i) for i in range(args.items)]
+    interviewers = [interviewer_row(i) for i in range(args.items)]
+    video_field = create_model_field("Response_videos", list[VideoResponse], mode="serialization")
+    interviewer_field = create_model_field("Response_interviewers", list[InterviewerResponse], mode="serialization")
+
+    def through_response_model(field, content) -> bytes:
+        serialized = loop.run_until_complete(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return JSONResponse(serialized).body
+
+    def videos_response_model():
+        page = [VideoResponse.model_validate(process_video_dict(p)) for p in copy_videos(videos)]
+        return through_response_model(video_field, page)
+
+    def videos_fast_path():
+        page = [process_video_dict(p) for p in copy_videos(videos)]
+        return json_list_response(VIDEO_LIST_ADAPTER, page, Response()).body
+
+    def interviewers_response_model():
+        page = []
+        for interviewer in copy_interviewers(interviewers):
+            processed = InterviewerResponse.model_validate(process_interviewer_dict(interviewer))
+            processed.videos = [VideoResponse.model_validate(process_video_dict(v)) for v in interviewer["videos"]]
+            page.append(processed)
+        return through_response_model(interviewer_field, page)
+
+    def interviewers_fast_path():
+        page = copy_interviewers(interviewers)
+        for interviewer in page:
+            process_interviewer_dict(interviewer)
+            interviewer["videos"] = [process_video_dict(v) for v in interviewer["videos"]]
+        return json_list_response(INTERVIEWER_LIST_ADAPTER, page, Response()).body
+
+    assert videos_response_model() == videos_fast_path()
+    assert interviewers_response_model() == interviewers_fast_path()
+
+    cases = [
+        ("videos: copy only", lambda: copy_videos(videos)),
+        ("videos: response_model", videos_response_model),
+        ("videos: fast path", videos_fast_path),
+        ("interviewers: copy only", lambda: copy_interviewers(interviewers)),
+        ("interviewers: response_model", interviewers_response_model),
+        ("interviewers: fast path", interviewers_fast_path),
+    ]
+    results = [(name, time_calls(fn, repeat=args.repeat)) for name, fn in cases]
+    print_report(f"Serialization of {args.items}-item pages", results)
+
+    print(f"\n{'case':<40} {'us/item (p50)':>14}")
+    for name, stats in results:
+        print(f"{name:<40} {stats['p50'] * 1000 / args.items:>14.1f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Throughput of the YouTube stats utilities against a local stub of the Data API.
+
+    python -m benchmarks.bench_youtube_client [--ids 500] [--latency-ms 20]
+
+No API key or network access is needed: a threaded HTTP server answers
+videos.list with synthetic items after `--latency-ms`, standing in for the
+round trip to googleapis.com. Three strategies fetch the same ids:
+
+- legacy: what `update_stat_video` used to do, build() + one id per call
+- shared client, one id per call
+- shared client, batched (50 ids per videos.list)
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+from googleapiclient.discovery import build
+
+from app.utils.youtube_api import YouTubeClient
+
+
+class StubYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: without this, keep-alive requests
+    # stall on Nagle + delayed ACK and the stub measures TCP, not the client.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        time.sleep(self.latency)
+        query = parse_qs(urlparse(self.path).query)
+        ids = query.get("id", [""])[0].split(",")
+        body = json.dumps({
+            "items": [
+                {
+                    "id": video_id,
+                    "statistics": {"viewCount": "1000", "likeCount": "10"},
+                    "contentDetails": {"duration": "PT1H2M3S"},
+                }
+                for video_id in ids if video_id
+            ]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(latency_ms: float) -> ThreadingHTTPServer:
+    StubYouTubeHandler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubYouTubeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(name: str, fn, ids: list[str]):
+    StubYouTubeHandler.calls = 0
+    start = time.perf_counter()
+    fetched = fn(ids)
+    elapsed = time.perf_counter() - start
+    assert fetched == len(ids), f"{name}: fetched {fetched} of {len(ids)} ids"
+    print(f"{name:<32} {elapsed:>8.2f} s {len(ids) / elapsed:>10.1f} ids/s {StubYouTubeHandler.calls:>8} calls")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    server = start_stub(args.latency_ms)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/youtube/v3/"
+    ids = [f"vid{i:08d}" for i in range(args.ids)]
+
+    def legacy(ids):
+        fetched = 0
+        for video_id in ids:
+            youtube = build(
+                "youtube", "v3", developerKey="bench",
+                http=httplib2.Http(), client_options={"api_endpoint": endpoint},
+            )
+            fetched += len(youtube.videos().list(part="statistics,contentDetails", id=video_id).execute()["items"])
+        return fetched
+
+    client = YouTubeClient("bench", api_endpoint=endpoint)
+
+    def shared_single(ids):
+        return sum(len(client.videos_stats([video_id])) for video_id in ids)
+
+    def shared_batched(ids):
+        return len(client.videos_stats(ids))
+
+    print(f"{'strategy':<32} {'time':>10} {'throughput':>15} {'calls':>8}")
+    run("legacy build() per id", legacy, ids)
+    run("shared client, 1 id per call", shared_single, ids)
+    run("shared client, 50 ids per call", shared_batched, ids)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
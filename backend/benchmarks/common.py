@@ -0,0 +1,52 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks never touch the application database: they run against the database
+given by BENCH_DATABASE_URL, which they are free to fill with synthetic rows.
+Run them from the backend directory, e.g. `python -m benchmarks.bench_podcast_search`.
+"""
+import os
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+from database.model import Base
+
+
+def get_bench_engine():
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        raise SystemExit("BENCH_DATABASE_URL is not set")
+    engine = create_engine(url, pool_pre_ping=True)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def time_calls(fn, repeat: int = 50, warmup: int = 5) -> dict:
+    """
+    Call `fn` repeatedly and return latency percentiles in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "p99": samples[int(len(samples) * 0.99) - 1],
+        "max": samples[-1],
+    }
+
+
+def print_report(title: str, rows: list[tuple[str, dict]]):
+    print(f"\n{title}")
+    print(f"{'case':<40} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name, stats in rows:
+        print(f"{name:<40} {stats['p50']:>10.2f} {stats['p95']:>10.2f} {stats['p99']:>10.2f} {stats['max']:>10.2f}")
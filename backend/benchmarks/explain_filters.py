@@ -0,0 +1,103 @@
+"""
+Check that every case-insensitive filter query is served by an index.
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.explain_filters
+
+Each crud function is run against a recording session that captures its SELECT,
+which is then EXPLAINed. A plan passes when neither `video` nor `podcast_feed`
+is read by a sequential scan; the indexes it uses are printed (the filter index,
+or the keyset sort index when the planner prefers walking the sort order).
+Exits with status 1 when a plan scans one of these tables.
+"""
+import json
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.crud.podcast_feed import rebuild_podcast_feed
+from app.crud.videos_repos import get_podcasts_with_filter
+from benchmarks.bench_podcast_search import seed_videos
+from benchmarks.common import get_bench_engine
+
+
+class _Captured(Exception):
+    pass
+
+
+class RecordingSession:
+    """Stands in for a Session and keeps the first statement instead of running it."""
+
+    def __init__(self):
+        self.statement = None
+
+    def execute(self, statement, *args, **kwargs):
+        self.statement = statement
+        raise _Captured()
+
+
+def capture(fn, **kwargs):
+    recorder = RecordingSession()
+    try:
+        fn(recorder, **kwargs)
+    except _Captured:
+        pass
+    return recorder.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+
+
+def seed_feed(session: Session):
+    """Give every synthetic podcast a guest so that it is listed in podcast_feed."""
+    guest_id = session.execute(text(
+        "INSERT INTO interviewer (name) VALUES ('bench guest') RETURNING id"
+    )).scalar()
+    session.execute(text("""
+        INSERT INTO interviewervideolink (video_id, interviewer_id)
+        SELECT id, :guest_id FROM video
+        ON CONFLICT DO NOTHING
+    """), {"guest_id": guest_id})
+    rebuild_podcast_feed(session)
+    session.execute(text("ANALYZE podcast_feed"))
+
+
+SCANNED_TABLES = {"video", "podcast_feed"}
+
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+CASES = [
+    ("filter by main category", get_podcasts_with_filter, {"by_main_category": "Physics"}),
+    ("filter by sub category", get_podcasts_with_filter, {"by_sub_category": "Physics"}),
+    ("filter by language", get_podcasts_with_filter, {"by_language": "EN"}),
+]
+
+
+def main():
+    engine = get_bench_engine()
+    failures = 0
+    with Session(engine) as session:
+        seed_videos(session, 100_000)
+        seed_feed(session)
+        for name, fn, kwargs in CASES:
+            sql = capture(fn, **kwargs)
+            plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = list(walk(plan[0]["Plan"]))
+            indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+            ok = not any(
+                node["Node Type"] == "Seq Scan" and node.get("Relation Name") in SCANNED_TABLES for node in nodes
+            )
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name:<28} indexes: {', '.join(indexes) or 'none'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Load test of the read endpoints on the sync stack (threadpool + psycopg2) and
+on the async stack (DB_ASYNC=1, asyncpg).
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.load_test_async \
+        [--concurrency 200] [--requests 5000] [--workers 1]
+
+The HTTP client comes with the optional dev group: poetry install --with dev
+
+Both stacks are started as uvicorn servers on the benchmark database with the
+same pool settings. Each server then receives the same mix of /podcasts and
+/interviewers GETs from `--concurrency` concurrent clients. Throughput, latency
+percentiles and error counts are printed for each stack.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.interviewer_stats import rebuild_interviewer_stats
+from benchmarks.bench_podcast_search import VOCABULARY, seed_videos
+from benchmarks.common import get_bench_engine
+from benchmarks.explain_filters import seed_feed
+
+STACKS = [("sync", "0", 8101), ("async", "1", 8102)]
+
+
+def request_paths(count: int, video_ids: list[int], interviewer_ids: list[int]) -> list[str]:
+    templates = [
+        lambda: f"/podcasts/filter?by_main_category={random.choice(VOCABULARY)}&limit=20",
+        lambda: "/podcasts/filter?order_by=view_count&limit=20",
+        lambda: f"/podcasts/search?query={random.choice(VOCABULARY)}&limit=10",
+        lambda: f"/podcasts/{random.choice(video_ids)}",
+        lambda: f"/podcasts/hosts/{random.choice(video_ids)}",
+        lambda: "/interviewers/filter?order_by=view_count&limit=10",
+        lambda: f"/interviewers/{random.choice(interviewer_ids)}",
+    ]
+    return [random.choice(templates)() for _ in range(count)]
+
+
+def start_server(async_flag: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        vps_container_DATABASE_URL=os.environ["BENCH_DATABASE_URL"],
+        DB_ASYNC=async_flag,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    server.terminate()
+    raise SystemExit(f"server on port {port} did not start")
+
+
+async def run_load(port: int, paths: list[str], concurrency: int) -> dict:
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(paths) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = get_bench_engine()
+    with Session(engine) as session:
+        seed_videos(session, 100_000)
+        seed_feed(session)
+        rebuild_interviewer_stats(session)
+        video_ids = session.execute(text("SELECT video_id FROM podcast_feed LIMIT 1000")).scalars().all()
+        interviewer_ids = session.execute(text("SELECT id FROM interviewer LIMIT 1000")).scalars().all()
+
+    # app.main mounts app/static, which only exists in deployed images
+    os.makedirs("app/static", exist_ok=True)
+    paths = request_paths(args.requests, video_ids, interviewer_ids)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.workers} worker(s)")
+    print(f"{'stack':<8} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for name, async_flag, port in STACKS:
+        server = start_server(async_flag, port, args.workers)
+        try:
+            asyncio.run(run_load(port, paths[:200], min(args.concurrency, 20)))  # warm-up
+            stats = asyncio.run(run_load(port, paths, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"{name:<8} {stats['rps']:>10.1f} {stats['p50']:>10.1f} {stats['p95']:>10.1f} "
+            f"{stats['p99']:>10.1f} {stats['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
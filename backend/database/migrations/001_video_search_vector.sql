@@ -0,0 +1,19 @@
+-- Full-text search on podcasts (/podcasts/search).
+-- The vector is a stored generated column, so Postgres keeps it in sync on every
+-- INSERT/UPDATE of the source columns, whatever the writer (API, crawler, psql).
+-- The catalogue mixes French and English titles, so the 'simple' config is used:
+-- lower-cased words without language-specific stemming or stop-words. Queries must
+-- use the same config (SEARCH_TEXT_CONFIG in database/model.py).
+
+ALTER TABLE video
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(topic, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(main_category, '') || ' ' || coalesce(category, '') || ' ' || coalesce(key_words, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(rich_description, '')), 'C')
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_search_vector
+    ON video USING gin (search_vector);
+
+ANALYZE video;
@@ -0,0 +1,12 @@
+-- Trigram indexes for /interviewers/search (prefix, substring and fuzzy matches).
+-- pg_trgm lowercases trigrams itself, so the indexes also serve ILIKE.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_name_trgm
+    ON interviewer USING gin (name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_expertise_trgm
+    ON interviewer USING gin (expertise gin_trgm_ops);
+
+ANALYZE interviewer;
@@ -0,0 +1,24 @@
+-- Composite (sort key, id) indexes for the cursor pagination of
+-- /podcasts/filter, /interviewers/filter and /interviewers/hosted_podcast.
+-- The expressions must stay identical to VIDEO_SORT_KEYS / INTERVIEWER_SORT_KEYS
+-- in database/model.py, otherwise the planner will not use them.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_podcast_published_at_keyset
+    ON video (coalesce(published_at, '1900-01-01 00:00:00'::timestamp), id) WHERE is_podcast IS true;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_podcast_view_count_keyset
+    ON video (coalesce(view_count, 0), id) WHERE is_podcast IS true;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_podcast_like_count_keyset
+    ON video (coalesce(like_count, 0), id) WHERE is_podcast IS true;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_podcast_duration_keyset
+    ON video (coalesce(duration, ''), id) WHERE is_podcast IS true;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_stats_published_at_keyset
+    ON interviewer_stats (coalesce(latest_published_at, '1900-01-01 00:00:00'::timestamp), interviewer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_stats_video_count_keyset
+    ON interviewer_stats (video_count, interviewer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_stats_view_count_keyset
+    ON interviewer_stats (total_views, interviewer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_stats_like_count_keyset
+    ON interviewer_stats (total_likes, interviewer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_stats_followers_keyset
+    ON interviewer_stats (coalesce(folowers_count, 0), interviewer_id);
@@ -0,0 +1,23 @@
+-- Verified social presence as a stored flag instead of five suffix LIKE predicates
+-- evaluated on every listing query. Postgres recomputes it on every write.
+
+ALTER TABLE interviewer
+    ADD COLUMN IF NOT EXISTS has_verified_social boolean
+    GENERATED ALWAYS AS (
+        coalesce(linkedin LIKE '%|existed' OR twitter LIKE '%|existed' OR instagram LIKE '%|existed'
+                 OR tiktok LIKE '%|existed' OR youtube LIKE '%|existed', false)
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_interviewer_verified
+    ON interviewer (id) WHERE has_verified_social IS true;
+
+-- The search indexes of 002 become partial on the flag.
+DROP INDEX CONCURRENTLY IF EXISTS ix_interviewer_name_trgm;
+DROP INDEX CONCURRENTLY IF EXISTS ix_interviewer_expertise_trgm;
+
+CREATE INDEX CONCURRENTLY ix_interviewer_name_trgm
+    ON interviewer USING gin (name gin_trgm_ops) WHERE has_verified_social IS true;
+CREATE INDEX CONCURRENTLY ix_interviewer_expertise_trgm
+    ON interviewer USING gin (expertise gin_trgm_ops) WHERE has_verified_social IS true;
+
+ANALYZE interviewer;
@@ -0,0 +1,32 @@
+-- Normalized expertise/topic tags. Tags are stored in canonical form (lower-cased,
+-- whitespace collapsed), so expertise tags get their own table instead of the
+-- mixed-case names of the existing `expertise` catalog, which is left as it is.
+-- Fill them afterwards with: python -m app.jobs.backfill_interviewer_tags
+
+CREATE TABLE IF NOT EXISTS expertise_tag (
+    id serial PRIMARY KEY,
+    name varchar NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS ix_expertise_tag_name ON expertise_tag (name);
+
+CREATE TABLE IF NOT EXISTS topic (
+    id serial PRIMARY KEY,
+    name varchar NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS ix_topic_name ON topic (name);
+
+CREATE TABLE IF NOT EXISTS interviewerexpertise (
+    interviewer_id integer NOT NULL REFERENCES interviewer (id) ON DELETE CASCADE,
+    expertise_id integer NOT NULL REFERENCES expertise_tag (id) ON DELETE CASCADE,
+    position integer NOT NULL DEFAULT 1,
+    PRIMARY KEY (interviewer_id, expertise_id)
+);
+CREATE INDEX IF NOT EXISTS ix_ie_expertise_id ON interviewerexpertise (expertise_id, interviewer_id);
+
+CREATE TABLE IF NOT EXISTS interviewertopic (
+    interviewer_id integer NOT NULL REFERENCES interviewer (id) ON DELETE CASCADE,
+    topic_id integer NOT NULL REFERENCES topic (id) ON DELETE CASCADE,
+    position integer NOT NULL DEFAULT 1,
+    PRIMARY KEY (interviewer_id, topic_id)
+);
+CREATE INDEX IF NOT EXISTS ix_it_topic_id ON interviewertopic (topic_id, interviewer_id);
@@ -0,0 +1,30 @@
+-- Read model for /podcasts/filter: one row per podcast with at least one guest,
+-- non-null sort keys and lower-cased filters. Fill it with:
+--     python -m app.jobs.rebuild_podcast_feed
+
+CREATE TABLE IF NOT EXISTS podcast_feed (
+    video_id integer PRIMARY KEY REFERENCES video (id) ON DELETE CASCADE,
+    main_category varchar,
+    category varchar,
+    language varchar,
+    published_at timestamp NOT NULL,
+    view_count bigint NOT NULL DEFAULT 0,
+    like_count bigint NOT NULL DEFAULT 0,
+    duration_seconds integer NOT NULL DEFAULT 0,
+    guest_count integer NOT NULL DEFAULT 0,
+    updated_at timestamp NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_main_category ON podcast_feed (main_category, published_at, video_id);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_category ON podcast_feed (category);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_language ON podcast_feed (language);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_published_at_keyset ON podcast_feed (published_at, video_id);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_view_count_keyset ON podcast_feed (view_count, video_id);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_like_count_keyset ON podcast_feed (like_count, video_id);
+CREATE INDEX IF NOT EXISTS ix_podcast_feed_duration_keyset ON podcast_feed (duration_seconds, video_id);
+
+-- The listing no longer sorts the video table itself.
+DROP INDEX IF EXISTS ix_video_podcast_published_at_keyset;
+DROP INDEX IF EXISTS ix_video_podcast_view_count_keyset;
+DROP INDEX IF EXISTS ix_video_podcast_like_count_keyset;
+DROP INDEX IF EXISTS ix_video_podcast_duration_keyset;
@@ -0,0 +1,6 @@
+-- Numeric duration for sorting and range filters on /podcasts/filter.
+-- Then: python -m app.jobs.backfill_video_duration && python -m app.jobs.rebuild_podcast_feed
+
+ALTER TABLE video ADD COLUMN IF NOT EXISTS duration_seconds integer;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_video_duration_seconds ON video (duration_seconds);
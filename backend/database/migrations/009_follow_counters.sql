@@ -0,0 +1,12 @@
+-- Follower counters maintained by the follow/unfollow write path.
+-- Later drift is fixed by: python -m app.jobs.reconcile_follow_counters
+
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS following_count integer NOT NULL DEFAULT 0;
+
+UPDATE "user" AS u SET following_count = f.n
+FROM (SELECT user_id, count(*) AS n FROM follow GROUP BY user_id) AS f
+WHERE u.id = f.user_id;
+
+UPDATE interviewer_stats SET folowers_count = (
+    SELECT count(*) FROM follow WHERE follow.interviewer_id = interviewer_stats.interviewer_id
+);
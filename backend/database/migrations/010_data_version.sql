@@ -0,0 +1,9 @@
+-- Data versions backing the ETags of the read endpoints (app/utils/http_cache.py).
+
+CREATE TABLE IF NOT EXISTS data_version (
+    scope varchar PRIMARY KEY,
+    version bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO data_version (scope, version) VALUES ('podcasts', 0), ('interviewers', 0)
+ON CONFLICT (scope) DO NOTHING;
@@ -0,0 +1,14 @@
+-- Precomputed "similar podcasts": top-k TF-IDF neighbours of each podcast, read
+-- with one primary-key range scan. Fill it (and refresh it periodically) with:
+--     python -m app.jobs.build_similar_podcasts
+
+CREATE TABLE IF NOT EXISTS similar_podcast (
+    video_id integer NOT NULL REFERENCES video (id) ON DELETE CASCADE,
+    rank smallint NOT NULL,
+    similar_video_id integer NOT NULL REFERENCES video (id) ON DELETE CASCADE,
+    score double precision NOT NULL,
+    PRIMARY KEY (video_id, rank)
+);
+
+-- Lets the ON DELETE CASCADE of similar_video_id find its rows without a scan.
+CREATE INDEX IF NOT EXISTS ix_similar_podcast_similar_video_id ON similar_podcast (similar_video_id);
@@ -0,0 +1,15 @@
+-- Precomputed "similar interviewers": top-k neighbours of each interviewer from
+-- co-appearances (same podcasts, same channels) and shared expertise tags, read
+-- with one primary-key range scan. Fill it (and refresh it periodically) with:
+--     python -m app.jobs.build_similar_interviewers
+
+CREATE TABLE IF NOT EXISTS similar_interviewer (
+    interviewer_id integer NOT NULL REFERENCES interviewer (id) ON DELETE CASCADE,
+    rank smallint NOT NULL,
+    similar_interviewer_id integer NOT NULL REFERENCES interviewer (id) ON DELETE CASCADE,
+    score double precision NOT NULL,
+    PRIMARY KEY (interviewer_id, rank)
+);
+
+-- Lets the ON DELETE CASCADE of similar_interviewer_id find its rows without a scan.
+CREATE INDEX IF NOT EXISTS ix_similar_interviewer_similar_interviewer_id ON similar_interviewer (similar_interviewer_id);
@@ -0,0 +1,6 @@
+-- Display-ready interviewer fields (expertise/topic lists, image URL, verified
+-- social links), computed by the API on every interviewer write. Fill it for the
+-- existing rows, and again whenever PROFILE_IMAGE_BASE_URL changes, with:
+--     python -m app.jobs.backfill_interviewer_display
+
+ALTER TABLE interviewer ADD COLUMN IF NOT EXISTS display jsonb;
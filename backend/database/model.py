@@ -7,9 +7,16 @@ from sqlalchemy import (
     DateTime,
     Text,
     BigInteger,
+    Float,
+    SmallInteger,
     ForeignKey,
     Index,
+    Computed,
+    func,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -55,6 +62,32 @@ class InterviewerVideoLink(Base):
     )
 
 
+class InterviewerExpertise(Base):
+    __tablename__ = "interviewerexpertise"
+
+    interviewer_id = Column(Integer, ForeignKey("interviewer.id", ondelete="CASCADE"), primary_key=True)
+    expertise_id = Column(Integer, ForeignKey("expertise_tag.id", ondelete="CASCADE"), primary_key=True)
+    # Rank of the tag in Interviewer.expertise (1 = main expertise)
+    position = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        Index("ix_ie_expertise_id", "expertise_id", "interviewer_id"),
+    )
+
+
+class InterviewerTopic(Base):
+    __tablename__ = "interviewertopic"
+
+    interviewer_id = Column(Integer, ForeignKey("interviewer.id", ondelete="CASCADE"), primary_key=True)
+    topic_id = Column(Integer, ForeignKey("topic.id", ondelete="CASCADE"), primary_key=True)
+    # Rank of the tag in Interviewer.suggested_topic
+    position = Column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        Index("ix_it_topic_id", "topic_id", "interviewer_id"),
+    )
+
+
 # ─────────────────────────────────────────────
 # Reference tables
 # ─────────────────────────────────────────────
@@ -73,6 +106,23 @@ class Expertise(Base):
     name = Column(String, nullable=False, unique=True, index=True)
 
 
+# Canonical expertise tags of interviewers (see normalize_tag), kept apart from the
+# mixed-case names of the expertise catalog above, see database/migrations/005_interviewer_tags.sql
+class ExpertiseTag(Base):
+    __tablename__ = "expertise_tag"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True, index=True)
+
+
+# Canonical topic tags of interviewers (see normalize_tag)
+class Topic(Base):
+    __tablename__ = "topic"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True, index=True)
+
+
 class Language(Base):
     __tablename__ = "language"
 
@@ -93,6 +143,8 @@ class User(Base):
     phone = Column(String, unique=True, index=True, nullable=True)
     password_hash = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Compteur maintenu par follow/unfollow (app/crud/follower.py)
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     channel = relationship("Channel", back_populates="user", uselist=False)
     interviewer = relationship("Interviewer", back_populates="user", uselist=False)
@@ -159,6 +211,11 @@ class Channel(Base):
 # Video
 # ─────────────────────────────────────────────
 
+# Text search config of Video.search_vector and of the search queries. The catalogue
+# mixes French and English, so no language-specific stemming or stop-words.
+SEARCH_TEXT_CONFIG = "simple"
+
+
 class Video(Base):
     __tablename__ = "video"
 
@@ -175,6 +232,7 @@ class Video(Base):
     main_category = Column(String)
     topic = Column(String)
     duration = Column(String)
+    duration_seconds = Column(Integer, index=True)
 
     description = Column(Text)
     rich_description = Column(Text)
@@ -194,6 +252,17 @@ class Video(Base):
 
     guest_count = Column(Integer, default=0)
 
+    # Maintained by Postgres on every write, see database/migrations/001_video_search_vector.sql
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(title, '') || ' ' || coalesce(topic, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(main_category, '') || ' ' || coalesce(category, '') || ' ' || coalesce(key_words, '')), 'B') || "
+            f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(rich_description, '')), 'C')",
+            persisted=True,
+        ),
+    )
+
     channel_id = Column(Integer, ForeignKey("channel.id"))
 
     channel = relationship("Channel", back_populates="videos")
@@ -207,9 +276,17 @@ class Video(Base):
         Index("ix_video_category", "category"),
         Index("ix_video_main_category", "main_category"),
         Index("ix_video_published_at", "published_at"),
+        Index("ix_video_search_vector", "search_vector", postgresql_using="gin"),
     )
 
 
+# Sort key of the hosted podcasts of an interviewer: NULL dates are coalesced so that
+# the list can be paginated with a (sort key, id) row comparison.
+NULL_DATE = literal_column("'1900-01-01 00:00:00'::timestamp")
+
+VIDEO_PUBLISHED_AT_KEY = func.coalesce(Video.published_at, NULL_DATE)
+
+
 # ─────────────────────────────────────────────
 # Interviewer
 # ─────────────────────────────────────────────
@@ -269,6 +346,21 @@ class Interviewer(Base):
 
     suggested_topic = Column(String)
     is_reviewed = Column(Boolean)
+
+    # Display-ready expertise, topics, image URL and verified links, derived from the
+    # columns above at write time (app.utils.entities.interviewer_display).
+    display = Column(JSONB)
+
+    # True when at least one main social link has been verified ("<url>|existed").
+    # Maintained by Postgres on every write, see database/migrations/004_interviewer_verified_flag.sql
+    has_verified_social = Column(
+        Boolean,
+        Computed(
+            "coalesce(linkedin LIKE '%|existed' OR twitter LIKE '%|existed' OR instagram LIKE '%|existed' "
+            "OR tiktok LIKE '%|existed' OR youtube LIKE '%|existed', false)",
+            persisted=True,
+        ),
+    )
     user = relationship("User", back_populates="interviewer")
     videos = relationship(
         "Video",
@@ -285,6 +377,22 @@ class Interviewer(Base):
         Index("ix_interviewer_country", "country"),
         Index("ix_interviewer_location", "location"),
         Index("ix_interviewer_expertise", "expertise"),
+        # Listings only ever show verified interviewers: the search indexes are partial on it.
+        Index("ix_interviewer_verified", "id", postgresql_where=text("has_verified_social IS true")),
+        Index(
+            "ix_interviewer_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=text("has_verified_social IS true"),
+        ),
+        Index(
+            "ix_interviewer_expertise_trgm",
+            "expertise",
+            postgresql_using="gin",
+            postgresql_ops={"expertise": "gin_trgm_ops"},
+            postgresql_where=text("has_verified_social IS true"),
+        ),
     )
 class InterviewerStats(Base):
     __tablename__ = "interviewer_stats"
@@ -306,3 +414,138 @@ class InterviewerStats(Base):
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
     )
+
+
+INTERVIEWER_SORT_KEYS = {
+    "published_at": func.coalesce(InterviewerStats.latest_published_at, NULL_DATE),
+    "video_count": InterviewerStats.video_count,
+    "view_count": InterviewerStats.total_views,
+    "like_count": InterviewerStats.total_likes,
+    "followers": func.coalesce(InterviewerStats.folowers_count, 0),
+}
+
+for _name, _sort_key in INTERVIEWER_SORT_KEYS.items():
+    Index(f"ix_interviewer_stats_{_name}_keyset", _sort_key, InterviewerStats.interviewer_id)
+
+
+# ─────────────────────────────────────────────
+# Read models
+# ─────────────────────────────────────────────
+
+class PodcastFeed(Base):
+    """
+    One row per listable podcast (is_podcast and at least one guest) with its
+    precomputed, non-null sort keys and lower-cased filters. Read by /podcasts/filter,
+    maintained by app.crud.podcast_feed.
+    """
+    __tablename__ = "podcast_feed"
+
+    video_id = Column(
+        Integer,
+        ForeignKey("video.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    main_category = Column(String)
+    category = Column(String)
+    language = Column(String)
+
+    published_at = Column(DateTime, nullable=False)
+    view_count = Column(BigInteger, nullable=False, default=0)
+    like_count = Column(BigInteger, nullable=False, default=0)
+    duration_seconds = Column(Integer, nullable=False, default=0)
+    guest_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+    __table_args__ = (
+        Index("ix_podcast_feed_main_category", "main_category", "published_at", "video_id"),
+        Index("ix_podcast_feed_category", "category"),
+        Index("ix_podcast_feed_language", "language"),
+    )
+
+
+FEED_SORT_KEYS = {
+    "published_at": PodcastFeed.published_at,
+    "view_count": PodcastFeed.view_count,
+    "like_count": PodcastFeed.like_count,
+    "duration": PodcastFeed.duration_seconds,
+}
+
+for _name, _sort_key in FEED_SORT_KEYS.items():
+    Index(f"ix_podcast_feed_{_name}_keyset", _sort_key, PodcastFeed.video_id)
+
+
+
+class SimilarPodcast(Base):
+    """
+    Top-k content-based neighbours of each podcast (TF-IDF cosine over topic,
+    description, keywords and categories), rank 1 being the closest. Read by
+    /podcasts/similar_podcast/{id}, rebuilt by app.jobs.build_similar_podcasts.
+    """
+    __tablename__ = "similar_podcast"
+
+    video_id = Column(
+        Integer,
+        ForeignKey("video.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    rank = Column(SmallInteger, primary_key=True)
+    similar_video_id = Column(
+        Integer,
+        ForeignKey("video.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Lets the ON DELETE CASCADE of similar_video_id find its rows without a scan
+        Index("ix_similar_podcast_similar_video_id", "similar_video_id"),
+    )
+
+
+class SimilarInterviewer(Base):
+    """
+    Top-k neighbours of each interviewer, scored on shared podcasts, shared
+    channels and shared expertise tags, rank 1 being the closest. Read by
+    /interviewers/similar_interviewers/{id}, rebuilt by app.jobs.build_similar_interviewers.
+    """
+    __tablename__ = "similar_interviewer"
+
+    interviewer_id = Column(
+        Integer,
+        ForeignKey("interviewer.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    rank = Column(SmallInteger, primary_key=True)
+    similar_interviewer_id = Column(
+        Integer,
+        ForeignKey("interviewer.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Lets the ON DELETE CASCADE of similar_interviewer_id find its rows without a scan
+        Index("ix_similar_interviewer_similar_interviewer_id", "similar_interviewer_id"),
+    )
+
+# ─────────────────────────────────────────────
+# HTTP caching
+# ─────────────────────────────────────────────
+
+class DataVersion(Base):
+    """
+    Version counter per data scope ("podcasts", "interviewers"), incremented in
+    the same transaction as every write to that scope. ETags of the read
+    endpoints are derived from it (app/utils/http_cache.py).
+    """
+    __tablename__ = "data_version"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,64 @@
+import base64
+import json
+import unittest
+from datetime import datetime
+
+from app.utils.pagination import decode_cursor, decode_keyset_cursor, encode_cursor, encode_keyset_cursor
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+class CursorTest(unittest.TestCase):
+    def test_round_trip_of_int_str_and_datetime_keys(self):
+        for sort_key in (0, 1_234_567_890_123, "Zoë d'Arc", datetime(2024, 2, 29, 23, 59, 1, 5)):
+            cursor = encode_cursor(sort_key, 42)
+            self.assertNotIn("=", cursor)
+            self.assertEqual(decode_cursor(cursor, 2), [sort_key, 42])
+
+    def test_float_rank_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(0.1 + 0.2, 7), 2), [0.1 + 0.2, 7])
+
+    def test_malformed_cursors_are_rejected(self):
+        bad_cursors = [
+            "",
+            "not base64 !",
+            "éé",
+            base64.urlsafe_b64encode(b"not json").decode("ascii"),
+            raw_cursor({"id": 1}),
+            raw_cursor([1, 2, 3]),
+            raw_cursor([1, "2"]),
+            raw_cursor([1, True]),
+            raw_cursor([{"x": 1}, 2]),
+            raw_cursor([{"dt": "yesterday"}, 2]),
+            raw_cursor([{"dt": 5}, 2]),
+        ]
+        for cursor in bad_cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor, 2)
+
+
+class KeysetCursorTest(unittest.TestCase):
+    def test_round_trip(self):
+        published_at = datetime(2023, 1, 2, 3, 4, 5)
+        cursor = encode_keyset_cursor("published_at", False, published_at, 9)
+        self.assertEqual(decode_keyset_cursor(cursor, "published_at", False), (published_at, 9))
+
+        cursor = encode_keyset_cursor("view_count", 1, 1500, 3)
+        self.assertEqual(decode_keyset_cursor(cursor, "view_count", True), (1500, 3))
+
+    def test_cursor_of_another_ordering_is_rejected(self):
+        cursor = encode_keyset_cursor("view_count", True, 10, 1)
+        with self.assertRaises(ValueError):
+            decode_keyset_cursor(cursor, "like_count", True)
+        with self.assertRaises(ValueError):
+            decode_keyset_cursor(cursor, "view_count", False)
+
+    def test_plain_cursor_is_not_a_keyset_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_keyset_cursor(encode_cursor(10, 1), "view_count", True)
+
+
+if __name__ == "__main__":
+    unittest.main()
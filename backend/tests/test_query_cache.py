@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.utils.query_cache import MemoryBackend, QueryCache, SqliteBackend
+
+
+class BackendContract:
+    """
+    Behaviour shared by both backends. Subclasses provide make_backend() and the
+    name of the clock function the backend reads (patched to control expiry).
+    """
+
+    clock = None
+
+    def make_backend(self, max_entries: int = 100):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch(self.clock, side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = self.make_backend()
+
+    def test_get_returns_stored_payload(self):
+        self.backend.set("a", b"1", ttl=60, tags=[])
+        self.assertEqual(self.backend.get("a"), b"1")
+        self.assertIsNone(self.backend.get("missing"))
+
+    def test_entry_expires_after_ttl(self):
+        self.backend.set("a", b"1", ttl=60, tags=[])
+        self.now += 59
+        self.assertEqual(self.backend.get("a"), b"1")
+        self.now += 2
+        self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.size(), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = self.make_backend(max_entries=2)
+        backend.set("a", b"1", ttl=60, tags=[])
+        self.now += 1
+        backend.set("b", b"2", ttl=60, tags=[])
+        self.now += 1
+        backend.get("a")  # "b" is now the least recently used
+        self.now += 1
+        backend.set("c", b"3", ttl=60, tags=[])
+
+        self.assertEqual(backend.size(), 2)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), b"1")
+        self.assertEqual(backend.get("c"), b"3")
+
+    def test_invalidate_tags_removes_only_tagged_entries(self):
+        self.backend.set("list", b"1", ttl=60, tags=["podcasts"])
+        self.backend.set("video", b"2", ttl=60, tags=["podcasts", "video:1"])
+        self.backend.set("other", b"3", ttl=60, tags=["video:2"])
+
+        self.assertEqual(self.backend.invalidate_tags(["video:1"]), 1)
+        self.assertIsNone(self.backend.get("video"))
+        self.assertEqual(self.backend.get("list"), b"1")
+
+        self.assertEqual(self.backend.invalidate_tags(["podcasts"]), 1)
+        self.assertIsNone(self.backend.get("list"))
+        self.assertEqual(self.backend.get("other"), b"3")
+        self.assertEqual(self.backend.invalidate_tags(["unknown"]), 0)
+
+    def test_set_replaces_previous_tags(self):
+        self.backend.set("a", b"1", ttl=60, tags=["old"])
+        self.backend.set("a", b"2", ttl=60, tags=["new"])
+        self.assertEqual(self.backend.invalidate_tags(["old"]), 0)
+        self.assertEqual(self.backend.get("a"), b"2")
+
+
+class MemoryBackendTest(BackendContract, unittest.TestCase):
+    clock = "app.utils.query_cache.time.monotonic"
+
+    def make_backend(self, max_entries: int = 100):
+        return MemoryBackend(max_entries)
+
+
+class SqliteBackendTest(BackendContract, unittest.TestCase):
+    clock = "app.utils.query_cache.time.time"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        super().setUp()
+
+    def make_backend(self, max_entries: int = 100):
+        path = os.path.join(self.directory, f"cache_{max_entries}.sqlite")
+        return SqliteBackend(path, max_entries)
+
+
+class QueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache(MemoryBackend(100), ttl_seconds=60)
+        self.calls = []
+
+    def make_function(self, result):
+        @self.cache.cached("get_item", tags=lambda args: [f"item:{args['item_id']}"])
+        def get_item(db, item_id: int, limit: int = 10):
+            self.calls.append((item_id, limit))
+            return result
+
+        return get_item
+
+    def test_result_is_served_from_cache(self):
+        get_item = self.make_function({"id": 1})
+        self.assertEqual(get_item("session-1", 1), {"id": 1})
+        self.assertEqual(get_item("session-2", item_id=1, limit=10), {"id": 1})
+        self.assertEqual(self.calls, [(1, 10)])
+        self.assertEqual(self.cache.stats()["functions"]["get_item"], {"hits": 1, "misses": 1})
+
+    def test_arguments_are_part_of_the_key(self):
+        get_item = self.make_function([])
+        get_item(None, 1)
+        get_item(None, 1, limit=20)
+        get_item(None, 2)
+        self.assertEqual(self.calls, [(1, 10), (1, 20), (2, 10)])
+
+    def test_cached_value_is_a_copy(self):
+        get_item = self.make_function({"id": 1})
+        get_item(None, 1)["id"] = 2
+        self.assertEqual(get_item(None, 1), {"id": 1})
+
+    def test_none_result_is_not_cached(self):
+        get_item = self.make_function(None)
+        self.assertIsNone(get_item(None, 1))
+        self.assertIsNone(get_item(None, 1))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.backend.size(), 0)
+
+    def test_invalidate_drops_tagged_results(self):
+        get_item = self.make_function([1])
+        get_item(None, 1)
+        get_item(None, 2)
+        self.assertEqual(self.cache.invalidate("item:1"), 1)
+        get_item(None, 1)
+        get_item(None, 2)
+        self.assertEqual(self.calls, [(1, 10), (2, 10), (1, 10)])
+
+    def test_without_backend_functions_are_not_wrapped(self):
+        cache = QueryCache(None, ttl_seconds=60)
+
+        def get_item(db, item_id):
+            return item_id
+
+        self.assertIs(cache.cached("get_item")(get_item), get_item)
+        self.assertEqual(cache.invalidate("item:1"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()